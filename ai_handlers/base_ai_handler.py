@@ -4,16 +4,18 @@ Zawiera wspólne funkcjonalności dla wszystkich języków
 """
 import json
 
+from utils.latency import track_latency
+from utils.openai_client import client
+
 try:
     import streamlit as st
 except ImportError:
     st = None
 
 try:
-    from utils.config import client, get_model
+    from utils.config import get_model
     from utils.ai_stats import add_token_usage
 except ImportError:
-    client = None
     add_token_usage = None
 
 
@@ -40,15 +42,16 @@ class BaseAIHandler:
                     st.error("❌ Klient OpenAI nie jest skonfigurowany. Sprawdź plik .env")
                 return None
                 
-            response = client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=self.temperature,
-                max_tokens=max_tokens
-            )
+            with track_latency("vocabulary", self.model) as timer:
+                response = client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    temperature=self.temperature,
+                    max_tokens=max_tokens
+                )
             
             if not response or not response.choices or len(response.choices) == 0:
                 if st:
@@ -66,7 +69,8 @@ class BaseAIHandler:
                 try:
                     add_token_usage("vocabulary", 
                                    response.usage.prompt_tokens, 
-                                   response.usage.completion_tokens)
+                                   response.usage.completion_tokens,
+                                   model=response.model, latency_ms=timer.ms)
                 except Exception:
                     pass
             
@@ -5,14 +5,20 @@ Aplikacja do nauki języków obcych z funkcjami tłumaczenia, sprawdzania gramat
 """
 import streamlit as st
 # Importy z utils 
-from utils.background_styles import apply_background_with_readability
-from utils.config import load_environment, client, supported_languages, language_code_map, show_token_sidebar
+from utils.background_styles import apply_background_with_readability, show_sidebar_logo
+from utils.config import load_environment, supported_languages, language_code_map, show_token_sidebar
 from utils.ai_stats import calculate_costs, load_usage_database
 from utils.tts_sidebar import show_tts_sidebar
-# Importy modułów  
-from modules.translator import show_translator
-from modules.belfer import show_belfer
-from modules.dialog import show_dialog 
+from utils.lazy_imports import load_attribute
+from utils.rerun_cpu import measure_run
+
+# Moduły stron ładowane przy pierwszym otwarciu strony (utils.lazy_imports)
+PAGES = {
+    "Nauka słówek": "modules.vocabulary:show_vocabulary",
+    "Belfer": "modules.belfer:show_belfer",
+    "Dialog": "modules.dialog:show_dialog",
+    "Translator": "modules.translator:show_translator",
+}
 
  
 st.set_page_config(
@@ -72,58 +78,53 @@ st.markdown(
     unsafe_allow_html=True
 )
 
-# Zastosuj tło z obrazka i style czytelności
-apply_background_with_readability()
+# Klucz API OpenAI (bez klucza wyświetla pole do jego wpisania i zatrzymuje stronę)
+load_environment()
 
-#st.title("PANJO - personalny asystent nauki języków obcych z AI") # przeniesiony do background_styles.py
+# Koszt CPU pełnego przebiegu (porównanie z przebiegami fragmentów - utils/rerun_cpu.py)
+with measure_run("app"):
+    # Zastosuj tło z obrazka i style czytelności
+    apply_background_with_readability()
 
-with st.sidebar:
-    st.image("background/logo.png", use_container_width=True)
-    tool_language = st.selectbox(
-        "Wybierz narzędzie",
-        [                    
-            "Nauka słówek", # fiszki i testy słownictwa
-            "Belfer", # sprawdza poprawność zdań ZROBIONE
-            "Dialog", # prowadzi dialog (dorobić wybór tematów.)
-            "Translator" # tłumacz ZROBIONE
-        ], key="tool_language"
-    )
-     
-    #st.divider()
-    st.subheader("🌍 Ustawienia języków")
-    
-    # Globalne wybory języków dla wszystkich modułów
-    language_in = st.selectbox(
-        "Język źródłowy:", 
-        supported_languages, 
-        index=0, 
-        key="global_language_in",
-        help="Język tekstu wejściowego/nagrań"
-    )
-     
-    language_out = st.selectbox( 
-        "Język docelowy:", 
-        supported_languages, 
-        index=1, 
-        key="global_language_out",
-        help="Język tłumaczenia/odpowiedzi"
-    )
-    
-    # Wyświetl wybór TTS
-    show_tts_sidebar()
-    # Wyświetl statystyki tokenów i kosztów
-    show_token_sidebar()
+    #st.title("PANJO - personalny asystent nauki języków obcych z AI") # przeniesiony do background_styles.py
+
+    with st.sidebar:
+        show_sidebar_logo()
+        tool_language = st.selectbox(
+            "Wybierz narzędzie",
+            [                    
+                "Nauka słówek", # fiszki i testy słownictwa
+                "Belfer", # sprawdza poprawność zdań ZROBIONE
+                "Dialog", # prowadzi dialog (dorobić wybór tematów.)
+                "Translator" # tłumacz ZROBIONE
+            ], key="tool_language"
+        )
+
+        #st.divider()
+        st.subheader("🌍 Ustawienia języków")
 
-# Główne sekcje aplikacji
-if tool_language == "Translator":
-    show_translator(language_in, language_out)
+        # Globalne wybory języków dla wszystkich modułów
+        language_in = st.selectbox(
+            "Język źródłowy:", 
+            supported_languages, 
+            index=0, 
+            key="global_language_in",
+            help="Język tekstu wejściowego/nagrań"
+        )
 
-elif tool_language == "Belfer":
-    show_belfer(language_in, language_out)
+        language_out = st.selectbox( 
+            "Język docelowy:", 
+            supported_languages, 
+            index=1, 
+            key="global_language_out",
+            help="Język tłumaczenia/odpowiedzi"
+        )
 
-elif tool_language == "Dialog":
-    show_dialog(language_in, language_out)
+        # Wyświetl wybór TTS
+        show_tts_sidebar()
+        # Wyświetl statystyki tokenów i kosztów (fragment - jego przyciski nie przeładowują strony)
+        show_token_sidebar()
 
-elif tool_language == "Nauka słówek":
-    from modules.vocabulary import show_vocabulary
-    show_vocabulary(language_in, language_out)
+    # Główne sekcje aplikacji
+    show_page = load_attribute(PAGES[tool_language])
+    show_page(language_in, language_out)
@@ -5,6 +5,7 @@ Dla sprawdzenia wyświetla tłumaczenie w wybranym języku out
 import streamlit as st
 from utils.config import client, supported_languages, language_code_map, text_to_speech, get_model
 from utils.ai_stats import add_token_usage
+from utils.latency import track_latency
 from utils.cloud_audio_recorder import cloud_audio_recorder_interface, transcribe_audio_file
 
 
@@ -52,13 +53,13 @@ def show_belfer(language_in, language_out):
     # Używamy globalnych ustawień języków z sidebar
     # Nowy interfejs nagrywania kompatybilny z chmurą
     # st.subheader("🎤 Nagrywanie głosu")
-    audio_file_path = cloud_audio_recorder_interface("belfer_")
+    audio_data = cloud_audio_recorder_interface("belfer_")
     
     recognized_text = ""
-    if audio_file_path:
+    if audio_data:
         language_in_code = language_code_map.get(language_in, "en")
         with st.spinner("🔄 Rozpoznawanie mowy..."):
-            recognized_text = transcribe_audio_file(audio_file_path, language_in_code)
+            recognized_text = transcribe_audio_file(audio_data, language_in_code)
     
     # Pole tekstowe do wpisania wiadomości
     verified_text = st.text_area(f"Wpisz tekst do weryfikacji lub nagraj w języku - {language_in}", 
@@ -72,15 +73,16 @@ def show_belfer(language_in, language_out):
             # Wywołanie OpenAI do tłumaczenia
             prompt = f"Sprawdź poprawność użytych wyrazów, budowę zdania i gramatykę w języku {language_in} następujący tekst:\n{verified_text}. Zaproponuj zmiany i poprawki wraz z wyjaśnieniami. Na koniec podaj tłumaczenie na {language_out} "
             try:
-                response = client.chat.completions.create(
-                    model=get_model(),
-                    messages=[
-                        {"role": "system", "content": f"Jesteś nauczycielem języka w języku {language_in}. Jasno i zwięźle wyjaśniasz zagadnienia językowe związane z wpisanym tekstem i wyjaśniasz błędy. Jeśli tekst jest w innym języku niż {supported_languages}, odpowiedz 'Język podanego tekstu (tu podaj język jaki wykryłeś)nie jest obsługiwany.' "},
-                        {"role": "user", "content": prompt}
-                    ],
-                    max_tokens=1000,
-                    temperature=0.1,
-                )
+                with track_latency("belfer", get_model()) as timer:
+                    response = client.chat.completions.create(
+                        model=get_model(),
+                        messages=[
+                            {"role": "system", "content": f"Jesteś nauczycielem języka w języku {language_in}. Jasno i zwięźle wyjaśniasz zagadnienia językowe związane z wpisanym tekstem i wyjaśniasz błędy. Jeśli tekst jest w innym języku niż {supported_languages}, odpowiedz 'Język podanego tekstu (tu podaj język jaki wykryłeś)nie jest obsługiwany.' "},
+                            {"role": "user", "content": prompt}
+                        ],
+                        max_tokens=1000,
+                        temperature=0.1,
+                    )
                 content = response.choices[0].message.content
                 verification = content.strip() if content is not None else ""
                 st.subheader(f"Weryfikacja i wyjaśnienie:")
@@ -91,7 +93,7 @@ def show_belfer(language_in, language_out):
 
                 # Trackuj i wyświetl użycie tokenów
                 if response.usage:
-                    add_token_usage("belfer", response.usage.prompt_tokens, response.usage.completion_tokens)
+                    add_token_usage("belfer", response.usage.prompt_tokens, response.usage.completion_tokens, model=response.model, latency_ms=timer.ms)
                     st.caption(f"📊 Użyto {response.usage.prompt_tokens} + {response.usage.completion_tokens} = {response.usage.total_tokens} tokenów")   
 
             except Exception as e:
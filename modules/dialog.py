@@ -2,9 +2,66 @@
 Moduł Dialog - prawdziwe rozmowy z AI z ciągłą historią
 """
 import streamlit as st
-from utils.config import client, supported_languages, language_code_map, text_to_speech, get_model
+from utils.config import client, supported_languages, language_code_map, text_to_speech, get_model, get_audio_mime
 from utils.ai_stats import add_token_usage
+from utils.latency import track_latency
 from utils.cloud_audio_recorder import cloud_audio_recorder_interface, transcribe_audio_file
+from utils.rerun_cpu import fragment
+
+
+@fragment("dialog_message")
+def show_assistant_message(i, content, language_in, language_out):
+    """
+    Odpowiedź AI z przyciskami odtwarzania i tłumaczenia
+
+    Fragment (osobny dla każdej wiadomości) - kliknięcie 🔊 lub 🌍 przeładowuje
+    tylko tę wiadomość, nie całą historię rozmowy.
+    """
+    with st.container():
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            st.markdown(f"**🤖 AI:** {content}")
+
+            # Wyświetl tłumaczenie jeśli istnieje
+            translation_key = f"translation_{i}"
+            if translation_key in st.session_state:
+                st.markdown(f"*🌍 Tłumaczenie na {language_out}:* {st.session_state[translation_key]}")
+
+        with col2:
+            # Przyciski odtwarzania i tłumaczenia
+            if st.button("🔊", key=f"tts_{i}", help="Odtwórz tę odpowiedź"):
+                try:
+                    audio_bytes = text_to_speech(content, language_in)
+                    if audio_bytes is not None:
+                        st.audio(audio_bytes, format=get_audio_mime(audio_bytes))
+                except Exception as e:
+                    st.error(f"Błąd TTS: {e}")
+
+            if st.button("🌍", key=f"translate_{i}", help=f"Przetłumacz na {language_out}"):
+                try:
+                    with st.spinner("Tłumaczę..."):
+                        translation_prompt = f"Przetłumacz następujący tekst z języka {language_in} na język {language_out}. Zachowaj naturalny ton i znaczenie:\n\n{content}"
+                        with track_latency("dialog", get_model()) as timer:
+                            response = client.chat.completions.create(
+                                model=get_model(),
+                                messages=[
+                                    {"role": "system", "content": f"Jesteś profesjonalnym tłumaczem. Tłumacz tekst z {language_in} na {language_out} zachowując naturalny ton i kontekst rozmowy."},
+                                    {"role": "user", "content": translation_prompt}
+                                ],
+                                max_tokens=300,
+                                temperature=0.3,
+                            )
+                        # Trackuj użycie tokenów dla tłumaczenia
+                        if response.usage:
+                            add_token_usage("dialog", response.usage.prompt_tokens, response.usage.completion_tokens, model=response.model, latency_ms=timer.ms)
+                            st.session_state["dialog_last_tokens"] = f"📊 Użyto {response.usage.prompt_tokens} + {response.usage.completion_tokens} = {response.usage.total_tokens} tokenów"
+                        translation = response.choices[0].message.content
+                        translation = translation.strip() if translation else "Błąd tłumaczenia"
+                        # Zapisz tłumaczenie w session_state
+                        st.session_state[f"translation_{i}"] = translation
+                        st.rerun(scope="fragment")
+                except Exception as e:
+                    st.error(f"Błąd tłumaczenia: {e}")
 
 
 def show_dialog(language_in, language_out):
@@ -88,49 +145,7 @@ def show_dialog(language_in, language_out):
                         pass  # Miejsce na ewentualne przyciski dla wiadomości użytkownika
             
             elif message["role"] == "assistant":
-                with st.container():
-                    col1, col2 = st.columns([3, 1])
-                    with col1:
-                        st.markdown(f"**🤖 AI:** {message['content']}")
-                        
-                        # Wyświetl tłumaczenie jeśli istnieje
-                        translation_key = f"translation_{i}"
-                        if translation_key in st.session_state:
-                            st.markdown(f"*🌍 Tłumaczenie na {language_out}:* {st.session_state[translation_key]}")
-                    
-                    with col2:
-                        # Przyciski odtwarzania i tłumaczenia
-                        if st.button("🔊", key=f"tts_{i}", help="Odtwórz tę odpowiedź"):
-                            try:
-                                audio_bytes = text_to_speech(message['content'], language_in)
-                                st.audio(audio_bytes, format="audio/mp3")
-                            except Exception as e:
-                                st.error(f"Błąd TTS: {e}")
-                        
-                        if st.button("🌍", key=f"translate_{i}", help=f"Przetłumacz na {language_out}"):
-                            try:
-                                with st.spinner("Tłumaczę..."):
-                                    translation_prompt = f"Przetłumacz następujący tekst z języka {language_in} na język {language_out}. Zachowaj naturalny ton i znaczenie:\n\n{message['content']}"
-                                    response = client.chat.completions.create(
-                                        model=get_model(),
-                                        messages=[
-                                            {"role": "system", "content": f"Jesteś profesjonalnym tłumaczem. Tłumacz tekst z {language_in} na {language_out} zachowując naturalny ton i kontekst rozmowy."},
-                                            {"role": "user", "content": translation_prompt}
-                                        ],
-                                        max_tokens=300,
-                                        temperature=0.3,
-                                    )
-                                    # Trackuj użycie tokenów dla tłumaczenia
-                                    if response.usage:
-                                        add_token_usage("dialog", response.usage.prompt_tokens, response.usage.completion_tokens)
-                                        st.session_state["dialog_last_tokens"] = f"📊 Użyto {response.usage.prompt_tokens} + {response.usage.completion_tokens} = {response.usage.total_tokens} tokenów"
-                                    translation = response.choices[0].message.content
-                                    translation = translation.strip() if translation else "Błąd tłumaczenia"
-                                    # Zapisz tłumaczenie w session_state
-                                    st.session_state[f"translation_{i}"] = translation
-                                    st.rerun()
-                            except Exception as e:
-                                st.error(f"Błąd tłumaczenia: {e}")
+                show_assistant_message(i, message["content"], language_in, language_out)
 
     #st.divider()
 
@@ -140,13 +155,13 @@ def show_dialog(language_in, language_out):
     # Nowy interfejs nagrywania kompatybilny z chmurą
     # st.subheader("🎤 Nagrywanie głosu")
     # st.text(f"Nagraj w języku {language_in} lub {language_out}:")
-    audio_file_path = cloud_audio_recorder_interface("dialog_")
+    audio_data = cloud_audio_recorder_interface("dialog_")
     
     recognized_text = ""
-    if audio_file_path:
+    if audio_data:
         language_in_code = language_code_map.get(language_in, "en")
         with st.spinner("🔄 Rozpoznawanie mowy..."):
-            recognized_text = transcribe_audio_file(audio_file_path, language_in_code)
+            recognized_text = transcribe_audio_file(audio_data, language_in_code)
     
     # Input dla nowej wiadomości
     col1, col2 = st.columns([4, 1])
@@ -195,18 +210,19 @@ ZASADY:
         # Generuj odpowiedź AI z pełnym kontekstem
         try:
             with st.spinner("AI myśli..."):
-                response = client.chat.completions.create(
-                    model=get_model(),
-                    messages=[  # type: ignore
-                        {"role": msg["role"], "content": msg["content"]} 
-                        for msg in st.session_state.dialog_messages
-                    ],
-                    max_tokens=300,
-                    temperature=0.8,
-                )
+                with track_latency("dialog", get_model()) as timer:
+                    response = client.chat.completions.create(
+                        model=get_model(),
+                        messages=[  # type: ignore
+                            {"role": msg["role"], "content": msg["content"]} 
+                            for msg in st.session_state.dialog_messages
+                        ],
+                        max_tokens=300,
+                        temperature=0.8,
+                    )
                 # Trackuj użycie tokenów
                 if response.usage:
-                    add_token_usage("dialog", response.usage.prompt_tokens, response.usage.completion_tokens)
+                    add_token_usage("dialog", response.usage.prompt_tokens, response.usage.completion_tokens, model=response.model, latency_ms=timer.ms)
                     st.session_state["dialog_last_tokens"] = f"📊 Użyto {response.usage.prompt_tokens} + {response.usage.completion_tokens} = {response.usage.total_tokens} tokenów"
                 ai_response = response.choices[0].message.content
                 ai_response = ai_response.strip() if ai_response else "Przepraszam, nie mogę odpowiedzieć."
@@ -2,9 +2,13 @@
 Moduł Translator - tłumaczenie tekstu z rozpoznawaniem mowy
 """
 import streamlit as st
-from utils.config import client, supported_languages, language_code_map, text_to_speech, get_model
+from utils.config import client, supported_languages, language_code_map, text_to_speech, get_model, get_audio_mime
 from utils.ai_stats import add_token_usage
-from utils.cloud_audio_recorder import cloud_audio_recorder_interface, transcribe_audio_file
+from utils.latency import track_latency
+from utils.voice_pipeline import run_voice_translation
+from utils.cloud_audio_recorder import (
+    cloud_audio_recorder_interface, transcribe_audio_file, translate_audio_file_to_english, get_transcription_key
+)
 
 
 def show_translator(language_in, language_out):
@@ -17,12 +21,50 @@ def show_translator(language_in, language_out):
 
     # Nowy interfejs nagrywania kompatybilny z chmurą
     st.subheader("🎤 Nagrywanie głosu")
-    audio_file_path = cloud_audio_recorder_interface("translator_")
+    voice_mode = st.toggle(
+        "⚡ Tryb głosowy - tłumaczenie i wymowa zdanie po zdaniu",
+        key="translator_voice_mode",
+        help="Rozpoznawanie, tłumaczenie i synteza mowy działają jednocześnie - pierwsze zdanie słychać od razu"
+    )
+    audio_data = cloud_audio_recorder_interface("translator_")
+
+    # Przechowywanie tłumaczenia w session_state
+    if "last_translation" not in st.session_state:
+        st.session_state["last_translation"] = ""
+    if "last_audio" not in st.session_state:
+        st.session_state["last_audio"] = None
+
+    # Na angielski: Whisper tłumaczy nagranie od razu - bez osobnej transkrypcji i zapytania do czatu
+    direct_to_english = language_out == "angielski" and language_in != "angielski"
     
     recognized_text = ""
-    if audio_file_path:
+    if audio_data and voice_mode:
+        audio_key = get_transcription_key(audio_data, f"voice_{language_in}_{language_out}")
+        if st.session_state.get("translator_voice_audio") != audio_key:
+            recognized_text, translation = run_voice_translation(
+                audio_data, language_in, language_out, direct_to_english
+            )
+            if translation:
+                # Jak w trybie bezpośrednim - nieudane nagranie można ponowić
+                st.session_state["translator_voice_audio"] = audio_key
+                st.session_state["last_translation"] = translation
+                # Audio całości powstanie dopiero na żądanie (zdania już zostały odtworzone)
+                st.session_state["last_audio"] = None
+    elif audio_data and direct_to_english:
+        audio_key = get_transcription_key(audio_data, "en-translation")
+        # Tłumaczymy tylko nowe nagranie - rerun nie nadpisuje późniejszych tłumaczeń z pola tekstowego
+        if st.session_state.get("translator_direct_audio") != audio_key:
+            with st.spinner("🔄 Rozpoznawanie i tłumaczenie mowy..."):
+                translation = translate_audio_file_to_english(audio_data)
+            if translation:
+                # Nagranie oznaczone jako przetłumaczone dopiero po udanym tłumaczeniu - błąd można ponowić
+                st.session_state["translator_direct_audio"] = audio_key
+                st.session_state["last_translation"] = translation
+                st.session_state["last_audio"] = text_to_speech(translation, language_out)
+        st.caption("⚡ Nagranie przetłumaczone bezpośrednio na angielski")
+    elif audio_data:
         with st.spinner("🔄 Rozpoznawanie mowy..."):
-            recognized_text = transcribe_audio_file(audio_file_path, language_in_code)
+            recognized_text = transcribe_audio_file(audio_data, language_in_code)
     
     # Pole tekstowe do wpisania wiadomości
     translate_text = st.text_area(
@@ -35,12 +77,6 @@ def show_translator(language_in, language_out):
     # Używamy globalnych ustawień języków z sidebar
     language_out_code = language_code_map.get(language_out, "pl")
 
-    # Przechowywanie tłumaczenia w session_state
-    if "last_translation" not in st.session_state:
-        st.session_state["last_translation"] = ""
-    if "last_audio" not in st.session_state:
-        st.session_state["last_audio"] = None
-
     # Wyświetl tłumaczenie, jeśli istnieje
     if st.session_state.get("last_translation"):
         st.subheader(f"Tłumaczenie na {language_out}:")
@@ -53,19 +89,20 @@ def show_translator(language_in, language_out):
             # Wywołanie OpenAI API do tłumaczenia
             prompt = f"Przetłumacz na {language_out} następujący tekst:\n{st.session_state['translate_text_area']}"
             try:
-                response = client.chat.completions.create(
-                    model=get_model(),
-                    messages=[
-                        {"role": "system", "content": f"Jesteś pomocnym tłumaczem. Tłumacz tekst z {language_in} na {language_out}. Jeśli tekst jest już w języku docelowym, napisz 'Tekst jest już w wybranym języku.'"},
-                        {"role": "user", "content": prompt}
-                    ],
-                    max_tokens=500,
-                    temperature=0.1,
-                )
+                with track_latency("translator", get_model()) as timer:
+                    response = client.chat.completions.create(
+                        model=get_model(),
+                        messages=[
+                            {"role": "system", "content": f"Jesteś pomocnym tłumaczem. Tłumacz tekst z {language_in} na {language_out}. Jeśli tekst jest już w języku docelowym, napisz 'Tekst jest już w wybranym języku.'"},
+                            {"role": "user", "content": prompt}
+                        ],
+                        max_tokens=500,
+                        temperature=0.1,
+                    )
                 
                 # Trackuj użycie tokenów
                 if response.usage:
-                    add_token_usage("translator", response.usage.prompt_tokens, response.usage.completion_tokens)
+                    add_token_usage("translator", response.usage.prompt_tokens, response.usage.completion_tokens, model=response.model, latency_ms=timer.ms)
                 
                 content = response.choices[0].message.content
                 translation = content.strip() if content is not None else ""
@@ -85,6 +122,7 @@ def show_translator(language_in, language_out):
         if st.session_state.get("last_translation"):
             if st.session_state.get("last_audio") is None:
                 st.session_state["last_audio"] = text_to_speech(st.session_state["last_translation"], language_out)
-            st.audio(st.session_state["last_audio"], format="audio/mp3")
+            if st.session_state["last_audio"] is not None:
+                st.audio(st.session_state["last_audio"], format=get_audio_mime(st.session_state["last_audio"]))
         else:
             st.warning("Brak tłumaczenia do odtworzenia. Najpierw przetłumacz tekst.")
\ No newline at end of file
@@ -9,6 +9,9 @@ from datetime import datetime, timedelta
 from utils.config import client, text_to_speech, language_code_map
 from utils.ai_stats import add_token_usage
 from ai_handlers import get_ai_handler
+from utils.audio_sprite import play_card_audio
+from utils.card_bundle import get_bundled_card, get_bundled_conjugation
+from utils.rerun_cpu import fragment
 import os
 
 # Plik z bazą słówek
@@ -253,6 +256,13 @@ def generate_word_with_ai(word, lang_in, lang_out):
             
         return None
 
+def get_word_data(word, lang_in, lang_out):
+    """Gotowa karta z pliku (bez tokenów), a gdy jej brak - dane słówka wygenerowane przez AI"""
+    word_data = get_bundled_card(word, lang_in, lang_out)
+    if word_data is None:
+        word_data = generate_word_with_ai(word, lang_in, lang_out)
+    return word_data
+
 def add_word_to_database(word_data, lang_pair):
     """Dodaje słówko do bazy danych"""
     db = load_vocabulary_database()
@@ -338,13 +348,12 @@ def quick_add_from_set(selected_words, lang_in, lang_out, lang_pair):
             if word.lower() in existing_words:
                 continue
         
-        # Wygeneruj dane słówka z AI
         with st.spinner(f"Generuję dane dla '{word}'..."):
-            word_data = generate_word_with_ai(word, lang_in, lang_out)
-            
-            if word_data:
-                add_word_to_database(word_data, lang_pair)
-                added_count += 1
+            word_data = get_word_data(word, lang_in, lang_out)
+        
+        if word_data:
+            add_word_to_database(word_data, lang_pair)
+            added_count += 1
     
     return added_count
 
@@ -366,8 +375,14 @@ def get_words_for_learning(lang_pair, difficulty_filter=None, limit=20):
     
     return words[:limit]
 
+@fragment("learning_card")
 def conduct_learning_session(words, lang_pair, language_in, language_out):
-    """Prowadzi sesję nauki słówek"""
+    """
+    Prowadzi sesję nauki słówek
+
+    Fragment - przyciski karty przeładowują tylko kartę; zakończenie sesji
+    zmienia zakładkę, więc przeładowuje całą stronę.
+    """
     if "learning_session" not in st.session_state:
         st.session_state.learning_session = {
             "words": words.copy(),
@@ -407,8 +422,7 @@ def conduct_learning_session(words, lang_pair, language_in, language_out):
                 try:
                     # Debug info
                     st.info(f"Wymawiam '{current_word['original']}' w języku: {language_in}")
-                    audio_bytes = text_to_speech(current_word["original"], language_in)
-                    st.audio(audio_bytes, format="audio/mp3")
+                    play_card_audio(current_word, current_word["original"], language_in, language_in, language_out)
                 except Exception as e:
                     st.error(f"❌ Błąd wymowy: {str(e)}")
                     st.info("💡 Sprawdź konfigurację OpenAI API lub połączenie internetowe")
@@ -440,7 +454,7 @@ def conduct_learning_session(words, lang_pair, language_in, language_out):
                 session["show_translation"] = False
                 session["show_examples"] = False
                 session["show_conjugation"] = False
-                st.rerun()
+                st.rerun(scope="fragment")
         
         # Pokaż tłumaczenie jeśli odkryte
         if session["show_translation"]:
@@ -478,7 +492,7 @@ def conduct_learning_session(words, lang_pair, language_in, language_out):
                     session["show_translation"] = False
                     session["show_examples"] = False
                     session["show_conjugation"] = False
-                    st.rerun()
+                    st.rerun(scope="fragment")
             
             with col2:
                 if st.button("🤔 Częściowo", key="partially"):
@@ -487,7 +501,7 @@ def conduct_learning_session(words, lang_pair, language_in, language_out):
                     session["show_translation"] = False
                     session["show_examples"] = False
                     session["show_conjugation"] = False
-                    st.rerun()
+                    st.rerun(scope="fragment")
             
             with col3:
                 if st.button("😊 Dobrze", key="well_known"):
@@ -497,7 +511,7 @@ def conduct_learning_session(words, lang_pair, language_in, language_out):
                     session["show_translation"] = False
                     session["show_examples"] = False
                     session["show_conjugation"] = False
-                    st.rerun()
+                    st.rerun(scope="fragment")
         
         # Pokaż przykłady jeśli odkryte
         if session["show_examples"] and current_word.get("examples"):
@@ -511,15 +525,13 @@ def conduct_learning_session(words, lang_pair, language_in, language_out):
                     with col1:
                         if st.button(f"🔊 Oryginał", key=f"ex_orig_{i}"):
                             try:
-                                audio_bytes = text_to_speech(example["original"], language_in)
-                                st.audio(audio_bytes, format="audio/mp3")
+                                play_card_audio(current_word, example["original"], language_in, language_in, language_out)
                             except Exception as e:
                                 st.error(f"❌ Błąd wymowy: {str(e)}")
                     with col2:
                         if st.button(f"🔊 Tłumaczenie", key=f"ex_trans_{i}"):
                             try:
-                                audio_bytes = text_to_speech(example["translated"], language_out)
-                                st.audio(audio_bytes, format="audio/mp3")
+                                play_card_audio(current_word, example["translated"], language_out, language_in, language_out)
                             except Exception as e:
                                 st.error(f"❌ Błąd wymowy: {str(e)}")
         
@@ -533,11 +545,16 @@ def conduct_learning_session(words, lang_pair, language_in, language_out):
                     conjugation_key = f"conjugation_{session['current_index']}_{language_in}"
                     if conjugation_key in st.session_state:
                         del st.session_state[conjugation_key]
-                    st.rerun()
+                    # Regeneracja ma pytać AI - gotowe odmiany z pliku kart dałyby ten sam wynik
+                    st.session_state[f"conjugation_skip_bundle_{language_in}_{current_word['original']}"] = True
+                    st.rerun(scope="fragment")
             
             # Sprawdź czy odmiana już została wygenerowana (uwzględnij język w kluczu)
             conjugation_key = f"conjugation_{session['current_index']}_{language_in}"
+            skip_bundle = st.session_state.get(f"conjugation_skip_bundle_{language_in}_{current_word['original']}", False)
             if conjugation_key not in st.session_state:
+                st.session_state[conjugation_key] = None if skip_bundle else get_bundled_conjugation(current_word["original"], language_in)
+            if st.session_state[conjugation_key] is None:
                 with st.spinner("Generuję odmiany słowa..."):
                     conjugation_data = generate_word_conjugation(
                         current_word["original"],
@@ -568,7 +585,7 @@ def conduct_learning_session(words, lang_pair, language_in, language_out):
                        use_container_width=True,
                        help="Zakończy bieżącą sesję nauki"):
                 del st.session_state.learning_session
-                st.rerun()
+                st.rerun()  # cała strona - sesję prowadzi zakładka poza fragmentem
     
     else:
         # Koniec sesji nauki
@@ -604,6 +621,508 @@ def conduct_learning_session(words, lang_pair, language_in, language_out):
                 # Przełącz na tab statystyk - można to zaimplementować później
                 st.info("Przejdź do zakładki 'Statystyki' aby zobaczyć szczegóły")
 
+@fragment("review_card")
+def show_review_card(lang_pair, language_in, language_out):
+    """
+    Karta powtórki bieżącej sesji (st.session_state.review_session)
+
+    Fragment - ocena słówka przeładowuje tylko kartę, nie całą stronę.
+    """
+    session = st.session_state.review_session
+
+    if session["current_index"] < len(session["words"]):
+        current_word = session["words"][session["current_index"]]
+
+        st.write(f"**Słówko {session['current_index'] + 1}/{len(session['words'])}**")
+
+        # Pokaż słówko
+        st.markdown(f"### 🔤 {current_word['original']}")
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            if st.button("🔊 Wymów"):
+                try:
+                    play_card_audio(current_word, current_word["original"], language_in, language_in, language_out)
+                except Exception as e:
+                    st.error(f"❌ Błąd wymowy: {str(e)}")
+
+        with col2:
+            if st.button("👁️ Pokaż odpowiedź"):
+                session["show_answer"] = True
+
+        # Pokaż odpowiedź jeśli odkryta
+        if session["show_answer"]:
+            st.markdown(f"### ✅ {current_word['translation']}")
+
+            if current_word.get("alternatives"):
+                st.write(f"**Alternatywy:** {', '.join(current_word['alternatives'])}")
+
+            # Przyciski oceny
+            col1, col2, col3 = st.columns(3)
+
+            with col1:
+                if st.button("❌ Źle", key="wrong"):
+                    update_word_performance(current_word["id"], lang_pair, False)
+                    session["current_index"] += 1
+                    session["show_answer"] = False
+                    st.rerun(scope="fragment")
+
+            with col2:
+                if st.button("⚡ Trudne", key="hard"):
+                    update_word_performance(current_word["id"], lang_pair, True)
+                    session["current_index"] += 1
+                    session["show_answer"] = False
+                    st.rerun(scope="fragment")
+
+            with col3:
+                if st.button("✅ Łatwe", key="easy"):
+                    update_word_performance(current_word["id"], lang_pair, True)
+                    session["correct_answers"] += 1
+                    session["current_index"] += 1
+                    session["show_answer"] = False
+                    st.rerun(scope="fragment")
+
+    else:
+        # Koniec sesji
+        st.success("🎉 Gratulacje! Ukończyłeś sesję powtórki!")
+        st.write(f"**Wynik:** {session['correct_answers']}/{len(session['words'])}")
+
+        if st.button("🔄 Nowa sesja"):
+            del st.session_state.review_session
+            st.rerun()  # cała strona - nową sesję tworzy zakładka poza fragmentem
+
+def show_learning_tab(lang_pair, language_in, language_out):
+    """Zakładka nauki słówek z bazy użytkownika"""
+    st.subheader("🎓 Nauka słówek z Twojej bazy")
+
+    # Sprawdź czy są słówka w bazie
+    db = load_vocabulary_database()
+
+    if lang_pair not in db["words"] or not db["words"][lang_pair]:
+        st.warning("📭 Nie masz jeszcze słówek w bazie dla tej pary językowej!")
+        st.info("💡 Przejdź do zakładki 'Wybierz słówko' lub 'Dodaj słówko' aby dodać pierwsze słówka.")
+
+        # Pokaż statystyki ogólne
+        total_words = sum(len(words) for words in db["words"].values())
+        if total_words > 0:
+            st.write(f"**Masz łącznie {total_words} słówek w innych parach językowych.**")
+
+            # Pokaż dostępne pary
+            st.write("**Dostępne pary językowe:**")
+            for pair, words in db["words"].items():
+                if words:  # tylko niepuste
+                    lang_from, lang_to = pair.split("_")
+                    st.write(f"• {lang_from} → {lang_to}: {len(words)} słówek")
+    else:
+        words_in_pair = db["words"][lang_pair]
+        st.success(f"🎯 Masz {len(words_in_pair)} słówek w parze {language_in} → {language_out}")
+
+        # Opcje filtrowania
+        col1, col2 = st.columns(2)
+
+        with col1:
+            difficulty_filter = st.selectbox(
+                "Filtruj według poziomu:",
+                ["wszystkie", "basic", "intermediate", "advanced"],
+                help="Wybierz poziom trudności słówek do nauki"
+            )
+
+        with col2:
+            session_length = st.selectbox(
+                "Długość sesji:",
+                [5, 10, 15, 20, 25],
+                index=1,  # domyślnie 10
+                help="Ile słówek chcesz przećwiczyć w tej sesji"
+            )
+
+        # Pobierz słówka do nauki
+        words_to_learn = get_words_for_learning(lang_pair, difficulty_filter, session_length)
+
+        if not words_to_learn:
+            if difficulty_filter != "wszystkie":
+                st.warning(f"🔍 Brak słówek na poziomie '{difficulty_filter}' w Twojej bazie.")
+                st.info("Spróbuj wybrać 'wszystkie' poziomy lub dodaj więcej słówek.")
+            else:
+                st.info("🎉 Wszystkie Twoje słówka są już dobrze opanowane!")
+        else:
+            # Pokaż podgląd słówek
+            with st.expander(f"👀 Podgląd słówek do nauki ({len(words_to_learn)})"):
+                for word in words_to_learn[:5]:  # Pokaż pierwsze 5
+                    mastery_stars = "⭐" * word["mastery_level"]
+                    st.write(f"• **{word['original']}** → {word['translation']} {mastery_stars}")
+
+                if len(words_to_learn) > 5:
+                    st.write(f"... i {len(words_to_learn) - 5} więcej")
+
+            # Statystyki przed sesją
+            col1, col2, col3 = st.columns(3)
+
+            with col1:
+                avg_mastery = sum(w["mastery_level"] for w in words_to_learn) / len(words_to_learn)
+                st.metric("📊 Średni poziom", f"{avg_mastery:.1f}/5")
+
+            with col2:
+                never_reviewed = sum(1 for w in words_to_learn if w["review_count"] == 0)
+                st.metric("🆕 Nowych słówek", never_reviewed)
+
+            with col3:
+                if difficulty_filter != "wszystkie":
+                    level_count = len([w for w in words_in_pair if w.get("difficulty", "basic") == difficulty_filter])
+                    st.metric(f"📚 Poziom {difficulty_filter}", level_count)
+                else:
+                    st.metric("📚 Wszystkie", len(words_to_learn))
+
+            # Przycisk rozpoczęcia sesji
+            #st.markdown("---")
+
+            col1, col2, col3 = st.columns([1, 2, 1])
+            with col2:
+                if st.button(f"🚀 Rozpocznij sesję nauki ({len(words_to_learn)} słówek)", 
+                           type="primary", 
+                           use_container_width=True):
+
+                    # Wyczyść poprzednią sesję jeśli istnieje i utwórz nową
+                    if "learning_session" in st.session_state:
+                        del st.session_state.learning_session
+
+                    # Utwórz nową sesję nauki
+                    st.session_state.learning_session = {
+                        "words": words_to_learn.copy(),
+                        "current_index": 0,
+                        "correct_answers": 0,
+                        "show_translation": False,
+                        "show_examples": False,
+                        "user_answer": ""
+                    }
+
+                    st.rerun()
+
+            # Jeśli sesja jest aktywna, prowadź ją
+            if "learning_session" in st.session_state:
+                #st.markdown("---")
+                conduct_learning_session(words_to_learn, lang_pair, language_in, language_out)
+
+def show_word_sets_tab(lang_pair, language_in, language_out):
+    """Zakładka dodawania słówek z gotowych zestawów"""
+    st.subheader("🎯 Wybierz z gotowych zestawów")
+    st.info("💡 Wybierz zestaw podstawowych słówek, które chcesz dodać do swojej bazy do nauki.")
+
+    # Sprawdź czy język ma dostępne zestawy
+    if language_in not in PREDEFINED_WORD_SETS:
+        st.warning(f"❌ Brak gotowych zestawów dla języka: {language_in}")
+        st.info("💡 Dostępne języki z zestawami: " + ", ".join(PREDEFINED_WORD_SETS.keys()))
+        st.info("🔧 Użyj zakładki 'Dodaj słówko' aby dodać słówka ręcznie.")
+        return
+
+    # Wybór zestawu dla wybranego języka
+    available_sets = list(PREDEFINED_WORD_SETS[language_in].keys())
+    selected_set = st.selectbox(
+        f"Wybierz zestaw słówek ({language_in}):",
+        available_sets,
+        help="Każdy zestaw zawiera starannie dobrane słówka dla danej kategorii"
+    )
+
+    if selected_set:
+        words_in_set = PREDEFINED_WORD_SETS[language_in][selected_set]
+        st.write(f"**Zestaw '{selected_set}' zawiera {len(words_in_set)} słówek ({language_in}):**")
+
+        # Pokaż słówka w zestawie
+        with st.expander(f"👀 Zobacz słówka z zestawu '{selected_set}'"):
+            # Wyświetl w kolumnach dla lepszej czytelności
+            cols = st.columns(5)
+            for i, word in enumerate(words_in_set):
+                with cols[i % 5]:
+                    st.write(f"• {word}")
+
+        # Opcje dodawania
+        col1, col2 = st.columns(2)
+
+        with col1:
+            add_mode = st.radio(
+                "Sposób dodawania:",
+                ["✋ Wybierz konkretne słówka", "🔥 Dodaj wszystkie słówka"],
+                help="Wszystkie: dodaje cały zestaw\nWybrane: możesz zaznaczyć konkretne słówka"
+            )
+
+        with col2:
+            # Sprawdź ile słówek już jest w bazie
+            db = load_vocabulary_database()
+            existing_count = 0
+            if lang_pair in db["words"]:
+                existing_words = [w["original"].lower() for w in db["words"][lang_pair]]
+                existing_count = sum(1 for word in words_in_set if word.lower() in existing_words)
+
+            if existing_count > 0:
+                st.warning(f"⚠️ {existing_count} słówek już jest w bazie")
+            else:
+                st.success("✅ Wszystkie słówka są nowe")
+
+        # Wybór konkretnych słówek jeśli wybrano tryb selekcji
+        selected_words = []
+        if add_mode == "✋ Wybierz konkretne słówka":
+            st.write("**Zaznacz słówka do dodania:**")
+
+            # Sprawdź które są już w bazie
+            existing_words = []
+            if lang_pair in db["words"]:
+                existing_words = [w["original"].lower() for w in db["words"][lang_pair]]
+
+            # Checkbox dla każdego słówka
+            cols = st.columns(3)
+            for i, word in enumerate(words_in_set):
+                with cols[i % 3]:
+                    is_existing = word.lower() in existing_words
+                    disabled = is_existing
+
+                    if st.checkbox(
+                        f"{word}" + (" ✅" if is_existing else ""), 
+                        key=f"word_{i}",
+                        disabled=disabled,
+                        help="To słówko już jest w bazie" if is_existing else None
+                    ):
+                        selected_words.append(word)
+        else:
+            # Dodaj wszystkie (pomijając te które już są)
+            if lang_pair in db["words"]:
+                existing_words = [w["original"].lower() for w in db["words"][lang_pair]]
+                selected_words = [word for word in words_in_set if word.lower() not in existing_words]
+            else:
+                selected_words = words_in_set.copy()
+
+        # Przycisk dodawania
+        if selected_words:
+            st.write(f"**Do dodania: {len(selected_words)} słówek**")
+
+            col1, col2, col3 = st.columns(3)
+
+            with col2:
+                if st.button(f"🚀 Dodaj {len(selected_words)} słówek", type="primary", use_container_width=True):
+                    try:
+                        with st.spinner(f"Dodaję {len(selected_words)} słówek do bazy..."):
+                            progress_bar = st.progress(0)
+                            status_text = st.empty()
+                            success_count = 0
+                            error_count = 0
+
+                            for i, word in enumerate(selected_words):
+                                try:
+                                    status_text.text(f"Przetwarzam: {word} ({i+1}/{len(selected_words)})")
+                                    progress_bar.progress((i + 1) / len(selected_words))
+
+                                    word_data = get_word_data(word, language_in, language_out)
+                                    if word_data:
+                                        add_word_to_database(word_data, lang_pair)
+                                        success_count += 1
+                                    else:
+                                        error_count += 1
+                                        st.warning(f"⚠️ Nie udało się przetworzyć słówka: {word}")
+
+                                except Exception as word_error:
+                                    error_count += 1
+                                    st.error(f"❌ Błąd dla słówka '{word}': {str(word_error)}")
+
+                            progress_bar.empty()
+                            status_text.empty()
+
+                            # Podsumowanie
+                            if success_count > 0:
+                                st.success(f"✅ Pomyślnie dodano {success_count} słówek do bazy!")
+                                if success_count == len(selected_words):
+                                    st.balloons()
+
+                            if error_count > 0:
+                                st.error(f"❌ Nie udało się dodać {error_count} słówek")
+
+                            if success_count > 0:  # Odśwież tylko jeśli coś zostało dodane
+                                st.rerun()
+
+                    except Exception as general_error:
+                        st.error(f"❌ Ogólny błąd podczas dodawania słówek: {str(general_error)}")
+                        with st.expander("🔍 Szczegóły błędu"):
+                            st.code(str(general_error))
+
+        elif add_mode == "✋ Wybierz konkretne słówka":
+            st.info("👆 Zaznacz słówka które chcesz dodać do bazy")
+        else:
+            st.info("✅ Wszystkie słówka z tego zestawu już są w bazie!")
+
+def show_add_word_tab(lang_pair, language_in, language_out):
+    """Zakładka ręcznego dodawania słówek"""
+    st.subheader("Dodaj nowe słówko")
+
+    col1, col2 = st.columns([2, 1])
+
+    with col1:
+        new_word = st.text_input(
+            f"Słowo/fraza w języku {language_in}:",
+            placeholder="np. apple, good morning, I am hungry"
+        )
+
+    with col2:
+        if st.button("🤖 Generuj z AI", disabled=not new_word):
+            if new_word:
+                try:
+                    with st.spinner("Generuję tłumaczenie i przykłady..."):
+                        st.session_state.pop("vocabulary_last_tokens", None)
+                        word_data = generate_word_with_ai(new_word, language_in, language_out)
+                        # Pobierz liczbę tokenów z session_state ustawionego przez handler
+                        if hasattr(st, "session_state") and "last_vocabulary_tokens" in st.session_state:
+                            st.session_state["vocabulary_last_tokens"] = st.session_state["last_vocabulary_tokens"]
+                            st.session_state.pop("last_vocabulary_tokens")
+                        if word_data:
+                            st.session_state.generated_word = word_data
+                            st.session_state.generated_word["original"] = new_word
+                            st.success(f"✅ Pomyślnie wygenerowano dane dla słówka '{new_word}'")
+                        else:
+                            st.error(f"❌ Nie udało się wygenerować danych dla słówka '{new_word}'")
+                except Exception as e:
+                    st.error(f"❌ Wystąpił błąd podczas generowania: {str(e)}")
+                    with st.expander("🔍 Szczegóły błędu"):
+                        st.code(str(e))
+
+    # Wyświetl wygenerowane dane
+    if "generated_word" in st.session_state:
+        word_data = st.session_state.generated_word
+        st.success("✅ Wygenerowano dane słówka:")
+        if "vocabulary_last_tokens" in st.session_state:
+            st.caption(st.session_state["vocabulary_last_tokens"])
+        col1, col2 = st.columns(2)
+        with col1:
+            st.write(f"**{language_in}:** {word_data['original']}")
+            st.write(f"**{language_out}:** {word_data['translation']}")
+            if word_data.get("alternatives"):
+                st.write(f"**Alternatywy:** {', '.join(word_data['alternatives'])}")
+            st.write(f"**Część mowy:** {word_data.get('part_of_speech', 'nieznana')}")
+            st.write(f"**Poziom:** {word_data.get('difficulty', 'nieznany')}")
+        with col2:
+            if st.button("🔊 Wymów oryginał"):
+                try:
+                    play_card_audio(word_data, word_data["original"], language_in, language_in, language_out)
+                except Exception as e:
+                    st.error(f"❌ Błąd wymowy: {str(e)}")
+            if st.button("🔊 Wymów tłumaczenie"):
+                try:
+                    play_card_audio(word_data, word_data["translation"], language_out, language_in, language_out)
+                except Exception as e:
+                    st.error(f"❌ Błąd wymowy: {str(e)}")
+        if word_data.get("examples"):
+            st.write("**Przykłady użycia:**")
+            for i, example in enumerate(word_data["examples"]):
+                with st.expander(f"Przykład {i+1}"):
+                    st.write(f"**{language_in}:** {example['original']}")
+                    st.write(f"**{language_out}:** {example['translated']}")
+
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        if st.button(f"🔊 {language_in}", key=f"ex_orig_{i}"):
+                            try:
+                                play_card_audio(word_data, example["original"], language_in, language_in, language_out)
+                            except Exception as e:
+                                st.error(f"❌ Błąd wymowy: {str(e)}")
+                    with col2:
+                        if st.button(f"🔊 {language_out}", key=f"ex_trans_{i}"):
+                            try:
+                                play_card_audio(word_data, example["translated"], language_out, language_in, language_out)
+                            except Exception as e:
+                                st.error(f"❌ Błąd wymowy: {str(e)}")
+
+        # Dodaj do bazy
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("💾 Dodaj do bazy słówek", type="primary"):
+                try:
+                    word_entry = add_word_to_database(word_data, lang_pair)
+                    st.success(f"✅ Dodano słówko do bazy! ID: {word_entry['id']}")
+                    del st.session_state.generated_word
+                    st.rerun()
+                except Exception as e:
+                    st.error(f"❌ Błąd dodawania do bazy: {str(e)}")
+                    with st.expander("🔍 Szczegóły błędu"):
+                        st.code(str(e))
+
+        with col2:
+            if st.button("🗑️ Odrzuć"):
+                del st.session_state.generated_word
+                st.rerun()
+
+def show_review_tab(lang_pair, language_in, language_out):
+    """Zakładka powtórki słówek"""
+    st.subheader("🔄 Powtórka słówek")
+
+    words_to_review = get_words_for_review(lang_pair)
+
+    if not words_to_review:
+        st.info("🎉 Brak słówek do powtórki! Dodaj nowe słówka lub wróć później.")
+    else:
+        st.write(f"**Słówek do powtórki:** {len(words_to_review)}")
+
+        # Inicjalizuj sesję powtórki
+        if "review_session" not in st.session_state:
+            st.session_state.review_session = {
+                "words": words_to_review.copy(),
+                "current_index": 0,
+                "correct_answers": 0,
+                "show_answer": False
+            }
+
+        show_review_card(lang_pair, language_in, language_out)
+
+def show_test_tab(lang_pair, language_in, language_out):
+    """Zakładka testu wiedzy"""
+    st.subheader("🎯 Test wiedzy")
+    st.info("🚧 Tryb testowy będzie wkrótce dostępny!")
+
+def show_statistics_tab(lang_pair, language_in, language_out):
+    """Zakładka statystyk słówek"""
+    st.subheader("📊 Statystyki słówek")
+
+    db = load_vocabulary_database()
+    stats = db["statistics"]
+
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.metric("📚 Słówka", stats["words_added"])
+
+    with col2:
+        if lang_pair in db["words"]:
+            st.metric("🌍 W tej parze", len(db["words"][lang_pair]))
+        else:
+            st.metric("🌍 W tej parze", 0)
+
+    with col3:
+        ready_count = len(get_words_for_review(lang_pair, 1000))
+        st.metric("🔄 Do powtórki", ready_count)
+
+    with col4:
+        if stats["total_answers"] > 0:
+            accuracy = (stats["correct_answers"] / stats["total_answers"]) * 100
+            st.metric("🎯 Celność", f"{accuracy:.1f}%")
+        else:
+            st.metric("🎯 Celność", "0%")
+
+    # Lista słówek w tej parze języków
+    if lang_pair in db["words"] and db["words"][lang_pair]:
+        st.subheader(f"Słówka {language_in} → {language_out}")
+
+        words = db["words"][lang_pair]
+
+        for word in words[-10:]:  # Ostatnie 10
+            with st.expander(f"{word['original']} → {word['translation']}"):
+                col1, col2 = st.columns(2)
+
+                with col1:
+                    st.write(f"**Poziom opanowania:** {word['mastery_level']}/5")
+                    st.write(f"**Powtórek:** {word['review_count']}")
+
+                with col2:
+                    if word["last_reviewed"]:
+                        last = datetime.fromisoformat(word["last_reviewed"])
+                        st.write(f"**Ostatnia powtórka:** {last.strftime('%d.%m.%Y')}")
+                    else:
+                        st.write("**Ostatnia powtórka:** Nigdy")
+
 def show_vocabulary(language_in, language_out):
     """Główna funkcja modułu nauki słówek"""
     st.header("📚 Nauka słówek")
@@ -666,506 +1185,24 @@ def show_vocabulary(language_in, language_out):
         # Zaktualizuj aktualną parę językową
         st.session_state.current_language_pair = current_language_pair
     
-    # Tabs dla różnych funkcji
-    tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
-        "🎓 Nauka słówek", "🎯 Wybierz słówko", "➕ Dodaj słówko", 
-        "🔄 Powtórka", "🎯 Test", "📊 Statystyki"
-    ])
-    
-    # TAB 1: Nauka słówek z bazy
-    with tab1:
-        st.subheader("🎓 Nauka słówek z Twojej bazy")
-        
-        # Sprawdź czy są słówka w bazie
-        db = load_vocabulary_database()
-        
-        if lang_pair not in db["words"] or not db["words"][lang_pair]:
-            st.warning("📭 Nie masz jeszcze słówek w bazie dla tej pary językowej!")
-            st.info("💡 Przejdź do zakładki 'Wybierz słówko' lub 'Dodaj słówko' aby dodać pierwsze słówka.")
-            
-            # Pokaż statystyki ogólne
-            total_words = sum(len(words) for words in db["words"].values())
-            if total_words > 0:
-                st.write(f"**Masz łącznie {total_words} słówek w innych parach językowych.**")
-                
-                # Pokaż dostępne pary
-                st.write("**Dostępne pary językowe:**")
-                for pair, words in db["words"].items():
-                    if words:  # tylko niepuste
-                        lang_from, lang_to = pair.split("_")
-                        st.write(f"• {lang_from} → {lang_to}: {len(words)} słówek")
-        else:
-            words_in_pair = db["words"][lang_pair]
-            st.success(f"🎯 Masz {len(words_in_pair)} słówek w parze {language_in} → {language_out}")
-            
-            # Opcje filtrowania
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                difficulty_filter = st.selectbox(
-                    "Filtruj według poziomu:",
-                    ["wszystkie", "basic", "intermediate", "advanced"],
-                    help="Wybierz poziom trudności słówek do nauki"
-                )
-            
-            with col2:
-                session_length = st.selectbox(
-                    "Długość sesji:",
-                    [5, 10, 15, 20, 25],
-                    index=1,  # domyślnie 10
-                    help="Ile słówek chcesz przećwiczyć w tej sesji"
-                )
-            
-            # Pobierz słówka do nauki
-            words_to_learn = get_words_for_learning(lang_pair, difficulty_filter, session_length)
-            
-            if not words_to_learn:
-                if difficulty_filter != "wszystkie":
-                    st.warning(f"🔍 Brak słówek na poziomie '{difficulty_filter}' w Twojej bazie.")
-                    st.info("Spróbuj wybrać 'wszystkie' poziomy lub dodaj więcej słówek.")
-                else:
-                    st.info("🎉 Wszystkie Twoje słówka są już dobrze opanowane!")
-            else:
-                # Pokaż podgląd słówek
-                with st.expander(f"👀 Podgląd słówek do nauki ({len(words_to_learn)})"):
-                    for word in words_to_learn[:5]:  # Pokaż pierwsze 5
-                        mastery_stars = "⭐" * word["mastery_level"]
-                        st.write(f"• **{word['original']}** → {word['translation']} {mastery_stars}")
-                    
-                    if len(words_to_learn) > 5:
-                        st.write(f"... i {len(words_to_learn) - 5} więcej")
-                
-                # Statystyki przed sesją
-                col1, col2, col3 = st.columns(3)
-                
-                with col1:
-                    avg_mastery = sum(w["mastery_level"] for w in words_to_learn) / len(words_to_learn)
-                    st.metric("📊 Średni poziom", f"{avg_mastery:.1f}/5")
-                
-                with col2:
-                    never_reviewed = sum(1 for w in words_to_learn if w["review_count"] == 0)
-                    st.metric("🆕 Nowych słówek", never_reviewed)
-                
-                with col3:
-                    if difficulty_filter != "wszystkie":
-                        level_count = len([w for w in words_in_pair if w.get("difficulty", "basic") == difficulty_filter])
-                        st.metric(f"📚 Poziom {difficulty_filter}", level_count)
-                    else:
-                        st.metric("📚 Wszystkie", len(words_to_learn))
-                
-                # Przycisk rozpoczęcia sesji
-                #st.markdown("---")
-                
-                col1, col2, col3 = st.columns([1, 2, 1])
-                with col2:
-                    if st.button(f"🚀 Rozpocznij sesję nauki ({len(words_to_learn)} słówek)", 
-                               type="primary", 
-                               use_container_width=True):
-                        
-                        # Wyczyść poprzednią sesję jeśli istnieje i utwórz nową
-                        if "learning_session" in st.session_state:
-                            del st.session_state.learning_session
-                        
-                        # Utwórz nową sesję nauki
-                        st.session_state.learning_session = {
-                            "words": words_to_learn.copy(),
-                            "current_index": 0,
-                            "correct_answers": 0,
-                            "show_translation": False,
-                            "show_examples": False,
-                            "user_answer": ""
-                        }
-                        
-                        st.rerun()
-                
-                # Jeśli sesja jest aktywna, prowadź ją
-                if "learning_session" in st.session_state:
-                    #st.markdown("---")
-                    conduct_learning_session(words_to_learn, lang_pair, language_in, language_out)
-    
-    # TAB 2: Wybór z gotowych zestawów
-    with tab2:
-        st.subheader("🎯 Wybierz z gotowych zestawów")
-        st.info("💡 Wybierz zestaw podstawowych słówek, które chcesz dodać do swojej bazy do nauki.")
-        
-        # Sprawdź czy język ma dostępne zestawy
-        if language_in not in PREDEFINED_WORD_SETS:
-            st.warning(f"❌ Brak gotowych zestawów dla języka: {language_in}")
-            st.info("💡 Dostępne języki z zestawami: " + ", ".join(PREDEFINED_WORD_SETS.keys()))
-            st.info("🔧 Użyj zakładki 'Dodaj słówko' aby dodać słówka ręcznie.")
-            return
-        
-        # Wybór zestawu dla wybranego języka
-        available_sets = list(PREDEFINED_WORD_SETS[language_in].keys())
-        selected_set = st.selectbox(
-            f"Wybierz zestaw słówek ({language_in}):",
-            available_sets,
-            help="Każdy zestaw zawiera starannie dobrane słówka dla danej kategorii"
-        )
-        
-        if selected_set:
-            words_in_set = PREDEFINED_WORD_SETS[language_in][selected_set]
-            st.write(f"**Zestaw '{selected_set}' zawiera {len(words_in_set)} słówek ({language_in}):**")
-            
-            # Pokaż słówka w zestawie
-            with st.expander(f"👀 Zobacz słówka z zestawu '{selected_set}'"):
-                # Wyświetl w kolumnach dla lepszej czytelności
-                cols = st.columns(5)
-                for i, word in enumerate(words_in_set):
-                    with cols[i % 5]:
-                        st.write(f"• {word}")
-            
-            # Opcje dodawania
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                add_mode = st.radio(
-                    "Sposób dodawania:",
-                    ["✋ Wybierz konkretne słówka", "🔥 Dodaj wszystkie słówka"],
-                    help="Wszystkie: dodaje cały zestaw\nWybrane: możesz zaznaczyć konkretne słówka"
-                )
-            
-            with col2:
-                # Sprawdź ile słówek już jest w bazie
-                db = load_vocabulary_database()
-                existing_count = 0
-                if lang_pair in db["words"]:
-                    existing_words = [w["original"].lower() for w in db["words"][lang_pair]]
-                    existing_count = sum(1 for word in words_in_set if word.lower() in existing_words)
-                
-                if existing_count > 0:
-                    st.warning(f"⚠️ {existing_count} słówek już jest w bazie")
-                else:
-                    st.success("✅ Wszystkie słówka są nowe")
-            
-            # Wybór konkretnych słówek jeśli wybrano tryb selekcji
-            selected_words = []
-            if add_mode == "✋ Wybierz konkretne słówka":
-                st.write("**Zaznacz słówka do dodania:**")
-                
-                # Sprawdź które są już w bazie
-                existing_words = []
-                if lang_pair in db["words"]:
-                    existing_words = [w["original"].lower() for w in db["words"][lang_pair]]
-                
-                # Checkbox dla każdego słówka
-                cols = st.columns(3)
-                for i, word in enumerate(words_in_set):
-                    with cols[i % 3]:
-                        is_existing = word.lower() in existing_words
-                        disabled = is_existing
-                        
-                        if st.checkbox(
-                            f"{word}" + (" ✅" if is_existing else ""), 
-                            key=f"word_{i}",
-                            disabled=disabled,
-                            help="To słówko już jest w bazie" if is_existing else None
-                        ):
-                            selected_words.append(word)
-            else:
-                # Dodaj wszystkie (pomijając te które już są)
-                if lang_pair in db["words"]:
-                    existing_words = [w["original"].lower() for w in db["words"][lang_pair]]
-                    selected_words = [word for word in words_in_set if word.lower() not in existing_words]
-                else:
-                    selected_words = words_in_set.copy()
-            
-            # Przycisk dodawania
-            if selected_words:
-                st.write(f"**Do dodania: {len(selected_words)} słówek**")
-                
-                col1, col2, col3 = st.columns(3)
-                
-                with col2:
-                    if st.button(f"🚀 Dodaj {len(selected_words)} słówek", type="primary", use_container_width=True):
-                        try:
-                            with st.spinner(f"Dodaję {len(selected_words)} słówek do bazy..."):
-                                progress_bar = st.progress(0)
-                                status_text = st.empty()
-                                success_count = 0
-                                error_count = 0
-                                
-                                for i, word in enumerate(selected_words):
-                                    try:
-                                        status_text.text(f"Przetwarzam: {word} ({i+1}/{len(selected_words)})")
-                                        progress_bar.progress((i + 1) / len(selected_words))
-                                        
-                                        word_data = generate_word_with_ai(word, language_in, language_out)
-                                        if word_data:
-                                            add_word_to_database(word_data, lang_pair)
-                                            success_count += 1
-                                        else:
-                                            error_count += 1
-                                            st.warning(f"⚠️ Nie udało się przetworzyć słówka: {word}")
-                                            
-                                    except Exception as word_error:
-                                        error_count += 1
-                                        st.error(f"❌ Błąd dla słówka '{word}': {str(word_error)}")
-                                
-                                progress_bar.empty()
-                                status_text.empty()
-                                
-                                # Podsumowanie
-                                if success_count > 0:
-                                    st.success(f"✅ Pomyślnie dodano {success_count} słówek do bazy!")
-                                    if success_count == len(selected_words):
-                                        st.balloons()
-                                
-                                if error_count > 0:
-                                    st.error(f"❌ Nie udało się dodać {error_count} słówek")
-                                
-                                if success_count > 0:  # Odśwież tylko jeśli coś zostało dodane
-                                    st.rerun()
-                                    
-                        except Exception as general_error:
-                            st.error(f"❌ Ogólny błąd podczas dodawania słówek: {str(general_error)}")
-                            with st.expander("🔍 Szczegóły błędu"):
-                                st.code(str(general_error))
-            
-            elif add_mode == "✋ Wybierz konkretne słówka":
-                st.info("👆 Zaznacz słówka które chcesz dodać do bazy")
-            else:
-                st.info("✅ Wszystkie słówka z tego zestawu już są w bazie!")
-    
-    # TAB 3: Dodawanie słówek
-    with tab3:
-        st.subheader("Dodaj nowe słówko")
-        
-        col1, col2 = st.columns([2, 1])
-        
-        with col1:
-            new_word = st.text_input(
-                f"Słowo/fraza w języku {language_in}:",
-                placeholder="np. apple, good morning, I am hungry"
-            )
-        
-        with col2:
-            if st.button("🤖 Generuj z AI", disabled=not new_word):
-                if new_word:
-                    try:
-                        with st.spinner("Generuję tłumaczenie i przykłady..."):
-                            st.session_state.pop("vocabulary_last_tokens", None)
-                            word_data = generate_word_with_ai(new_word, language_in, language_out)
-                            # Pobierz liczbę tokenów z session_state ustawionego przez handler
-                            if hasattr(st, "session_state") and "last_vocabulary_tokens" in st.session_state:
-                                st.session_state["vocabulary_last_tokens"] = st.session_state["last_vocabulary_tokens"]
-                                st.session_state.pop("last_vocabulary_tokens")
-                            if word_data:
-                                st.session_state.generated_word = word_data
-                                st.session_state.generated_word["original"] = new_word
-                                st.success(f"✅ Pomyślnie wygenerowano dane dla słówka '{new_word}'")
-                            else:
-                                st.error(f"❌ Nie udało się wygenerować danych dla słówka '{new_word}'")
-                    except Exception as e:
-                        st.error(f"❌ Wystąpił błąd podczas generowania: {str(e)}")
-                        with st.expander("🔍 Szczegóły błędu"):
-                            st.code(str(e))
-        
-        # Wyświetl wygenerowane dane
-        if "generated_word" in st.session_state:
-            word_data = st.session_state.generated_word
-            st.success("✅ Wygenerowano dane słówka:")
-            if "vocabulary_last_tokens" in st.session_state:
-                st.caption(st.session_state["vocabulary_last_tokens"])
-            col1, col2 = st.columns(2)
-            with col1:
-                st.write(f"**{language_in}:** {word_data['original']}")
-                st.write(f"**{language_out}:** {word_data['translation']}")
-                if word_data.get("alternatives"):
-                    st.write(f"**Alternatywy:** {', '.join(word_data['alternatives'])}")
-                st.write(f"**Część mowy:** {word_data.get('part_of_speech', 'nieznana')}")
-                st.write(f"**Poziom:** {word_data.get('difficulty', 'nieznany')}")
-            with col2:
-                if st.button("🔊 Wymów oryginał"):
-                    try:
-                        audio_bytes = text_to_speech(word_data["original"], language_in)
-                        st.audio(audio_bytes, format="audio/mp3")
-                    except Exception as e:
-                        st.error(f"❌ Błąd wymowy: {str(e)}")
-                if st.button("🔊 Wymów tłumaczenie"):
-                    try:
-                        audio_bytes = text_to_speech(word_data["translation"], language_out)
-                        st.audio(audio_bytes, format="audio/mp3")
-                    except Exception as e:
-                        st.error(f"❌ Błąd wymowy: {str(e)}")
-            if word_data.get("examples"):
-                st.write("**Przykłady użycia:**")
-                for i, example in enumerate(word_data["examples"]):
-                    with st.expander(f"Przykład {i+1}"):
-                        st.write(f"**{language_in}:** {example['original']}")
-                        st.write(f"**{language_out}:** {example['translated']}")
-                        
-                        col1, col2 = st.columns(2)
-                        with col1:
-                            if st.button(f"🔊 {language_in}", key=f"ex_orig_{i}"):
-                                try:
-                                    audio_bytes = text_to_speech(example["original"], language_in)
-                                    st.audio(audio_bytes, format="audio/mp3")
-                                except Exception as e:
-                                    st.error(f"❌ Błąd wymowy: {str(e)}")
-                        with col2:
-                            if st.button(f"🔊 {language_out}", key=f"ex_trans_{i}"):
-                                try:
-                                    audio_bytes = text_to_speech(example["translated"], language_out)
-                                    st.audio(audio_bytes, format="audio/mp3")
-                                except Exception as e:
-                                    st.error(f"❌ Błąd wymowy: {str(e)}")
-            
-            # Dodaj do bazy
-            col1, col2 = st.columns(2)
-            with col1:
-                if st.button("💾 Dodaj do bazy słówek", type="primary"):
-                    try:
-                        word_entry = add_word_to_database(word_data, lang_pair)
-                        st.success(f"✅ Dodano słówko do bazy! ID: {word_entry['id']}")
-                        del st.session_state.generated_word
-                        st.rerun()
-                    except Exception as e:
-                        st.error(f"❌ Błąd dodawania do bazy: {str(e)}")
-                        with st.expander("🔍 Szczegóły błędu"):
-                            st.code(str(e))
-            
-            with col2:
-                if st.button("🗑️ Odrzuć"):
-                    del st.session_state.generated_word
-                    st.rerun()
-    
-    # TAB 4: Powtórka
-    with tab4:
-        st.subheader("🔄 Powtórka słówek")
-        
-        words_to_review = get_words_for_review(lang_pair)
-        
-        if not words_to_review:
-            st.info("🎉 Brak słówek do powtórki! Dodaj nowe słówka lub wróć później.")
-        else:
-            st.write(f"**Słówek do powtórki:** {len(words_to_review)}")
-            
-            # Inicjalizuj sesję powtórki
-            if "review_session" not in st.session_state:
-                st.session_state.review_session = {
-                    "words": words_to_review.copy(),
-                    "current_index": 0,
-                    "correct_answers": 0,
-                    "show_answer": False
-                }
-            
-            session = st.session_state.review_session
-            
-            if session["current_index"] < len(session["words"]):
-                current_word = session["words"][session["current_index"]]
-                
-                st.write(f"**Słówko {session['current_index'] + 1}/{len(session['words'])}**")
-                
-                # Pokaż słówko
-                st.markdown(f"### 🔤 {current_word['original']}")
-                
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    if st.button("🔊 Wymów"):
-                        try:
-                            audio_bytes = text_to_speech(current_word["original"], language_in)
-                            st.audio(audio_bytes, format="audio/mp3")
-                        except Exception as e:
-                            st.error(f"❌ Błąd wymowy: {str(e)}")
-                
-                with col2:
-                    if st.button("👁️ Pokaż odpowiedź"):
-                        session["show_answer"] = True
-                
-                # Pokaż odpowiedź jeśli odkryta
-                if session["show_answer"]:
-                    st.markdown(f"### ✅ {current_word['translation']}")
-                    
-                    if current_word.get("alternatives"):
-                        st.write(f"**Alternatywy:** {', '.join(current_word['alternatives'])}")
-                    
-                    # Przyciski oceny
-                    col1, col2, col3 = st.columns(3)
-                    
-                    with col1:
-                        if st.button("❌ Źle", key="wrong"):
-                            update_word_performance(current_word["id"], lang_pair, False)
-                            session["current_index"] += 1
-                            session["show_answer"] = False
-                            st.rerun()
-                    
-                    with col2:
-                        if st.button("⚡ Trudne", key="hard"):
-                            update_word_performance(current_word["id"], lang_pair, True)
-                            session["current_index"] += 1
-                            session["show_answer"] = False
-                            st.rerun()
-                    
-                    with col3:
-                        if st.button("✅ Łatwe", key="easy"):
-                            update_word_performance(current_word["id"], lang_pair, True)
-                            session["correct_answers"] += 1
-                            session["current_index"] += 1
-                            session["show_answer"] = False
-                            st.rerun()
-            
-            else:
-                # Koniec sesji
-                st.success("🎉 Gratulacje! Ukończyłeś sesję powtórki!")
-                st.write(f"**Wynik:** {session['correct_answers']}/{len(session['words'])}")
-                
-                if st.button("🔄 Nowa sesja"):
-                    del st.session_state.review_session
-                    st.rerun()
-    
-    # TAB 5: Test
-    with tab5:
-        st.subheader("🎯 Test wiedzy")
-        st.info("🚧 Tryb testowy będzie wkrótce dostępny!")
-    
-    # TAB 6: Statystyki
-    with tab6:
-        st.subheader("📊 Statystyki słówek")
-        
-        db = load_vocabulary_database()
-        stats = db["statistics"]
-        
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            st.metric("📚 Słówka", stats["words_added"])
-        
-        with col2:
-            if lang_pair in db["words"]:
-                st.metric("🌍 W tej parze", len(db["words"][lang_pair]))
-            else:
-                st.metric("🌍 W tej parze", 0)
-        
-        with col3:
-            ready_count = len(get_words_for_review(lang_pair, 1000))
-            st.metric("🔄 Do powtórki", ready_count)
-        
-        with col4:
-            if stats["total_answers"] > 0:
-                accuracy = (stats["correct_answers"] / stats["total_answers"]) * 100
-                st.metric("🎯 Celność", f"{accuracy:.1f}%")
-            else:
-                st.metric("🎯 Celność", "0%")
-        
-        # Lista słówek w tej parze języków
-        if lang_pair in db["words"] and db["words"][lang_pair]:
-            st.subheader(f"Słówka {language_in} → {language_out}")
-            
-            words = db["words"][lang_pair]
-            
-            for word in words[-10:]:  # Ostatnie 10
-                with st.expander(f"{word['original']} → {word['translation']}"):
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        st.write(f"**Poziom opanowania:** {word['mastery_level']}/5")
-                        st.write(f"**Powtórek:** {word['review_count']}")
-                    
-                    with col2:
-                        if word["last_reviewed"]:
-                            last = datetime.fromisoformat(word["last_reviewed"])
-                            st.write(f"**Ostatnia powtórka:** {last.strftime('%d.%m.%Y')}")
-                        else:
-                            st.write("**Ostatnia powtórka:** Nigdy")
\ No newline at end of file
+    # Wykonywana jest tylko wybrana zakładka - st.tabs budowało wszystkie sześć przy każdym przebiegu
+    tabs = {
+        "🎓 Nauka słówek": show_learning_tab,
+        "🎯 Wybierz słówko": show_word_sets_tab,
+        "➕ Dodaj słówko": show_add_word_tab,
+        "🔄 Powtórka": show_review_tab,
+        "🎯 Test": show_test_tab,
+        "📊 Statystyki": show_statistics_tab,
+    }
+    # Klucz widgetu znika, gdy strona słówek nie jest wyświetlana - wybór pamiętamy osobno
+    if "vocabulary_tab" not in st.session_state:
+        st.session_state.vocabulary_tab = st.session_state.get("vocabulary_active_tab", next(iter(tabs)))
+    active_tab = st.radio(
+        "Zakładka",
+        list(tabs),
+        key="vocabulary_tab",
+        horizontal=True,
+        label_visibility="collapsed",
+    )
+    st.session_state.vocabulary_active_tab = active_tab
+    tabs[active_tab](lang_pair, language_in, language_out)
@@ -0,0 +1,43 @@
+"""Zliczanie zużycia poza wątkiem skryptu Streamlit (utils/ai_stats.py)"""
+
+import threading
+
+import pytest
+
+from utils import ai_stats
+
+
+@pytest.fixture
+def pending(monkeypatch):
+    fresh = ai_stats._new_pending()
+    monkeypatch.setattr(ai_stats, "_pending", fresh)
+    monkeypatch.setattr(ai_stats, "_flush_if_needed", lambda flush_now: None)
+    monkeypatch.setattr(ai_stats, "init_token_tracking",
+                        lambda: pytest.fail("liczniki sesji poza wątkiem skryptu"))
+    return fresh
+
+
+def _run_in_worker(func, *args):
+    errors = []
+
+    def target():
+        try:
+            func(*args)
+        except BaseException as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=target)
+    thread.start()
+    thread.join()
+    assert not errors, errors
+
+
+def test_usage_from_worker_thread_is_queued_without_session_state(pending):
+    _run_in_worker(ai_stats.add_whisper_usage, 90.0)
+    _run_in_worker(ai_stats.add_tts_usage, 40, "gtts")
+    _run_in_worker(ai_stats.add_token_usage, "translator", 10, 5, "gpt-4o-mini")
+
+    assert [row["module"] for row in pending["rows"]] == ["whisper", "tts", "translator"]
+    assert pending["total"]["whisper_minutes"] == 1.5
+    assert pending["total"]["tts_chars_gtts"] == 40
+    assert pending["total"]["translator.total"] == 15
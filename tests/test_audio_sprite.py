@@ -0,0 +1,56 @@
+"""Audio sprite karty słówka (utils/audio_sprite.py)"""
+
+import pytest
+
+pytest.importorskip("streamlit")
+from streamlit.testing.v1 import AppTest
+
+from utils import audio_sprite, config
+
+PHRASES = ["house", "The house is big."]
+
+
+def test_gtts_sprite_bills_phrases_and_widens_estimated_segments(monkeypatch):
+    billed = []
+    monkeypatch.setattr(config, "synthesize_gtts", lambda text, language: b"mp3")
+    monkeypatch.setattr(audio_sprite, "estimate_mp3_duration", lambda audio_bytes: 4.0)
+    monkeypatch.setattr(audio_sprite, "add_tts_usage", lambda length, provider: billed.append((length, provider)))
+
+    audio_bytes, audio_format, segments = audio_sprite.synthesize_sprite(PHRASES, "angielski", "gtts")
+
+    assert (audio_bytes, audio_format) == (b"mp3", "mp3")
+    assert billed == [(len("house") + len("The house is big."), "gtts")]
+    estimated = audio_sprite._proportional_segments(PHRASES, 4.0)
+    margin = audio_sprite.SPRITE_ESTIMATE_MARGIN
+    assert segments[0] == (0.0, round(estimated[0][1] + margin, 3))
+    assert segments[1] == (round(estimated[1][0] - margin, 3), 4.0)
+
+
+def _card_page():
+    import streamlit as st
+    from utils import audio_sprite, config
+
+    def failing_sprite(phrases, language, provider):
+        raise RuntimeError("gTTS niedostępne")
+
+    st.session_state["tts_sprite_mode"] = True
+    st.session_state["tts_provider"] = "gTTS (Google)"
+    audio_sprite.get_language_sprite = failing_sprite
+    config.text_to_speech = lambda text, language: b"ID3single"
+    word = {"original": "house", "translation": "dom", "examples": []}
+    audio_sprite.play_card_audio(word, "house", "angielski", "angielski", "polski")
+
+
+def test_sprite_failure_falls_back_to_text_to_speech(monkeypatch):
+    # Funkcje podmienia skrypt - monkeypatch przywraca je po teście
+    monkeypatch.setattr(audio_sprite, "get_language_sprite", audio_sprite.get_language_sprite)
+    monkeypatch.setattr(config, "text_to_speech", config.text_to_speech)
+    if "gtts" not in config.get_registered_providers():
+        pytest.skip("gTTS nie jest zainstalowane")
+
+    app = AppTest.from_function(_card_page)
+    app.run()
+
+    assert not app.exception
+    assert len(app.get("audio")) == 1
+    assert "card_sprites" in app.session_state and not app.session_state["card_sprites"]
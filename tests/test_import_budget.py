@@ -0,0 +1,23 @@
+"""Budżet czasu importu przy starcie aplikacji (utils/import_budget.py)"""
+
+import pytest
+
+pytest.importorskip("streamlit")
+
+from utils import import_budget
+
+RUNS = 3
+
+
+def test_startup_imports_within_recorded_budget():
+    baseline = import_budget.load_baseline()
+    assert baseline is not None, f"brak pomiaru wzorcowego {import_budget.BASELINE_FILE} (--record)"
+    assert not baseline["eager"]
+
+    # Najlepszy z kilku pomiarów - pojedynczy bywa zawyżony przez obciążenie maszyny
+    best = min((import_budget.measure_once() for _ in range(RUNS)), key=lambda m: m["startup_ms"])
+
+    assert import_budget.find_eager_imports(best["imported"]) == []
+    assert best["startup_ms"] <= baseline["budget_ms"], (
+        f"import modułów aplikacji {best['startup_ms']:.0f} ms > budżet {baseline['budget_ms']:.0f} ms"
+    )
@@ -0,0 +1,41 @@
+"""Testy transkrypcji długich nagrań (utils/long_audio.py)"""
+
+import threading
+
+from utils import long_audio
+
+
+class FakeBackend:
+    """Backend zapisujący argumenty wywołań run()"""
+
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def run(self, upload, language_code="en", task="transcribe"):
+        with self._lock:
+            self.calls.append((upload, language_code, task))
+        filename, data, mime = upload
+        return f"okno{len(data)}"
+
+
+def test_transcribe_long_audio_passes_filename_data_mime(monkeypatch):
+    # Bez numpy: nagranie to lista próbek, okna i kodowanie podstawione
+    monkeypatch.setattr(long_audio, "load_speech_mono", lambda audio_bytes: list(range(30)))
+    monkeypatch.setattr(long_audio, "split_windows", lambda mono: [(0, 10), (8, 30)])
+    monkeypatch.setattr(long_audio, "encode_for_upload",
+                        lambda chunk: (b"x" * len(chunk), "recording.flac", "audio/flac"))
+    monkeypatch.setattr(long_audio, "get_wav_duration", lambda audio_bytes: 300.0)
+    backend = FakeBackend()
+
+    text, info = long_audio.transcribe_long_audio(b"wav", "pl", backend)
+
+    uploads = sorted(call[0] for call in backend.calls)
+    assert uploads == [
+        ("recording.flac", b"x" * 10, "audio/flac"),
+        ("recording.flac", b"x" * 22, "audio/flac"),
+    ]
+    assert all(call[1:] == ("pl", "transcribe") for call in backend.calls)
+    assert text == "okno10 okno22"
+    assert info["processed_bytes"] == 32
+    assert info["original_bytes"] == 3
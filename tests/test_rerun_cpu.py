@@ -0,0 +1,63 @@
+"""Pomiar czasu CPU przebiegów i fragmentów Streamlit (utils/rerun_cpu.py)"""
+
+import pytest
+
+pytest.importorskip("streamlit")
+from streamlit.testing.v1 import AppTest
+
+from utils import metrics
+from utils.rerun_cpu import measure_run
+
+
+def _observations(scope):
+    buckets, total = metrics._histograms.get(("rerun_cpu_seconds", (scope,)), ([0], 0.0))
+    return sum(buckets), total
+
+
+@pytest.fixture(autouse=True)
+def histograms(monkeypatch):
+    monkeypatch.setattr(metrics, "_histograms", {})
+
+
+def test_measure_run_observes_interrupted_run():
+    with pytest.raises(RuntimeError):
+        with measure_run("test_interrupted"):
+            sum(i * i for i in range(10000))
+            raise RuntimeError("jak st.rerun() lub st.stop()")
+
+    count, total = _observations("test_interrupted")
+    assert count == 1
+    assert total > 0
+
+
+def _page_with_fragment():
+    import streamlit as st
+    from utils.rerun_cpu import fragment, measure_run
+
+    @fragment("test_card")
+    def card():
+        st.session_state["clicks"] = st.session_state.get("clicks", 0)
+        if st.button("Dalej"):
+            st.session_state["clicks"] += 1
+        st.write(f"Kliknięcia: {st.session_state['clicks']}")
+
+    with measure_run("app"):
+        st.title("Strona")
+        card()
+
+
+def test_fragment_runs_observed_per_scope():
+    app = AppTest.from_function(_page_with_fragment)
+    app.run()
+    assert not app.exception
+    assert _observations("app")[0] == 1
+    assert _observations("test_card")[0] == 1
+
+    # AppTest po kliknięciu wykonuje cały skrypt - każdy przebieg fragmentu ma swoją obserwację
+    app.button[0].click().run()
+    assert not app.exception
+    assert app.markdown[-1].value == "Kliknięcia: 1"
+    assert _observations("test_card")[0] == 2
+
+    rendered = metrics.render()
+    assert f'{metrics.METRICS_PREFIX}_rerun_cpu_seconds_count{{scope="test_card"}} 2' in rendered
@@ -0,0 +1,98 @@
+"""Testy nagrywania strumieniowego (utils/streaming_recorder.py)"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from utils import asr_backends, streaming_recorder
+from utils.streaming_recorder import BLOCK_MS, SAMPLE_RATE, StreamingRecorder
+
+
+class FakeInputStream:
+    """Strumień wejściowy bez mikrofonu - bloki podaje test przez feed()"""
+
+    def __init__(self, samplerate, channels, dtype, blocksize, callback):
+        self.blocksize = blocksize
+        self.callback = callback
+        self.started = False
+        self.closed = False
+
+    def start(self):
+        self.started = True
+
+    def stop(self):
+        self.started = False
+
+    def close(self):
+        self.closed = True
+
+    def feed(self, amplitude, milliseconds):
+        for _ in range(milliseconds // BLOCK_MS):
+            block = np.full((self.blocksize, 1), amplitude, dtype=np.int16)
+            self.callback(block, self.blocksize, None, None)
+
+
+class FakeSoundDevice:
+    def __init__(self):
+        self.streams = []
+
+    def InputStream(self, **kwargs):
+        stream = FakeInputStream(**kwargs)
+        self.streams.append(stream)
+        return stream
+
+
+@pytest.fixture
+def sounddevice(monkeypatch):
+    fake = FakeSoundDevice()
+    monkeypatch.setattr(streaming_recorder, "optional_import", lambda name: fake)
+    return fake
+
+
+def test_start_stop_transcribes_chunks_cut_on_pauses(sounddevice, monkeypatch):
+    calls = []
+
+    def fake_transcribe_upload(wav_bytes, language_code):
+        calls.append(language_code)
+        return f" fragment{len(calls)} ", "local", {}
+
+    monkeypatch.setattr(asr_backends, "transcribe_upload", fake_transcribe_upload)
+    recorder = StreamingRecorder("pl")
+    recorder.start()
+    stream = sounddevice.streams[0]
+    assert stream.started
+
+    # Mowa 1,5 s + pauza 0,8 s (cięcie), potem mowa do końca nagrania
+    stream.feed(3000, 1500)
+    stream.feed(0, 800)
+    stream.feed(3000, 1200)
+    text = recorder.stop()
+
+    assert stream.closed
+    assert calls == ["pl", "pl"]
+    assert text == "fragment1 fragment2"
+    assert recorder.drain_usage() == [("local", {}), ("local", {})]
+    assert recorder.pending_chunks() == 0
+
+
+def test_silence_is_not_transcribed(sounddevice, monkeypatch):
+    monkeypatch.setattr(asr_backends, "transcribe_upload",
+                        lambda wav_bytes, language_code: pytest.fail("cisza wysłana do transkrypcji"))
+    recorder = StreamingRecorder("en")
+    recorder.start()
+    sounddevice.streams[0].feed(0, 2000)
+    assert recorder.stop() == ""
+
+
+def test_failed_stream_open_leaves_no_running_threads(monkeypatch):
+    class BrokenSoundDevice:
+        def InputStream(self, **kwargs):
+            raise OSError("brak urządzenia wejściowego")
+
+    monkeypatch.setattr(streaming_recorder, "optional_import", lambda name: BrokenSoundDevice())
+    recorder = StreamingRecorder("en")
+    with pytest.raises(OSError):
+        recorder.start()
+    assert recorder._worker is None
+    assert recorder._stream is None
+    assert not recorder._running
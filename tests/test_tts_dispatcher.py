@@ -0,0 +1,124 @@
+"""Dyspozytor TTS - fallback, cooldown, hedging i rozliczanie (utils/tts_dispatcher.py)"""
+
+import threading
+import time
+
+import pytest
+
+from utils import tts_dispatcher
+from utils.tts_dispatcher import dispatch_tts, register_tts_provider
+
+
+@pytest.fixture(autouse=True)
+def providers(monkeypatch):
+    monkeypatch.setattr(tts_dispatcher, "_providers", {})
+    monkeypatch.setattr(tts_dispatcher, "_stats", {})
+
+
+def failing(text, language):
+    raise RuntimeError("503")
+
+
+def test_fallback_to_next_provider_and_bill_only_success():
+    register_tts_provider("primary", failing)
+    register_tts_provider("backup", lambda text, language: b"backup-audio")
+    billed = []
+
+    result = dispatch_tts("hello", "angielski", ["primary", "backup"], hedge=False, on_complete=billed.append)
+
+    assert result.audio_bytes == b"backup-audio"
+    assert result.provider == "backup"
+    assert result.fell_back
+    assert list(result.errors) == ["primary"]
+    assert billed == ["backup"]
+
+
+def test_failing_provider_is_skipped_during_cooldown():
+    calls = []
+
+    def flaky(text, language):
+        calls.append(text)
+        raise RuntimeError("503")
+
+    register_tts_provider("primary", flaky)
+    register_tts_provider("backup", lambda text, language: b"backup-audio")
+    for attempt in range(tts_dispatcher.FAILURES_TO_TRIP):
+        dispatch_tts(f"t{attempt}", "angielski", ["primary", "backup"], hedge=False)
+    assert tts_dispatcher.get_tts_health()["primary"]["down"]
+
+    result = dispatch_tts("later", "angielski", ["primary", "backup"], hedge=False)
+
+    assert result.launched == ["backup"]
+    assert len(calls) == tts_dispatcher.FAILURES_TO_TRIP
+
+
+def test_all_providers_failing_raises():
+    register_tts_provider("primary", failing)
+    with pytest.raises(RuntimeError):
+        dispatch_tts("hello", "angielski", ["primary"], on_complete=pytest.fail)
+
+
+def test_hedge_winner_billed_and_slow_loser_billed_when_it_finishes(monkeypatch):
+    monkeypatch.setattr(tts_dispatcher, "DEFAULT_HEDGE_DELAY", 0.05)
+    release = threading.Event()
+    loser_billed = threading.Event()
+
+    def slow(text, language):
+        release.wait(5)
+        return b"slow-audio"
+
+    register_tts_provider("slow", slow)
+    register_tts_provider("fast", lambda text, language: b"fast-audio")
+    billed = []
+
+    def on_complete(name):
+        billed.append(name)
+        if name == "slow":
+            loser_billed.set()
+
+    result = dispatch_tts("hello", "angielski", ["slow", "fast"], hedge=True, on_complete=on_complete)
+
+    assert result.hedged
+    assert result.provider == "fast"
+    assert result.launched == ["slow", "fast"]
+    assert billed == ["fast"]
+    release.set()
+    assert loser_billed.wait(5)
+    assert billed == ["fast", "slow"]
+
+
+def test_hedge_loser_failing_is_not_billed(monkeypatch):
+    monkeypatch.setattr(tts_dispatcher, "DEFAULT_HEDGE_DELAY", 0.05)
+    release = threading.Event()
+
+    def slow_failing(text, language):
+        release.wait(5)
+        raise RuntimeError("timeout")
+
+    register_tts_provider("slow", slow_failing)
+    register_tts_provider("fast", lambda text, language: b"fast-audio")
+    billed = []
+
+    dispatch_tts("hello", "angielski", ["slow", "fast"], hedge=True, on_complete=billed.append)
+    release.set()
+    deadline = time.monotonic() + 5
+    while not tts_dispatcher.get_tts_health()["slow"]["failures"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    # Callback przegranego działa w wątku dyspozytora tuż po zapisaniu błędu
+    time.sleep(0.1)
+
+    assert tts_dispatcher.get_tts_health()["slow"]["failures"] == 1
+    assert billed == ["fast"]
+
+
+def test_text_to_speech_without_providers_shows_error(monkeypatch):
+    pytest.importorskip("streamlit")
+    from utils import config
+
+    errors = []
+    monkeypatch.setattr(config, "get_tts_providers", lambda: [])
+    monkeypatch.setattr(config.st, "error", errors.append)
+    monkeypatch.setattr(config, "dispatch_tts", lambda *args, **kwargs: pytest.fail("dyspozycja bez dostawców"))
+
+    assert config.text_to_speech("hello", "angielski") is None
+    assert len(errors) == 1
@@ -0,0 +1,62 @@
+"""Dodawanie słówek z gotowych zestawów (modules/vocabulary.py) z pliku kart utils/card_bundle.py"""
+
+import json
+import os
+from contextlib import nullcontext
+
+import pytest
+
+pytest.importorskip("streamlit")
+from streamlit.testing.v1 import AppTest
+
+from modules import vocabulary
+from utils import card_bundle
+
+WORDS = vocabulary.PREDEFINED_WORD_SETS["angielski"]["Podstawowe czasowniki"][:3]
+
+
+def _no_api_call(language):
+    raise AssertionError(f"zapytanie do API dla języka {language}")
+
+
+@pytest.fixture
+def bundle_dir(tmp_path, monkeypatch):
+    """Plik kart z WORDS i pusta baza słówek w katalogu tymczasowym"""
+    bundle = card_bundle.new_bundle()
+    bundle["cards"]["angielski_polski"] = {
+        word: {"translation": f"{word}-pl", "examples": [], "difficulty": "easy"} for word in WORDS
+    }
+    bundle_file = str(tmp_path / "card_bundle.json.gz")
+    card_bundle.save_card_bundle(bundle, bundle_file)
+    monkeypatch.setattr(card_bundle, "CARD_BUNDLE_FILE", bundle_file)
+    monkeypatch.setattr(card_bundle, "_bundle_cache", {"mtime": None, "bundle": None})
+    monkeypatch.setattr(vocabulary, "VOCABULARY_FILE", str(tmp_path / "vocabulary_database.json"))
+    monkeypatch.setattr(vocabulary, "get_ai_handler", _no_api_call)
+    return tmp_path
+
+
+def _word_sets_page():
+    from modules.vocabulary import show_word_sets_tab
+    show_word_sets_tab("angielski_polski", "angielski", "polski")
+
+
+def test_word_set_add_uses_bundle_without_api_calls(bundle_dir):
+    app = AppTest.from_function(_word_sets_page)
+    app.run()
+    for index in range(len(WORDS)):
+        app.checkbox(key=f"word_{index}").check()
+    app.run()
+    app.button[0].click()
+    app.run()
+
+    assert not app.exception
+    with open(os.path.join(bundle_dir, "vocabulary_database.json"), encoding="utf-8") as f:
+        added = json.load(f)["words"]["angielski_polski"]
+    assert [(word["original"], word["translation"]) for word in added] == [(w, f"{w}-pl") for w in WORDS]
+
+
+def test_quick_add_from_set_uses_bundle_without_api_calls(bundle_dir, monkeypatch):
+    monkeypatch.setattr(vocabulary.st, "spinner", lambda text: nullcontext())
+    assert vocabulary.quick_add_from_set(WORDS, "angielski", "polski", "angielski_polski") == len(WORDS)
+    assert vocabulary.quick_add_from_set(WORDS, "angielski", "polski", "angielski_polski") == 0
+
@@ -0,0 +1,25 @@
+"""Rozliczanie zużycia TTS w potoku tłumacza głosowego (utils/voice_pipeline.py)"""
+
+from utils import ai_stats
+from utils.voice_pipeline import VoiceTranslationPipeline
+
+
+def test_tts_usage_reported_after_close_goes_to_stats(monkeypatch):
+    billed = []
+    monkeypatch.setattr(ai_stats, "add_tts_usage", lambda text_length, provider: billed.append((text_length, provider)))
+    pipeline = VoiceTranslationPipeline("polski", "angielski", ["gtts"], "gpt-4o-mini")
+
+    # Zwycięzca przed "done" i przegrany w hedgingu, który skończył tuż po nim
+    pipeline._report_tts_usage(12, "openai")
+    pipeline.events.put(("done", None))
+    pipeline._report_tts_usage(12, "gtts")
+    assert pipeline.events.get_nowait() == ("tts_usage", (12, "openai"))
+    assert pipeline.events.get_nowait() == ("done", None)
+
+    assert pipeline.close() == [("tts_usage", (12, "gtts"))]
+    assert billed == []
+
+    # Przegrany kończący po zamknięciu potoku - prosto do statystyk
+    pipeline._report_tts_usage(7, "gtts")
+    assert billed == [(7, "gtts")]
+    assert pipeline.events.empty()
@@ -1,33 +1,69 @@
 """Moduł do zliczania kosztów i statystyk AI/TTS/Whisper"""
 
 import streamlit as st
+import atexit
+import copy
 import json
 import os
+import sqlite3
+import threading
+import time
 from datetime import datetime
 
+from utils import metrics, usage_store
+from utils.latency import latency_bucket, summarize_histogram
+
+# Dawna baza JSON - importowana jednorazowo do usage_store przy pierwszym uruchomieniu
 DB_FILE = os.path.join("base", "usage_database.json")
+TOKEN_MODULES = ["translator", "belfer", "dialog", "vocabulary"]
+
+# Zapis z opóźnieniem: przyrosty zbierane w pamięci trafiają do shardu procesu jedną transakcją
+# co USAGE_FLUSH_SECONDS, po USAGE_FLUSH_EVERY zdarzeniach i przy zamykaniu procesu
+USAGE_FLUSH_SECONDS = float(os.environ.get("USAGE_FLUSH_SECONDS", "5"))
+USAGE_FLUSH_EVERY = int(os.environ.get("USAGE_FLUSH_EVERY", "20"))
 
 def load_usage_database():
-    # ...przeniesiona funkcja z config.py...
+    """
+    Pełna baza użycia (wszystkie dni) razem z niezapisanymi przyrostami - tylko do odczytu.
+    Sidebar korzysta z get_usage_summary(), które czyta wyłącznie ostatnie dni.
+    """
+    db = _read_usage_database()
+    with _pending_lock:
+        _apply_pending(db, _pending)
+    db["total_stats"]["total_cost_usd"] = compute_costs(db["total_stats"])[1]
+    return db
+
+def _read_usage_database(recent_days=None):
     try:
-        if os.path.exists(DB_FILE):
-            with open(DB_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                # Automatyczna migracja - dodaj vocabulary jeśli brakuje
-                if "total_stats" in data and "vocabulary" not in data["total_stats"]:
-                    data["total_stats"]["vocabulary"] = {"prompt": 0, "completion": 0, "total": 0}
-                    data["last_updated"] = datetime.now().isoformat()
-                    save_usage_database(data)
-                required_keys = ["total_stats", "daily_stats", "session_history", "created_date", "last_updated"]
-                if all(key in data for key in required_keys):
-                    return data
-                else:
-                    return migrate_old_database(data)
-        else:
-            return create_new_database()
-    except Exception as e:
-        st.warning(f"Błąd podczas ładowania bazy danych: {e}. Tworzę nową bazę.")
-        return create_new_database()
+        _prepare_store()
+        return usage_store.load_database(create_new_database()["total_stats"], create_daily_stats, recent_days)
+    except (sqlite3.Error, OSError) as e:
+        st.warning(f"Błąd podczas ładowania bazy danych: {e}. Wyświetlam pustą bazę.")
+        db = create_new_database()
+        db["days_with_data"] = 0
+        return db
+
+_store_prepared = False
+
+def _load_legacy_json():
+    with open(DB_FILE, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if "total_stats" not in data:
+        data = migrate_old_database(data)
+    return data
+
+def _prepare_store():
+    """
+    Raz na proces: scala shardy procesów, które zginęły, i importuje dawny
+    usage_database.json (import wykona tylko pierwszy proces)
+    """
+    global _store_prepared
+    if _store_prepared:
+        return
+    _store_prepared = True
+    usage_store.compact_stale_shards()
+    if os.path.exists(DB_FILE):
+        usage_store.import_legacy_database(_load_legacy_json)
 
 def create_new_database():
     return {
@@ -40,11 +76,11 @@ def create_new_database():
             "vocabulary": {"prompt": 0, "completion": 0, "total": 0},
             "tts_chars_openai": 0,
             "tts_chars_gtts": 0,
+            "tts_chars_local": 0,
             "whisper_minutes": 0.0,
             "total_cost_usd": 0.0
         },
-        "daily_stats": {},
-        "session_history": []
+        "daily_stats": {}
     }
 
 def migrate_old_database(old_data):
@@ -63,77 +99,229 @@ def migrate_old_database(old_data):
         return old_data
     return new_db
 
-def save_usage_database(data):
-    try:
-        data["last_updated"] = datetime.now().isoformat()
-        with open(DB_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        return True
-    except Exception as e:
-        st.error(f"Błąd podczas zapisywania bazy danych: {e}")
-        return False
-
 def get_today_key():
     return datetime.now().strftime("%Y-%m-%d")
 
-def mark_new_session():
-    db = load_usage_database()
+def create_daily_stats():
+    return {
+        "translator": {"prompt": 0, "completion": 0, "total": 0},
+        "belfer": {"prompt": 0, "completion": 0, "total": 0},
+        "dialog": {"prompt": 0, "completion": 0, "total": 0},
+        "vocabulary": {"prompt": 0, "completion": 0, "total": 0},
+        "tts_chars_openai": 0,
+        "tts_chars_gtts": 0,
+        "tts_chars_local": 0,
+        "whisper_minutes": 0.0,
+        "cost_usd": 0.0,
+        "sessions_started": 0,
+        "first_activity": None,
+        "last_activity": None
+    }
+
+def _new_pending():
+    # Klucze przyrostów to ścieżki "moduł.pole" lub "pole"; rows - wiersze usage_log;
+    # latency - przyrosty histogramów {"moduł|model": {kubełek: liczba}}
+    return {"rows": [], "total": {}, "daily": {}, "activity": {}, "latency": {}, "latency_max": {}, "events": 0}
+
+_pending = _new_pending()
+# Rośnie przy każdej zmianie bufora - unieważnia get_usage_summary()
+_usage_version = 0
+_pending_lock = threading.Lock()
+_flush_lock = threading.Lock()
+_flusher_started = False
+
+def _add_path(stats, path, amount):
+    *parents, key = path.split(".")
+    for parent in parents:
+        stats = stats.setdefault(parent, {})
+    stats[key] = stats.get(key, 0) + amount
+
+def _apply_pending(db, pending):
+    for path, amount in pending["total"].items():
+        _add_path(db["total_stats"], path, amount)
+    for day, deltas in pending["daily"].items():
+        daily = db["daily_stats"].setdefault(day, create_daily_stats())
+        for path, amount in deltas.items():
+            _add_path(daily, path, amount)
+    for day, (first, last) in pending["activity"].items():
+        daily = db["daily_stats"].setdefault(day, create_daily_stats())
+        if daily.get("first_activity") is None:
+            daily["first_activity"] = first
+        daily["last_activity"] = last
+
+def _queue_usage(total=None, daily=None, activity=True, row=None):
+    """
+    Dodaje przyrosty do bufora w pamięci - bez dostępu do bazy na ścieżce zapytania
+
+    Args:
+        total (dict): Przyrosty total_stats, np. {"translator.prompt": 10}
+        daily (dict): Przyrosty dzisiejszych daily_stats
+        activity (bool): Czy aktualizować first/last_activity dnia
+        row (dict | None): Wiersz usage_log dla pojedynczego zapytania
+    """
+    global _usage_version
     today = get_today_key()
-    if today not in db["daily_stats"]:
-        db["daily_stats"][today] = {
-            "translator": {"prompt": 0, "completion": 0, "total": 0},
-            "belfer": {"prompt": 0, "completion": 0, "total": 0},
-            "dialog": {"prompt": 0, "completion": 0, "total": 0},
-            "vocabulary": {"prompt": 0, "completion": 0, "total": 0},
-            "tts_chars_openai": 0,
-            "tts_chars_gtts": 0,
-            "whisper_minutes": 0.0,
-            "cost_usd": 0.0,
-            "sessions_started": 0,
-            "first_activity": None,
-            "last_activity": None
-        }
-    db["daily_stats"][today]["sessions_started"] += 1
     current_time = datetime.now().isoformat()
-    if db["daily_stats"][today]["first_activity"] is None:
-        db["daily_stats"][today]["first_activity"] = current_time
-    db["daily_stats"][today]["last_activity"] = current_time
-    save_usage_database(db)
+    with _pending_lock:
+        if row is not None:
+            _pending["rows"].append(dict(row, ts=current_time, day=today))
+        for path, amount in (total or {}).items():
+            _pending["total"][path] = _pending["total"].get(path, 0) + amount
+        day_deltas = _pending["daily"].setdefault(today, {})
+        for path, amount in (daily or {}).items():
+            day_deltas[path] = day_deltas.get(path, 0) + amount
+        if activity:
+            first, _ = _pending["activity"].get(today, (current_time, None))
+            _pending["activity"][today] = (first, current_time)
+        _pending["events"] += 1
+        _usage_version += 1
+        flush_now = _pending["events"] >= USAGE_FLUSH_EVERY
+    _flush_if_needed(flush_now)
+
+def record_latency(module, model, latency_ms):
+    """
+    Dodaje czas wywołania do histogramu (moduł, model) - bezpieczne z wątków roboczych
+
+    Args:
+        module (str): Moduł lub rodzaj operacji (belfer, tts, asr, ...)
+        model (str | None): Model lub dostawca
+        latency_ms (float): Czas wywołania w ms
+    """
+    global _usage_version
+    key = f"{module}|{model or '-'}"
+    bucket = latency_bucket(latency_ms)
+    metrics.inc("requests", module, model or "-")
+    metrics.observe("request_latency_seconds", module, model or "-", value=latency_ms / 1000.0)
+    with _pending_lock:
+        buckets = _pending["latency"].setdefault(key, {})
+        buckets[bucket] = buckets.get(bucket, 0) + 1
+        _pending["latency_max"][key] = max(_pending["latency_max"].get(key, 0.0), latency_ms)
+        _pending["events"] += 1
+        _usage_version += 1
+        flush_now = _pending["events"] >= USAGE_FLUSH_EVERY
+    _flush_if_needed(flush_now)
+
+def _flush_if_needed(flush_now):
+    _start_flusher()
+    if flush_now:
+        try:
+            flush_usage()
+        except Exception:
+            # Przyrosty zostały w buforze - zapisze je wątek w tle
+            pass
+
+def flush_usage():
+    """Zapisuje zebrane wiersze i przyrosty agregatów w jednej transakcji"""
+    global _pending
+    with _flush_lock:
+        with _pending_lock:
+            pending, _pending = _pending, _new_pending()
+        if not pending["events"]:
+            return
+        try:
+            _prepare_store()
+            usage_store.write_batch(
+                pending["rows"], pending["total"], pending["daily"], pending["activity"],
+                pending["latency"], pending["latency_max"]
+            )
+        except (sqlite3.Error, OSError, ValueError):
+            # Zapis się nie udał - przyrosty wracają do bufora na kolejną próbę
+            _restore_pending(pending)
+            raise
+
+def _restore_pending(pending):
+    global _usage_version
+    with _pending_lock:
+        _usage_version += 1
+        _pending["rows"] = pending["rows"] + _pending["rows"]
+        for path, amount in pending["total"].items():
+            _pending["total"][path] = _pending["total"].get(path, 0) + amount
+        for day, deltas in pending["daily"].items():
+            day_deltas = _pending["daily"].setdefault(day, {})
+            for path, amount in deltas.items():
+                day_deltas[path] = day_deltas.get(path, 0) + amount
+        for day, (first, last) in pending["activity"].items():
+            newer = _pending["activity"].get(day)
+            _pending["activity"][day] = (first, newer[1] if newer else last)
+        _merge_latency(_pending, pending["latency"], pending["latency_max"])
+        _pending["events"] += pending["events"]
+
+def _merge_latency(target, latency, latency_max):
+    for key, buckets in latency.items():
+        target_buckets = target["latency"].setdefault(key, {})
+        for bucket, count in buckets.items():
+            target_buckets[bucket] = target_buckets.get(bucket, 0) + count
+    for key, value in latency_max.items():
+        target["latency_max"][key] = max(target["latency_max"].get(key, 0.0), value)
+
+def discard_pending_usage():
+    """Porzuca niezapisane przyrosty (np. przy czyszczeniu bazy)"""
+    global _pending, _usage_version
+    with _pending_lock:
+        _pending = _new_pending()
+        _usage_version += 1
+
+def clear_usage_database():
+    """Usuwa wszystkie dane użycia: bufor, magazyn SQLite i dawny plik JSON"""
+    discard_pending_usage()
+    usage_store.clear()
+    if os.path.exists(DB_FILE):
+        os.remove(DB_FILE)
+
+def _flush_loop():
+    while True:
+        time.sleep(USAGE_FLUSH_SECONDS)
+        try:
+            flush_usage()
+        except Exception:
+            # Wątek zapisu nie może zginąć - kolejna próba w następnym cyklu lub przy wyjściu
+            pass
+
+def _flush_at_exit():
+    try:
+        flush_usage()
+        # Shard procesu trafia do bazy głównej - liczba shardów nie rośnie z każdym restartem
+        if os.path.exists(usage_store.get_shard_path()):
+            usage_store.compact_shard(usage_store.get_shard_path())
+    except Exception:
+        pass
+
+def _start_flusher():
+    global _flusher_started
+    if not _flusher_started:
+        _flusher_started = True
+        threading.Thread(target=_flush_loop, daemon=True, name="usage-flush").start()
+
+atexit.register(_flush_at_exit)
+
+def mark_new_session():
+    _queue_usage(daily={"sessions_started": 1})
 
 def add_to_daily_stats(stats_type, amount):
-    db = load_usage_database()
-    today = get_today_key()
-    if today not in db["daily_stats"]:
-        db["daily_stats"][today] = {
-            "translator": {"prompt": 0, "completion": 0, "total": 0},
-            "belfer": {"prompt": 0, "completion": 0, "total": 0},
-            "dialog": {"prompt": 0, "completion": 0, "total": 0},
-            "vocabulary": {"prompt": 0, "completion": 0, "total": 0},
-            "tts_chars_openai": 0,
-            "tts_chars_gtts": 0,
-            "whisper_minutes": 0.0,
-            "cost_usd": 0.0,
-            "sessions_started": 0,
-            "first_activity": None,
-            "last_activity": None
-        }
-    if stats_type in ["translator", "belfer", "dialog", "vocabulary"] and isinstance(amount, dict):
-        daily_stats = db["daily_stats"][today][stats_type]
-        daily_stats["prompt"] += amount.get("prompt", 0)
-        daily_stats["completion"] += amount.get("completion", 0)
-        daily_stats["total"] += amount.get("total", 0)
-    elif stats_type in ["tts_chars_openai", "tts_chars_gtts", "whisper_minutes"]:
-        db["daily_stats"][today][stats_type] += amount
-    current_time = datetime.now().isoformat()
-    if db["daily_stats"][today]["first_activity"] is None:
-        db["daily_stats"][today]["first_activity"] = current_time
-    db["daily_stats"][today]["last_activity"] = current_time
-    save_usage_database(db)
+    if stats_type in TOKEN_MODULES and isinstance(amount, dict):
+        deltas = {f"{stats_type}.{field}": amount.get(field, 0) for field in ("prompt", "completion", "total")}
+    elif stats_type in ["tts_chars_openai", "tts_chars_gtts", "tts_chars_local", "whisper_minutes"]:
+        deltas = {stats_type: amount}
+    else:
+        deltas = {}
+    _queue_usage(daily=deltas)
+
+def session_state_available():
+    """
+    Sprawdza czy działamy w wątku skryptu Streamlit - w zadaniach wsadowych i w wątkach
+    roboczych (dyspozytor TTS, generator kart) session_state nie istnieje
+    """
+    try:
+        from streamlit import runtime
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        return runtime.exists() and get_script_run_ctx(suppress_warning=True) is not None
+    except Exception:
+        return False
 
 def init_token_tracking():
     if "total_tokens_used" not in st.session_state:
-        db = load_usage_database()
-        st.session_state.total_tokens_used = db["total_stats"].copy()
+        # Kopia - podsumowanie jest współdzielone między sesjami
+        st.session_state.total_tokens_used = copy.deepcopy(get_usage_summary()["stats"])
         required_modules = ["translator", "belfer", "dialog", "vocabulary"]
         for module in required_modules:
             if module not in st.session_state.total_tokens_used:
@@ -142,127 +330,85 @@ def init_token_tracking():
             st.session_state.total_tokens_used["tts_chars"] = st.session_state.total_tokens_used.get("tts_chars_openai", 0)
         mark_new_session()
 
-def add_token_usage(module_name, prompt_tokens, completion_tokens):
-    init_token_tracking()
-    if module_name not in st.session_state.total_tokens_used:
-        st.session_state.total_tokens_used[module_name] = {"prompt": 0, "completion": 0, "total": 0}
-    stats = st.session_state.total_tokens_used[module_name]
-    stats["prompt"] += prompt_tokens
-    stats["completion"] += completion_tokens
-    stats["total"] += (prompt_tokens + completion_tokens)
-    db = load_usage_database()
-    db_stats = db["total_stats"][module_name]
-    db_stats["prompt"] += prompt_tokens
-    db_stats["completion"] += completion_tokens
-    db_stats["total"] += (prompt_tokens + completion_tokens)
-    today = get_today_key()
-    if today not in db["daily_stats"]:
-        db["daily_stats"][today] = {
-            "translator": {"prompt": 0, "completion": 0, "total": 0},
-            "belfer": {"prompt": 0, "completion": 0, "total": 0},
-            "dialog": {"prompt": 0, "completion": 0, "total": 0},
-            "vocabulary": {"prompt": 0, "completion": 0, "total": 0},
-            "tts_chars_openai": 0,
-            "tts_chars_gtts": 0,
-            "whisper_minutes": 0.0,
-            "cost_usd": 0.0,
-            "sessions_started": 0,
-            "first_activity": None,
-            "last_activity": None
-        }
-    if module_name in ["translator", "belfer", "dialog", "vocabulary"]:
-        daily_stats = db["daily_stats"][today][module_name]
-        daily_stats["prompt"] += prompt_tokens
-        daily_stats["completion"] += completion_tokens
-        daily_stats["total"] += (prompt_tokens + completion_tokens)
-        current_time = datetime.now().isoformat()
-        if db["daily_stats"][today]["first_activity"] is None:
-            db["daily_stats"][today]["first_activity"] = current_time
-        db["daily_stats"][today]["last_activity"] = current_time
-    save_usage_database(db)
+def add_token_usage(module_name, prompt_tokens, completion_tokens, model=None, latency_ms=None):
+    metrics.inc("tokens", module_name, model or "-", "prompt", amount=prompt_tokens)
+    metrics.inc("tokens", module_name, model or "-", "completion", amount=completion_tokens)
+    # Liczniki sesji tylko w wątku skryptu - wątki robocze (np. generator kart) zapisują do bazy
+    if session_state_available():
+        init_token_tracking()
+        if module_name not in st.session_state.total_tokens_used:
+            st.session_state.total_tokens_used[module_name] = {"prompt": 0, "completion": 0, "total": 0}
+        stats = st.session_state.total_tokens_used[module_name]
+        stats["prompt"] += prompt_tokens
+        stats["completion"] += completion_tokens
+        stats["total"] += (prompt_tokens + completion_tokens)
+    deltas = {
+        f"{module_name}.prompt": prompt_tokens,
+        f"{module_name}.completion": completion_tokens,
+        f"{module_name}.total": prompt_tokens + completion_tokens,
+    }
+    is_known_module = module_name in TOKEN_MODULES
+    row = {
+        "module": module_name,
+        "model": model,
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "latency_ms": latency_ms,
+    }
+    _queue_usage(total=deltas, daily=deltas if is_known_module else None, activity=is_known_module, row=row)
 
 def add_tts_usage(text_length, provider="openai"):
-    init_token_tracking()
-    if "tts_chars" not in st.session_state.total_tokens_used:
-        st.session_state.total_tokens_used["tts_chars"] = 0
-    st.session_state.total_tokens_used["tts_chars"] += text_length
-    db = load_usage_database()
-    today = get_today_key()
-    if today not in db["daily_stats"]:
-        db["daily_stats"][today] = {
-            "translator": {"prompt": 0, "completion": 0, "total": 0},
-            "belfer": {"prompt": 0, "completion": 0, "total": 0},
-            "dialog": {"prompt": 0, "completion": 0, "total": 0},
-            "vocabulary": {"prompt": 0, "completion": 0, "total": 0},
-            "tts_chars_openai": 0,
-            "tts_chars_gtts": 0,
-            "whisper_minutes": 0.0,
-            "cost_usd": 0.0,
-            "sessions_started": 0,
-            "first_activity": None,
-            "last_activity": None
-        }
-    if provider.lower() == "gtts":
-        db["total_stats"]["tts_chars_gtts"] += text_length
-        db["daily_stats"][today]["tts_chars_gtts"] += text_length
+    metrics.inc("tts_chars", provider.lower(), amount=text_length)
+    if session_state_available():
+        init_token_tracking()
+        if "tts_chars" not in st.session_state.total_tokens_used:
+            st.session_state.total_tokens_used["tts_chars"] = 0
+        st.session_state.total_tokens_used["tts_chars"] += text_length
+    if provider.lower() in ("gtts", "local"):
+        # Darmowi dostawcy (gTTS, lokalny silnik) - osobne liczniki, bez kosztu
+        stats_key = f"tts_chars_{provider.lower()}"
     else:
-        db["total_stats"]["tts_chars_openai"] += text_length
-        db["daily_stats"][today]["tts_chars_openai"] += text_length
-    current_time = datetime.now().isoformat()
-    if db["daily_stats"][today]["first_activity"] is None:
-        db["daily_stats"][today]["first_activity"] = current_time
-    db["daily_stats"][today]["last_activity"] = current_time
-    save_usage_database(db)
+        stats_key = "tts_chars_openai"
+    row = {"module": "tts", "tts_chars": text_length, "tts_provider": provider.lower()}
+    _queue_usage(total={stats_key: text_length}, daily={stats_key: text_length}, row=row)
 
 def add_whisper_usage(duration_seconds):
-    init_token_tracking()
     minutes = duration_seconds / 60.0
-    st.session_state.total_tokens_used["whisper_minutes"] += minutes
-    db = load_usage_database()
-    today = get_today_key()
-    if today not in db["daily_stats"]:
-        db["daily_stats"][today] = {
-            "translator": {"prompt": 0, "completion": 0, "total": 0},
-            "belfer": {"prompt": 0, "completion": 0, "total": 0},
-            "dialog": {"prompt": 0, "completion": 0, "total": 0},
-            "vocabulary": {"prompt": 0, "completion": 0, "total": 0},
-            "tts_chars_openai": 0,
-            "tts_chars_gtts": 0,
-            "whisper_minutes": 0.0,
-            "cost_usd": 0.0,
-            "sessions_started": 0,
-            "first_activity": None,
-            "last_activity": None
-        }
-    db["total_stats"]["whisper_minutes"] += minutes
-    db["daily_stats"][today]["whisper_minutes"] += minutes
-    current_time = datetime.now().isoformat()
-    if db["daily_stats"][today]["first_activity"] is None:
-        db["daily_stats"][today]["first_activity"] = current_time
-    db["daily_stats"][today]["last_activity"] = current_time
-    save_usage_database(db)
-
-def calculate_costs(use_database=True):
-    if use_database:
-        db = load_usage_database()
-        stats = db["total_stats"]
-        if "tts_chars" not in stats:
-            stats["tts_chars"] = stats.get("tts_chars_openai", 0)
-    else:
+    # Whisper liczony także w wątkach roboczych (okna długich nagrań, potok głosowy)
+    if session_state_available():
         init_token_tracking()
         stats = st.session_state.total_tokens_used
+        stats["whisper_minutes"] = stats.get("whisper_minutes", 0) + minutes
+    row = {"module": "whisper", "model": "whisper-1", "whisper_seconds": duration_seconds}
+    _queue_usage(total={"whisper_minutes": minutes}, daily={"whisper_minutes": minutes}, row=row)
+
+def add_audio_preprocess_savings(bytes_saved, seconds_saved):
+    """Zapisuje oszczędności z przycinania/kompresji nagrań przed wysyłką do Whisper"""
+    if bytes_saved <= 0 and seconds_saved <= 0:
+        return
+    deltas = {
+        "whisper_bytes_saved": max(0, bytes_saved),
+        "whisper_seconds_saved": max(0.0, seconds_saved),
+    }
+    _queue_usage(total=deltas, daily=deltas, activity=False)
+
+def compute_costs(stats):
+    """
+    Liczy koszty z liczników total_stats - czysta funkcja, niczego nie zapisuje ani nie modyfikuje
+
+    Returns:
+        tuple[dict, float]: Koszty per moduł/usługa i koszt łączny w USD
+    """
     gpt4o_mini_input = 0.15
     gpt4o_mini_output = 0.60
     tts_price = 15.0
     whisper_price = 0.006
     total_cost = 0
     costs = {}
-    for module in ["translator", "belfer", "dialog", "vocabulary"]:
-        if module not in stats:
-            stats[module] = {"prompt": 0, "completion": 0, "total": 0}
-        module_stats = stats[module]
-        input_cost = (module_stats["prompt"] / 1_000_000) * gpt4o_mini_input
-        output_cost = (module_stats["completion"] / 1_000_000) * gpt4o_mini_output
+    for module in TOKEN_MODULES:
+        module_stats = stats.get(module, {})
+        input_cost = (module_stats.get("prompt", 0) / 1_000_000) * gpt4o_mini_input
+        output_cost = (module_stats.get("completion", 0) / 1_000_000) * gpt4o_mini_output
         module_cost = input_cost + output_cost
         costs[module] = module_cost
         total_cost += module_cost
@@ -271,11 +417,94 @@ def calculate_costs(use_database=True):
     costs["tts_openai"] = tts_cost
     total_cost += tts_cost
     costs["tts_gtts"] = 0.0
-    whisper_cost = stats["whisper_minutes"] * whisper_price
+    whisper_cost = stats.get("whisper_minutes", 0.0) * whisper_price
     costs["whisper"] = whisper_cost
     total_cost += whisper_cost
-    if use_database:
-        db = load_usage_database()
-        db["total_stats"]["total_cost_usd"] = total_cost
-        save_usage_database(db)
     return costs, total_cost
+
+def calculate_costs(use_database=True):
+    if use_database:
+        summary = get_usage_summary()
+        return summary["costs"], summary["total_cost"]
+    init_token_tracking()
+    return compute_costs(st.session_state.total_tokens_used)
+
+def _module_tokens(stats):
+    return sum(stats.get(module, {}).get("total", 0) for module in TOKEN_MODULES)
+
+def build_usage_summary(db, today=None):
+    """
+    Gotowe do wyświetlenia podsumowanie bazy: sumy, koszty, dzisiejsze statystyki i historia 7 dni
+
+    Returns:
+        dict: Podsumowanie (tylko do odczytu - współdzielone między sesjami)
+    """
+    today = today or get_today_key()
+    stats = db["total_stats"]
+    daily_stats = db["daily_stats"]
+    days_with_data = db.get("days_with_data", len(daily_stats))
+    costs, total_cost = compute_costs(stats)
+    history = []
+    if days_with_data > 1:
+        # Ostatnie dni z danymi, od najnowszego
+        for day in sorted(daily_stats.keys(), reverse=True)[:usage_store.RECENT_DAYS]:
+            day_tokens = _module_tokens(daily_stats[day])
+            if day_tokens > 0:
+                history.append((day, day_tokens))
+    today_stats = daily_stats.get(today, {})
+    latency = {
+        key: summarize_histogram(entry["buckets"], entry["max"])
+        for key, entry in sorted(db.get("latency", {}).items())
+    }
+    return {
+        "stats": stats,
+        "costs": costs,
+        "total_cost": total_cost,
+        "total_tokens": _module_tokens(stats),
+        "today": today,
+        "today_stats": today_stats,
+        "today_tokens": _module_tokens(today_stats),
+        "history": history,
+        "created_date": db["created_date"],
+        "last_updated": db["last_updated"],
+        "days_with_data": days_with_data,
+        "latency": latency,
+    }
+
+_summary_cache = {"key": None, "summary": None}
+
+def _store_revision():
+    try:
+        return usage_store.get_revision()
+    except sqlite3.Error:
+        return None
+
+def get_usage_summary():
+    """
+    Podsumowanie użycia z pamięci podręcznej - przeliczane tylko, gdy dane się zmieniły
+    (nowe przyrosty w buforze, zapis do bazy - także z innego procesu - lub nowy dzień).
+    Czyta sumy i ostatnie dni po kluczu, więc koszt nie rośnie z długością historii.
+    """
+    # Klucz liczony przed odczytem: zmiana w trakcie odczytu wymusi przeliczenie przy kolejnym wywołaniu
+    key = (_usage_version, _store_revision(), get_today_key())
+    if _summary_cache["key"] == key:
+        return _summary_cache["summary"]
+    db = _read_usage_database(recent_days=usage_store.RECENT_DAYS)
+    try:
+        stored_latency = usage_store.load_latency()
+    except sqlite3.Error:
+        stored_latency = {}
+    latency = {"latency": {key: entry["buckets"] for key, entry in stored_latency.items()},
+               "latency_max": {key: entry["max"] for key, entry in stored_latency.items()}}
+    with _pending_lock:
+        new_days = [day for day in _pending["daily"] if day not in db["daily_stats"]]
+        _apply_pending(db, _pending)
+        _merge_latency(latency, _pending["latency"], _pending["latency_max"])
+    db["latency"] = {
+        key: {"buckets": buckets, "max": latency["latency_max"].get(key, 0.0)}
+        for key, buckets in latency["latency"].items()
+    }
+    db["days_with_data"] += len(new_days)
+    summary = build_usage_summary(db, key[2])
+    _summary_cache["key"], _summary_cache["summary"] = key, summary
+    return summary
@@ -0,0 +1,236 @@
+"""
+Backendy rozpoznawania mowy (ASR) - OpenAI Whisper lub lokalny silnik na CPU
+
+Backend wybiera się per wdrożenie zmienną ASR_BACKEND:
+- "openai" (domyślnie) - whisper-1 przez API, płatne za minutę
+- "local"  - faster-whisper z modelem z katalogu ASR_MODEL_DIR, bez sieci
+- "auto"   - krótkie nagrania (do ASR_LOCAL_MAX_SECONDS) lokalnie, dłuższe przez API
+"""
+
+import io
+import os
+import threading
+from abc import ABC, abstractmethod
+
+from utils.latency import track_latency
+from utils.lazy_imports import is_installed, optional_import
+
+ASR_BACKEND = os.environ.get("ASR_BACKEND", "openai").lower()
+ASR_MODEL_DIR = os.environ.get("ASR_MODEL_DIR", os.path.join("base", "asr_model"))
+ASR_LOCAL_MAX_SECONDS = float(os.environ.get("ASR_LOCAL_MAX_SECONDS", "15"))
+ASR_CPU_THREADS = int(os.environ.get("ASR_CPU_THREADS", "0"))  # 0 = wszystkie rdzenie
+
+# faster-whisper (CTranslate2) importowany dopiero przy ładowaniu modelu
+FASTER_WHISPER_AVAILABLE = is_installed("faster_whisper")
+
+
+class ASRBackend(ABC):
+    """
+    Bazowa klasa backendu ASR - backend implementuje transcribe() i translate()
+    """
+
+    name = "base"
+    billable = False
+
+    @abstractmethod
+    def transcribe(self, upload, language_code="en"):
+        """
+        Transkrybuje nagranie
+
+        Args:
+            upload (tuple): (nazwa pliku, bajty audio, typ MIME)
+            language_code (str): Kod języka (en, pl, de, etc.)
+
+        Returns:
+            str: Rozpoznany tekst
+        """
+
+    @abstractmethod
+    def translate(self, upload):
+        """
+        Rozpoznaje mowę w dowolnym języku i zwraca od razu tekst po angielsku
+
+        Args:
+            upload (tuple): (nazwa pliku, bajty audio, typ MIME)
+
+        Returns:
+            str: Tekst po angielsku
+        """
+
+    def run(self, upload, language_code="en", task="transcribe"):
+        """Wykonuje zadanie "transcribe" lub "translate" (na angielski)"""
+        if task == "translate":
+            return self.translate(upload)
+        return self.transcribe(upload, language_code)
+
+
+class OpenAIWhisperBackend(ASRBackend):
+    """
+    Backend OpenAI whisper-1 (dotychczasowe zachowanie aplikacji)
+    """
+
+    name = "openai"
+    billable = True
+
+    def transcribe(self, upload, language_code="en"):
+        from utils.config import client
+        with track_latency("asr", "whisper-1"):
+            transcription = client.audio.transcriptions.create(
+                model="whisper-1",
+                file=upload,
+                language=language_code
+            )
+        return transcription.text
+
+    def translate(self, upload):
+        from utils.config import client
+        with track_latency("asr", "whisper-1"):
+            translation = client.audio.translations.create(
+                model="whisper-1",
+                file=upload
+            )
+        return translation.text
+
+
+class LocalWhisperBackend(ASRBackend):
+    """
+    Lokalny backend faster-whisper (CTranslate2, int8 na CPU) z modelem z dysku
+    """
+
+    name = "local"
+    billable = False
+
+    _model = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def is_available(cls):
+        return FASTER_WHISPER_AVAILABLE and os.path.isdir(ASR_MODEL_DIR)
+
+    @classmethod
+    def _get_model(cls):
+        # Model ładujemy raz na proces - to trwa sekundy, sama transkrypcja krótkiej frazy ułamek sekundy
+        with cls._lock:
+            if cls._model is None:
+                faster_whisper = optional_import("faster_whisper")
+                if faster_whisper is None:
+                    raise RuntimeError("Nie udało się zaimportować faster-whisper")
+                cls._model = faster_whisper.WhisperModel(
+                    ASR_MODEL_DIR,
+                    device="cpu",
+                    compute_type="int8",
+                    cpu_threads=ASR_CPU_THREADS,
+                )
+            return cls._model
+
+    def _run_model(self, upload, **options):
+        _, audio_bytes, _ = upload
+        model = self._get_model()
+        # Segmenty są generowane leniwie - pomiar obejmuje ich odczyt
+        with track_latency("asr", "faster-whisper"):
+            segments, _ = model.transcribe(
+                io.BytesIO(audio_bytes),
+                beam_size=1,
+                vad_filter=False,
+                **options
+            )
+            return " ".join(segment.text.strip() for segment in segments).strip()
+
+    def transcribe(self, upload, language_code="en"):
+        return self._run_model(upload, language=language_code)
+
+    def translate(self, upload):
+        # Model wielojęzyczny - język wykrywa sam, task="translate" daje tekst angielski
+        return self._run_model(upload, task="translate")
+
+
+_openai_backend = OpenAIWhisperBackend()
+_local_backend = LocalWhisperBackend()
+
+def get_asr_backend(duration_seconds=None):
+    """
+    Zwraca backend ASR dla tego wdrożenia (i długości nagrania w trybie "auto")
+
+    Args:
+        duration_seconds (float | None): Długość nagrania w sekundach
+
+    Returns:
+        ASRBackend: Backend do użycia
+    """
+    if ASR_BACKEND == "local" and LocalWhisperBackend.is_available():
+        return _local_backend
+    if ASR_BACKEND == "auto" and LocalWhisperBackend.is_available():
+        if duration_seconds is not None and duration_seconds <= ASR_LOCAL_MAX_SECONDS:
+            return _local_backend
+    return _openai_backend
+
+def transcribe_upload(audio_bytes, language_code="en", task="transcribe"):
+    """
+    Przygotowuje nagranie i transkrybuje je backendem wdrożenia - bez zapisu statystyk,
+    więc można to wołać z wątków roboczych (statystyki zapisuje record_transcription_usage)
+
+    Args:
+        audio_bytes (bytes): Nagranie WAV
+        language_code (str): Kod języka (en, pl, de, etc.)
+        task (str): "transcribe" albo "translate" (od razu tekst po angielsku)
+
+    Returns:
+        tuple[str, ASRBackend, dict]: tekst, użyty backend, statystyki preprocess_for_whisper
+    """
+    from utils.audio_preprocess import preprocess_for_whisper, get_wav_duration
+    from utils.long_audio import needs_long_audio_mode, transcribe_long_audio
+
+    if needs_long_audio_mode(audio_bytes):
+        # Długie nagranie: okna transkrybowane równolegle zamiast jednego długiego zapytania
+        backend = get_asr_backend(get_wav_duration(audio_bytes))
+        result = transcribe_long_audio(audio_bytes, language_code, backend, task)
+        if result is not None:
+            text, info = result
+            return text, backend, info
+
+    # Mono 16 kHz, bez ciszy na brzegach, skompresowane - mniej do wysłania i do zapłaty
+    upload_bytes, filename, mime, info = preprocess_for_whisper(audio_bytes)
+    backend = get_asr_backend(info["processed_seconds"])
+    text = backend.run((filename, upload_bytes, mime), language_code, task)
+    return text, backend, info
+
+def record_transcription_usage(backend, info):
+    """Zapisuje minuty Whisper i oszczędności z przygotowania nagrania (tylko płatny backend)"""
+    from utils.ai_stats import add_whisper_usage, add_audio_preprocess_savings
+
+    if backend.billable:
+        add_whisper_usage(info["processed_seconds"])
+        add_audio_preprocess_savings(
+            info["original_bytes"] - info["processed_bytes"],
+            info["original_seconds"] - info["processed_seconds"]
+        )
+
+def transcribe_recording(audio_bytes, language_code="en"):
+    """
+    Pełna ścieżka transkrypcji nagrania WAV: przygotowanie audio, wybór backendu, rozliczenie
+
+    Args:
+        audio_bytes (bytes): Nagranie WAV
+        language_code (str): Kod języka (en, pl, de, etc.)
+
+    Returns:
+        str: Rozpoznany tekst
+    """
+    text, backend, info = transcribe_upload(audio_bytes, language_code)
+    record_transcription_usage(backend, info)
+    return text
+
+def translate_recording_to_english(audio_bytes):
+    """
+    Rozpoznaje nagranie w dowolnym języku i zwraca tekst po angielsku jednym zapytaniem
+    (zamiast transkrypcji i osobnego tłumaczenia modelem czatu)
+
+    Args:
+        audio_bytes (bytes): Nagranie WAV
+
+    Returns:
+        str: Tekst po angielsku
+    """
+    text, backend, info = transcribe_upload(audio_bytes, task="translate")
+    record_transcription_usage(backend, info)
+    return text
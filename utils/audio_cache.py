@@ -0,0 +1,75 @@
+"""Dyskowy cache audio TTS - każdy tekst syntezowany tylko raz na dostawcę i język"""
+
+import hashlib
+import os
+import tempfile
+
+from utils import metrics
+
+AUDIO_CACHE_DIR = os.path.join("base", "audio_cache")
+
+def get_audio_cache_key(text, language, provider):
+    """Zwraca klucz cache (sha256) dla tekstu, języka i dostawcy TTS"""
+    raw = f"{provider}|{language}|{text.strip()}".encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()
+
+def get_audio_cache_path(text, language, provider, ext="mp3"):
+    """Ścieżka pliku w cache (podkatalogi po 2 znakach, aby katalog nie puchł)"""
+    key = get_audio_cache_key(text, language, provider)
+    return os.path.join(AUDIO_CACHE_DIR, provider, key[:2], f"{key}.{ext}")
+
+def is_audio_cached(text, language, provider, ext="mp3"):
+    """Sprawdza czy audio dla tekstu jest już w cache"""
+    return os.path.exists(get_audio_cache_path(text, language, provider, ext))
+
+def read_cached_audio(text, language, provider, ext="mp3"):
+    """Wczytuje plik z cache bez liczenia trafień (kolejne pliki tego samego zapytania)"""
+    path = get_audio_cache_path(text, language, provider, ext)
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+def load_cached_audio(text, language, provider, ext="mp3"):
+    """
+    Wczytuje audio z cache
+
+    Returns:
+        bytes | None: Audio MP3 lub None jeśli brak w cache
+    """
+    return find_cached_audio(text, language, [provider], ext)
+
+def find_cached_audio(text, language, providers, ext="mp3"):
+    """
+    Audio z cache pierwszego dostawcy, który je ma - jedno trafienie lub jedno
+    chybienie na zapytanie, niezależnie od liczby sprawdzonych dostawców
+
+    Returns:
+        bytes | None: Audio lub None jeśli żaden dostawca nie ma go w cache
+    """
+    for provider in providers:
+        audio_bytes = read_cached_audio(text, language, provider, ext)
+        if audio_bytes is not None:
+            metrics.inc("cache_hits", "audio")
+            return audio_bytes
+    metrics.inc("cache_misses", "audio")
+    return None
+
+def save_cached_audio(text, language, provider, audio_bytes, ext="mp3"):
+    """
+    Zapisuje audio do cache atomowo (plik tymczasowy + os.replace),
+    więc przerwany zapis nigdy nie zostawia uszkodzonego pliku
+    """
+    if not audio_bytes:
+        return False
+    path = get_audio_cache_path(text, language, provider, ext)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(suffix=".part", dir=os.path.dirname(path))
+        with os.fdopen(fd, "wb") as f:
+            f.write(audio_bytes)
+        os.replace(tmp_path, path)
+        return True
+    except OSError:
+        return False
@@ -0,0 +1,167 @@
+"""
+Wsadowe generowanie audio dla całej talii słówek (bez UI Streamlit)
+
+Przechodzi po db["words"][lang_pair], zbiera słówka, tłumaczenia i przykłady,
+pomija teksty już obecne w cache audio i syntezuje resztę z ograniczoną
+współbieżnością na dostawcę. Ponowne uruchomienie po przerwaniu kontynuuje
+pracę - gotowe pliki są już w cache i zostaną pominięte.
+
+Użycie:
+    python -m utils.audio_pregen angielski_polski --provider gtts
+    python -m utils.audio_pregen --all --provider openai --workers 2
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from utils.audio_cache import is_audio_cached, save_cached_audio
+from utils.ai_stats import add_tts_usage, calculate_costs
+
+# Maksymalna liczba równoległych zapytań na dostawcę (limity API / uprzejmość wobec Google)
+PROVIDER_CONCURRENCY = {
+    "openai": 4,
+    "gtts": 2,
+    "local": 2,
+}
+
+def collect_deck_texts(db, lang_pair):
+    """
+    Zbiera unikalne pary (tekst, język) do syntezy dla danej pary językowej
+
+    Returns:
+        list[tuple[str, str]]: Lista (tekst, język) w kolejności występowania
+    """
+    lang_in, lang_out = lang_pair.split("_")
+    seen = set()
+    items = []
+
+    def add(text, language):
+        if not text or not isinstance(text, str):
+            return
+        text = text.strip()
+        if text and (text, language) not in seen:
+            seen.add((text, language))
+            items.append((text, language))
+
+    for word in db["words"].get(lang_pair, []):
+        add(word.get("original"), lang_in)
+        add(word.get("translation"), lang_out)
+        for example in word.get("examples", []):
+            add(example.get("original"), lang_in)
+            add(example.get("translated"), lang_out)
+    return items
+
+def get_synthesizer(provider):
+    """Zwraca funkcję syntezy (bez zliczania użycia) dla dostawcy"""
+    from utils.config import synthesize_openai, synthesize_gtts, synthesize_local
+    return {"gtts": synthesize_gtts, "local": synthesize_local}.get(provider, synthesize_openai)
+
+def _synthesize_and_cache(synthesize, text, language, provider):
+    audio_bytes = synthesize(text, language)
+    save_cached_audio(text, language, provider, audio_bytes)
+    return len(text)
+
+def pregenerate_deck_audio(db, lang_pair, provider="gtts", max_workers=None, progress=print):
+    """
+    Generuje brakujące audio dla talii słówek
+
+    Args:
+        db (dict): Baza słówek (format vocabulary_database.json)
+        lang_pair (str): Klucz pary językowej, np. "angielski_polski"
+        provider (str): "gtts", "local" lub "openai"
+        max_workers (int | None): Limit współbieżności (domyślnie PROVIDER_CONCURRENCY)
+        progress (callable): Funkcja raportująca postęp
+
+    Returns:
+        dict: Podsumowanie (liczby tekstów, znaki, czas, znaki/s, błędy)
+    """
+    items = collect_deck_texts(db, lang_pair)
+    pending = [(text, lang) for text, lang in items if not is_audio_cached(text, lang, provider)]
+    workers = max(1, max_workers or PROVIDER_CONCURRENCY.get(provider, 1))
+    synthesize = get_synthesizer(provider)
+
+    summary = {
+        "lang_pair": lang_pair,
+        "provider": provider,
+        "total": len(items),
+        "already_cached": len(items) - len(pending),
+        "generated": 0,
+        "failed": 0,
+        "chars": 0,
+        "seconds": 0.0,
+        "chars_per_second": 0.0,
+        "interrupted": False,
+    }
+    progress(f"[{lang_pair}] {len(items)} tekstów, w cache: {summary['already_cached']}, "
+             f"do wygenerowania: {len(pending)} (wątki: {workers}, dostawca: {provider})")
+    if not pending:
+        return summary
+
+    start = time.perf_counter()
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        futures = {
+            executor.submit(_synthesize_and_cache, synthesize, text, lang, provider): (text, lang)
+            for text, lang in pending
+        }
+        for future in as_completed(futures):
+            text, lang = futures[future]
+            try:
+                chars = future.result()
+            except Exception as e:
+                summary["failed"] += 1
+                progress(f"  ❌ {lang}: '{text[:40]}' - {e}")
+                continue
+            # Zliczanie kosztów w wątku głównym - baza użycia nie jest współdzielona między wątkami
+            add_tts_usage(chars, provider)
+            summary["generated"] += 1
+            summary["chars"] += chars
+            done = summary["generated"] + summary["failed"]
+            if done % 25 == 0 or done == len(pending):
+                elapsed = time.perf_counter() - start
+                progress(f"  {done}/{len(pending)} • {summary['chars'] / max(elapsed, 1e-9):.0f} zn./s")
+    except KeyboardInterrupt:
+        summary["interrupted"] = True
+        progress("⏸️ Przerwano - gotowe pliki są w cache, ponowne uruchomienie wznowi pracę.")
+    finally:
+        executor.shutdown(wait=not summary["interrupted"], cancel_futures=True)
+
+    summary["seconds"] = time.perf_counter() - start
+    summary["chars_per_second"] = summary["chars"] / summary["seconds"] if summary["seconds"] > 0 else 0.0
+    return summary
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Wsadowe generowanie audio TTS dla talii słówek")
+    parser.add_argument("lang_pairs", nargs="*", help="Pary językowe, np. angielski_polski")
+    parser.add_argument("--all", action="store_true", help="Wszystkie niepuste pary językowe")
+    parser.add_argument("--provider", choices=sorted(PROVIDER_CONCURRENCY), default="gtts")
+    parser.add_argument("--workers", type=int, default=None, help="Limit równoległych zapytań")
+    args = parser.parse_args(argv)
+
+    from modules.vocabulary import load_vocabulary_database
+    db = load_vocabulary_database()
+
+    lang_pairs = args.lang_pairs
+    if args.all:
+        lang_pairs = [pair for pair, words in db["words"].items() if words]
+    if not lang_pairs:
+        parser.error("Podaj parę językową lub użyj --all")
+
+    for lang_pair in lang_pairs:
+        if lang_pair not in db["words"]:
+            print(f"❌ Nieznana para językowa: {lang_pair}")
+            continue
+        summary = pregenerate_deck_audio(db, lang_pair, args.provider, args.workers)
+        print(f"✅ [{lang_pair}] wygenerowano {summary['generated']}, błędy {summary['failed']}, "
+              f"{summary['chars']:,} zn. w {summary['seconds']:.1f}s "
+              f"({summary['chars_per_second']:.0f} zn./s)")
+        if summary["interrupted"]:
+            return 1
+
+    costs, total_cost = calculate_costs(use_database=True)
+    print(f"💰 TTS OpenAI łącznie: ${costs['tts_openai']:.4f} • koszt całkowity: ${total_cost:.4f}")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
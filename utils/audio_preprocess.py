@@ -0,0 +1,160 @@
+"""
+Przygotowanie nagrań przed wysłaniem do Whisper
+
+Whisper nalicza opłatę za minutę, a czas wysyłki rośnie z rozmiarem pliku.
+Przed uploadem nagranie jest: miksowane do mono, przepróbkowane do 16 kHz,
+przycinane z ciszy na początku i końcu (detekcja energii) i opcjonalnie
+kompresowane do FLAC/Opus. Bez numpy nagranie idzie bez zmian.
+"""
+
+import io
+import os
+import wave
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from utils.lazy_imports import optional_import
+
+# soundfile i scipy.signal są importowane przy pierwszym nagraniu (utils.lazy_imports) -
+# brak soundfile/libsndfile oznacza wysyłkę WAV, brak scipy - interpolację liniową
+
+TARGET_SAMPLE_RATE = 16000
+# Format wysyłki do Whisper: "flac" (bezstratny), "opus" (najmniejszy) lub "wav"
+WHISPER_UPLOAD_FORMAT = os.environ.get("WHISPER_UPLOAD_FORMAT", "flac").lower()
+VAD_FRAME_MS = 30           # długość ramki analizy energii
+VAD_THRESHOLD_DB = -40.0    # ramki cichsze niż szczyt - 40 dB to cisza
+VAD_PADDING_MS = 200        # margines zostawiany przed i po mowie
+
+def get_wav_duration(audio_bytes):
+    """
+    Czas trwania nagrania na podstawie nagłówka WAV
+
+    Returns:
+        float: Czas w sekundach (przybliżenie 16kHz/16-bit mono, gdy nagłówek nieczytelny)
+    """
+    try:
+        with wave.open(io.BytesIO(audio_bytes)) as wav:
+            frame_rate = wav.getframerate()
+            # Nagłówki strumieniowe mają nframes=0 lub 0xFFFFFFFF - ograniczamy do faktycznych danych
+            data_frames = (len(audio_bytes) - 44) // (wav.getsampwidth() * wav.getnchannels())
+            frames = min(wav.getnframes(), data_frames) if wav.getnframes() else data_frames
+            return frames / float(frame_rate)
+    except (wave.Error, EOFError, ZeroDivisionError):
+        return len(audio_bytes) / (16000 * 2)
+
+def _decode_wav(audio_bytes):
+    """Dekoduje PCM WAV do tablicy float32 (próbki, kanały) w zakresie [-1, 1]"""
+    with wave.open(io.BytesIO(audio_bytes)) as wav:
+        rate, channels, width = wav.getframerate(), wav.getnchannels(), wav.getsampwidth()
+        frames = wav.readframes(wav.getnframes())
+    usable = len(frames) - len(frames) % (width * channels)
+    if width == 1:
+        samples = (np.frombuffer(frames[:usable], dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif width == 2:
+        samples = np.frombuffer(frames[:usable], dtype="<i2").astype(np.float32) / 32768.0
+    elif width == 4:
+        samples = np.frombuffer(frames[:usable], dtype="<i4").astype(np.float32) / 2147483648.0
+    else:
+        raise wave.Error(f"Nieobsługiwana szerokość próbki: {width} B")
+    return samples.reshape(-1, channels), rate
+
+def _resample(mono, rate):
+    if rate == TARGET_SAMPLE_RATE or len(mono) == 0:
+        return mono
+    signal = optional_import("scipy.signal")
+    if signal is not None:
+        divisor = np.gcd(int(rate), TARGET_SAMPLE_RATE)
+        return signal.resample_poly(mono, TARGET_SAMPLE_RATE // divisor, int(rate) // divisor).astype(np.float32)
+    target_length = int(round(len(mono) * TARGET_SAMPLE_RATE / float(rate)))
+    positions = np.linspace(0, len(mono) - 1, target_length)
+    return np.interp(positions, np.arange(len(mono)), mono).astype(np.float32)
+
+def trim_silence(mono, rate=TARGET_SAMPLE_RATE):
+    """Przycina ciszę na początku i końcu na podstawie energii ramek (prosty VAD)"""
+    frame = max(1, rate * VAD_FRAME_MS // 1000)
+    frame_count = len(mono) // frame
+    if frame_count == 0:
+        return mono
+    energies = np.sqrt(np.mean(mono[:frame_count * frame].reshape(frame_count, frame) ** 2, axis=1))
+    peak = float(energies.max())
+    if peak <= 0:
+        return mono
+    voiced = np.nonzero(20 * np.log10(np.maximum(energies, 1e-10) / peak) > VAD_THRESHOLD_DB)[0]
+    if len(voiced) == 0:
+        return mono
+    padding = rate * VAD_PADDING_MS // 1000
+    start = max(0, voiced[0] * frame - padding)
+    end = min(len(mono), (voiced[-1] + 1) * frame + padding)
+    return mono[start:end]
+
+def encode_for_upload(mono, upload_format=None):
+    """Koduje mono 16 kHz do formatu wysyłki (FLAC/Opus przez soundfile, inaczej WAV 16-bit)"""
+    upload_format = upload_format or WHISPER_UPLOAD_FORMAT
+    buffer = io.BytesIO()
+    sf = optional_import("soundfile") if upload_format in ("flac", "opus") else None
+    if upload_format == "flac" and sf is not None:
+        sf.write(buffer, mono, TARGET_SAMPLE_RATE, format="FLAC")
+        return buffer.getvalue(), "recording.flac", "audio/flac"
+    if upload_format == "opus" and sf is not None:
+        sf.write(buffer, mono, TARGET_SAMPLE_RATE, format="OGG", subtype="OPUS")
+        return buffer.getvalue(), "recording.ogg", "audio/ogg"
+    pcm = (np.clip(mono, -1.0, 1.0) * 32767.0).astype("<i2")
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(TARGET_SAMPLE_RATE)
+        wav.writeframes(pcm.tobytes())
+    return buffer.getvalue(), "recording.wav", "audio/wav"
+
+def load_speech_mono(audio_bytes):
+    """
+    Dekoduje WAV do mono float32 16 kHz bez ciszy na brzegach
+
+    Returns:
+        numpy.ndarray | None: Próbki lub None, gdy brak numpy albo nagranie nie jest PCM WAV
+    """
+    if not NUMPY_AVAILABLE:
+        return None
+    try:
+        samples, rate = _decode_wav(audio_bytes)
+    except (wave.Error, EOFError):
+        return None
+    mono = samples.mean(axis=1) if samples.shape[1] > 1 else samples[:, 0]
+    return trim_silence(_resample(mono, rate))
+
+def preprocess_for_whisper(audio_bytes, upload_format=None):
+    """
+    Przygotowuje nagranie WAV do wysłania do Whisper
+
+    Args:
+        audio_bytes (bytes): Oryginalne nagranie WAV
+        upload_format (str | None): "flac", "opus" lub "wav" (domyślnie WHISPER_UPLOAD_FORMAT)
+
+    Returns:
+        tuple[bytes, str, str, dict]: dane do wysyłki, nazwa pliku, typ MIME oraz
+        statystyki (original_bytes, processed_bytes, original_seconds, processed_seconds)
+    """
+    original_seconds = get_wav_duration(audio_bytes)
+    info = {
+        "original_bytes": len(audio_bytes),
+        "processed_bytes": len(audio_bytes),
+        "original_seconds": original_seconds,
+        "processed_seconds": original_seconds,
+    }
+    mono = load_speech_mono(audio_bytes)
+    if mono is None:
+        # Brak numpy albo nie-PCM (np. inny kontener) - wysyłamy bez zmian
+        return audio_bytes, "recording.wav", "audio/wav", info
+
+    processed, filename, mime = encode_for_upload(mono, upload_format)
+
+    # Nie pogarszaj: jeśli nic nie zyskaliśmy, wyślij oryginał
+    if len(processed) >= len(audio_bytes) and len(mono) / float(TARGET_SAMPLE_RATE) >= original_seconds:
+        return audio_bytes, "recording.wav", "audio/wav", info
+    info["processed_bytes"] = len(processed)
+    info["processed_seconds"] = len(mono) / float(TARGET_SAMPLE_RATE)
+    return processed, filename, mime, info
@@ -0,0 +1,236 @@
+"""
+Audio "sprite" karty słówka - jedna synteza na język zamiast osobnej na każdą frazę
+
+Słówko, tłumaczenie i przykłady jednej karty są łączone znacznikiem pauzy
+i syntezowane jednym zapytaniem na język. Zapamiętujemy przedziały czasowe
+segmentów, a przyciski 🔊 odtwarzają tylko fragment wspólnego nagrania.
+"""
+
+import array
+import io
+import json
+import wave
+from collections import OrderedDict
+
+import streamlit as st
+
+from utils.audio_cache import load_cached_audio, read_cached_audio, save_cached_audio
+from utils.audio_preprocess import NUMPY_AVAILABLE
+from utils.ai_stats import add_tts_usage
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+# Znacznik pauzy między frazami - obaj dostawcy robią na nim wyraźną przerwę
+PAUSE_MARKER = "\n...\n"
+SPRITE_WINDOW_MS = 10         # okno analizy głośności WAV
+SPRITE_MIN_GAP_MS = 200       # minimalna cisza uznawana za granicę segmentu
+SPRITE_SILENCE_RATIO = 0.06   # próg ciszy względem najgłośniejszego okna
+SPRITE_SESSION_CACHE_SIZE = 8 # sprite'y ostatnich kart trzymane w sesji
+SPRITE_ESTIMATE_MARGIN = 0.35 # s - zapas wokół szacowanych (nie mierzonych) granic fraz
+
+# Tabele bitrate MPEG Layer III (kbps) - MPEG1 oraz MPEG2/2.5
+_MP3_BITRATES = {
+    1: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    2: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+
+def build_card_phrases(word, lang_in, lang_out):
+    """
+    Zbiera frazy karty pogrupowane według języka
+
+    Returns:
+        dict[str, list[str]]: język -> unikalne frazy w kolejności na karcie
+    """
+    phrases = {lang_in: [], lang_out: []}
+
+    def add(text, language):
+        if isinstance(text, str) and text.strip() and text.strip() not in phrases[language]:
+            phrases[language].append(text.strip())
+
+    add(word.get("original"), lang_in)
+    add(word.get("translation"), lang_out)
+    for example in word.get("examples", []):
+        add(example.get("original"), lang_in)
+        add(example.get("translated"), lang_out)
+    return {language: texts for language, texts in phrases.items() if texts}
+
+def _proportional_segments(phrases, duration):
+    """Szacuje granice segmentów proporcjonalnie do długości fraz (gdy brak PCM do analizy)"""
+    weights = [len(phrase) + len(PAUSE_MARKER) for phrase in phrases]
+    total = float(sum(weights)) or 1.0
+    segments, position = [], 0.0
+    for weight in weights:
+        length = duration * weight / total
+        segments.append((round(position, 3), round(position + length, 3)))
+        position += length
+    return segments
+
+def _widen_segments(segments, duration, margin=SPRITE_ESTIMATE_MARGIN):
+    """
+    Poszerza szacowane przedziały o zapas - lepiej usłyszeć koniec pauzy przed
+    sąsiednią frazą niż uciąć początek lub koniec własnej
+    """
+    return [
+        (round(max(0.0, start - margin), 3), round(min(duration, end + margin), 3))
+        for start, end in segments
+    ]
+
+def find_wav_segments(wav_bytes, count):
+    """
+    Dzieli nagranie WAV na `count` segmentów w miejscach najdłuższych cisz
+
+    Returns:
+        list[tuple[float, float]]: Przedziały (start, koniec) w sekundach
+    """
+    with wave.open(io.BytesIO(wav_bytes)) as wav:
+        rate, channels, width = wav.getframerate(), wav.getnchannels(), wav.getsampwidth()
+        frames = wav.readframes(wav.getnframes())
+    duration = len(frames) / float(rate * channels * width)
+    if count <= 1 or width != 2:
+        return _proportional_segments([""] * max(count, 1), duration)
+
+    pcm = frames[: len(frames) - len(frames) % 2]
+    window = max(1, rate * channels * SPRITE_WINDOW_MS // 1000)
+    if NUMPY_AVAILABLE:
+        # Ostatnie niepełne okno dopełniamy zerami - dzielimy i tak przez pełne okno
+        samples = np.frombuffer(pcm, dtype="<i2").astype(np.float64)
+        samples = np.pad(samples, (0, -len(samples) % window))
+        energies = (np.square(samples).reshape(-1, window).sum(axis=1) / window).tolist()
+    else:
+        samples = array.array("h")
+        samples.frombytes(pcm)
+        energies = [
+            sum(s * s for s in samples[i:i + window]) / window
+            for i in range(0, len(samples), window)
+        ]
+    threshold = max(energies, default=0) * SPRITE_SILENCE_RATIO ** 2
+    min_windows = SPRITE_MIN_GAP_MS // SPRITE_WINDOW_MS
+
+    # Ciągi cichych okien wewnątrz nagrania (bez ciszy na początku i na końcu)
+    gaps, start = [], None
+    for index, energy in enumerate(energies):
+        if energy <= threshold:
+            if start is None:
+                start = index
+        elif start is not None:
+            if start > 0 and index - start >= min_windows:
+                gaps.append((index - start, start, index))
+            start = None
+
+    if len(gaps) < count - 1:
+        return _proportional_segments([""] * count, duration)
+
+    chosen = sorted(sorted(gaps, reverse=True)[:count - 1], key=lambda gap: gap[1])
+    seconds_per_window = SPRITE_WINDOW_MS / 1000.0
+    cuts = [0.0] + [(gap_start + gap_end) / 2 * seconds_per_window for _, gap_start, gap_end in chosen] + [duration]
+    return [(round(cuts[i], 3), round(cuts[i + 1], 3)) for i in range(count)]
+
+def estimate_mp3_duration(mp3_bytes):
+    """Czas trwania MP3 (CBR) na podstawie nagłówka pierwszej ramki i rozmiaru danych"""
+    offset = 0
+    if mp3_bytes[:3] == b"ID3" and len(mp3_bytes) >= 10:
+        size = mp3_bytes[6:10]
+        offset = 10 + ((size[0] << 21) | (size[1] << 14) | (size[2] << 7) | size[3])
+    while offset + 4 <= len(mp3_bytes):
+        if mp3_bytes[offset] == 0xFF and (mp3_bytes[offset + 1] & 0xE0) == 0xE0:
+            version_bits = (mp3_bytes[offset + 1] >> 3) & 0x03
+            bitrate_index = (mp3_bytes[offset + 2] >> 4) & 0x0F
+            table = _MP3_BITRATES[1] if version_bits == 0x03 else _MP3_BITRATES[2]
+            if 0 < bitrate_index < 15:
+                return (len(mp3_bytes) - offset) * 8 / (table[bitrate_index] * 1000.0)
+        offset += 1
+    return 0.0
+
+def synthesize_sprite(phrases, language, provider):
+    """
+    Syntezuje wszystkie frazy jednego języka jednym zapytaniem
+
+    Returns:
+        tuple[bytes, str, list[tuple[float, float]]]: audio, format, przedziały segmentów
+    """
+    from utils.config import synthesize_openai, synthesize_gtts
+
+    joined = PAUSE_MARKER.join(phrases)
+    if provider == "gtts":
+        audio_bytes = synthesize_gtts(joined, language)
+        audio_format = "mp3"
+        # MP3 bez dekodera - granice tylko szacujemy, więc z zapasem
+        duration = estimate_mp3_duration(audio_bytes)
+        segments = _widen_segments(_proportional_segments(phrases, duration), duration)
+    else:
+        # WAV pozwala znaleźć pauzy dokładnie, bez dekodera MP3
+        audio_bytes = synthesize_openai(joined, language, response_format="wav")
+        audio_format = "wav"
+        segments = find_wav_segments(audio_bytes, len(phrases))
+    # Rozliczamy same frazy - bez znaczników pauzy
+    add_tts_usage(sum(len(phrase) for phrase in phrases), provider)
+    return audio_bytes, audio_format, segments
+
+def get_language_sprite(phrases, language, provider):
+    """
+    Zwraca sprite języka z cache (dysk) lub syntezuje go i zapisuje
+
+    Returns:
+        dict: {"audio": bytes, "format": str, "segments": {fraza: (start, koniec)}}
+    """
+    joined = PAUSE_MARKER.join(phrases)
+    cache_provider = f"sprite_{provider}"
+    manifest_bytes = load_cached_audio(joined, language, cache_provider, ext="json")
+    if manifest_bytes is not None:
+        manifest = json.loads(manifest_bytes.decode("utf-8"))
+        # Manifest i audio to jedno zapytanie - trafienie policzył już odczyt manifestu
+        audio_bytes = read_cached_audio(joined, language, cache_provider, ext=manifest["format"])
+        if audio_bytes is not None:
+            segments = {phrase: tuple(span) for phrase, span in zip(phrases, manifest["segments"])}
+            return {"audio": audio_bytes, "format": manifest["format"], "segments": segments}
+
+    audio_bytes, audio_format, spans = synthesize_sprite(phrases, language, provider)
+    save_cached_audio(joined, language, cache_provider, audio_bytes, ext=audio_format)
+    manifest = {"format": audio_format, "segments": spans}
+    save_cached_audio(joined, language, cache_provider, json.dumps(manifest).encode("utf-8"), ext="json")
+    return {"audio": audio_bytes, "format": audio_format, "segments": dict(zip(phrases, spans))}
+
+def _play_single_phrase(text, language):
+    from utils.config import text_to_speech, get_audio_mime
+
+    audio_bytes = text_to_speech(text, language)
+    if audio_bytes is not None:
+        st.audio(audio_bytes, format=get_audio_mime(audio_bytes))
+
+def play_card_audio(word, text, language, lang_in, lang_out):
+    """
+    Odtwarza frazę karty - z audio sprite'a karty, jeśli tryb sprite jest włączony,
+    w przeciwnym razie (lub gdy synteza sprite'a się nie uda) zwykłym text_to_speech()
+    """
+    from utils.config import get_tts_providers
+
+    providers = get_tts_providers()
+    provider = providers[0] if providers else None
+    if not st.session_state.get("tts_sprite_mode", False) or provider not in ("openai", "gtts"):
+        _play_single_phrase(text, language)
+        return
+
+    phrases = build_card_phrases(word, lang_in, lang_out).get(language, [])
+    if text.strip() not in phrases:
+        _play_single_phrase(text, language)
+        return
+
+    # Sprite'y ostatnich kart trzymamy w sesji (LRU) - kolejne 🔊 tej samej karty
+    # nie czytają nawet dysku, a przeglądanie wielu kart nie zapełnia pamięci
+    sprites = st.session_state.setdefault("card_sprites", OrderedDict())
+    sprite_key = (provider, language, tuple(phrases))
+    if sprite_key in sprites:
+        sprites.move_to_end(sprite_key)
+    else:
+        try:
+            sprites[sprite_key] = get_language_sprite(phrases, language, provider)
+        except Exception:
+            # Sprite idzie prosto do dostawcy - fallback, hedging i cooldown ma dopiero dyspozytor
+            _play_single_phrase(text, language)
+            return
+        while len(sprites) > SPRITE_SESSION_CACHE_SIZE:
+            sprites.popitem(last=False)
+    sprite = sprites[sprite_key]
+    start, end = sprite["segments"][text.strip()]
+    st.audio(sprite["audio"], format=f"audio/{sprite['format']}", start_time=start, end_time=end)
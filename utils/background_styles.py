@@ -1,25 +1,48 @@
 """
 Moduł stylów tła dla aplikacji PANJO
+
+Tło i logo są serwowane jako pliki statyczne (WebP w kilku szerokościach,
+patrz utils/static_assets.py), a CSS i znacznik logo budowane raz na proces -
+przy każdym rerunie do przeglądarki trafiają tylko adresy obrazków.
 """
 
 import streamlit as st
-import base64
 import os
 
-def apply_background_with_readability():
-    """Dodaje tło z obrazka i style dla lepszej czytelności"""
-    
-    # Wczytaj obrazek tła
-    background_path = os.path.join("background", "tlolanguagehelper.png")
-    
-    if os.path.exists(background_path):
-        with open(background_path, "rb") as image_file:
-            encoded_image = base64.b64encode(image_file.read()).decode()
-        
-        background_css = f"""
+from utils.static_assets import build_image_variants
+
+BACKGROUND_PATH = os.path.join("background", "tlolanguagehelper.png")
+BACKGROUND_WIDTHS = (1280, 1920, 2560)   # typowe szerokości ekranów (px CSS × gęstość pikseli)
+LOGO_PATH = os.path.join("background", "logo.png")
+LOGO_WIDTHS = (320, 640)                 # szerokość sidebara i wariant dla ekranów 2x
+
+def _background_image_css(variants):
+    """Reguły .stApp z wariantem dobranym do szerokości ekranu (media queries)"""
+    smallest_url = variants[0][1]
+    rules = [f".stApp {{ background-image: url('{smallest_url}'); }}"]
+    for (previous_width, _), (_, url) in zip(variants, variants[1:]):
+        rules.append(
+            f"@media (min-width: {previous_width + 1}px), "
+            f"(min-resolution: 2dppx) and (min-width: {previous_width // 2 + 1}px) "
+            f"{{ .stApp {{ background-image: url('{url}'); }} }}"
+        )
+    return "\n        ".join(rules)
+
+@st.cache_resource(show_spinner=False)
+def get_background_css():
+    """
+    Blok <style> z tłem i stylami czytelności - budowany raz na proces
+
+    Returns:
+        str | None: CSS lub None, gdy brak pliku tła
+    """
+    if not os.path.exists(BACKGROUND_PATH):
+        return None
+    _, variants = build_image_variants(BACKGROUND_PATH, "background", BACKGROUND_WIDTHS)
+    return f"""
         <style>
+        {_background_image_css(variants)}
         .stApp {{
-            background-image: url(data:image/png;base64,{encoded_image});
             background-size: cover;
             background-position: center;
             background-repeat: no-repeat;
@@ -272,7 +295,35 @@ def apply_background_with_readability():
         }}
         </style>
         """
-        #st.title("PANJO - personalny asystent nauki języków obcych z AI") # Przeniesiony tytuł tutaj, aby zastosować style
-        st.markdown(background_css, unsafe_allow_html=True)
-    else:
-        st.warning(f"Nie znaleziono pliku tła: {background_path}")
\ No newline at end of file
+
+@st.cache_resource(show_spinner=False)
+def get_logo_html():
+    """
+    Znacznik <img> logo z wariantami dla szerokości sidebara - budowany raz na proces
+
+    Returns:
+        str | None: HTML lub None, gdy brak pliku logo
+    """
+    if not os.path.exists(LOGO_PATH):
+        return None
+    _, variants = build_image_variants(LOGO_PATH, "logo", LOGO_WIDTHS)
+    srcset = ", ".join(f"{url} {width}w" for width, url in variants if width)
+    srcset_attribute = f' srcset="{srcset}" sizes="(max-width: 640px) 100vw, 320px"' if srcset else ""
+    return f'<img src="{variants[0][1]}"{srcset_attribute} alt="PANJO" style="width: 100%; height: auto;">'
+
+def show_sidebar_logo():
+    """Wyświetla logo w sidebarze (mały wariant z pliku statycznego zamiast PNG przy każdym rerunie)"""
+    logo_html = get_logo_html()
+    if logo_html is None:
+        st.warning(f"Nie znaleziono pliku logo: {LOGO_PATH}")
+        return
+    st.markdown(logo_html, unsafe_allow_html=True)
+
+def apply_background_with_readability():
+    """Dodaje tło z obrazka i style dla lepszej czytelności"""
+    background_css = get_background_css()
+    if background_css is None:
+        st.warning(f"Nie znaleziono pliku tła: {BACKGROUND_PATH}")
+        return
+    #st.title("PANJO - personalny asystent nauki języków obcych z AI") # Przeniesiony tytuł tutaj, aby zastosować style
+    st.markdown(background_css, unsafe_allow_html=True)
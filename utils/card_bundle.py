@@ -0,0 +1,227 @@
+"""
+Gotowe karty słówek z PREDEFINED_WORD_SETS dostarczane z aplikacją
+
+Słówka z gotowych zestawów są te same dla wszystkich użytkowników, więc ich
+tłumaczenia, przykłady (i opcjonalnie odmiany) generuje się raz, przed
+wdrożeniem, do pliku CARD_BUNDLE_FILE (JSON skompresowany gzip). Aplikacja
+bierze karty z pliku bez zapytań do API; po API sięga tylko dla słówek, których
+w pliku nie ma. Ponowne uruchomienie generatora uzupełnia tylko brakujące karty.
+
+Użycie:
+    python -m utils.card_bundle                       # wszystkie zestawy i pary językowe
+    python -m utils.card_bundle --targets polski --conjugations --workers 4
+"""
+
+import argparse
+import copy
+import gzip
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+CARD_BUNDLE_FILE = os.path.join("base", "card_bundle.json.gz")
+# Wersja formatu pliku - plik w innej wersji jest ignorowany (karty idą wtedy z API)
+CARD_BUNDLE_FORMAT = 1
+SAVE_EVERY = 50              # zapis postępu generatora co tyle kart
+CARD_FIELDS = ("translation", "alternatives", "examples", "difficulty", "part_of_speech", "pronunciation_tip")
+
+_bundle_cache = {"mtime": None, "bundle": None}
+_bundle_lock = threading.Lock()
+
+def new_bundle():
+    return {"format": CARD_BUNDLE_FORMAT, "generated": None, "model": None, "cards": {}, "conjugations": {}}
+
+def _word_key(word):
+    return word.strip().lower()
+
+def _read_bundle(path):
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            bundle = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if bundle.get("format") != CARD_BUNDLE_FORMAT:
+        return None
+    return bundle
+
+def load_card_bundle(path=None):
+    """
+    Plik kart z pamięci procesu (wczytywany ponownie tylko po zmianie pliku)
+
+    Returns:
+        dict: {"format", "generated", "model", "cards": {para: {słowo: karta}},
+        "conjugations": {język: {słowo: odmiany}}} - pusty, gdy pliku brak
+    """
+    path = path or CARD_BUNDLE_FILE
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return new_bundle()
+    with _bundle_lock:
+        if _bundle_cache["mtime"] != mtime:
+            _bundle_cache["bundle"] = _read_bundle(path) or new_bundle()
+            _bundle_cache["mtime"] = mtime
+        return _bundle_cache["bundle"]
+
+def get_bundled_card(word, lang_in, lang_out):
+    """
+    Gotowa karta słówka (kopia - można ją uzupełniać przed zapisem do bazy)
+
+    Returns:
+        dict | None: Dane słówka w formacie generate_word_with_ai() lub None
+    """
+    card = load_card_bundle()["cards"].get(f"{lang_in}_{lang_out}", {}).get(_word_key(word))
+    if card is None:
+        return None
+    return dict(copy.deepcopy(card), original=word)
+
+def get_bundled_conjugation(word, language):
+    """Gotowe odmiany słówka (format generate_word_conjugation()) lub None"""
+    conjugation = load_card_bundle()["conjugations"].get(language, {}).get(_word_key(word))
+    return copy.deepcopy(conjugation) if conjugation is not None else None
+
+def save_card_bundle(bundle, path=None):
+    """Zapisuje plik kart atomowo (tymczasowy + os.replace)"""
+    path = path or CARD_BUNDLE_FILE
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(suffix=".part", dir=os.path.dirname(path))
+    os.close(fd)
+    # Zwarty JSON i gzip - plik jedzie z aplikacją
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        json.dump(bundle, f, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+    os.replace(tmp_path, path)
+
+def collect_jobs(bundle, word_sets, targets, conjugations=False):
+    """
+    Lista brakujących kart i odmian
+
+    Returns:
+        list[tuple]: ("card", słowo, język, język docelowy) lub ("conjugation", słowo, język, None)
+    """
+    jobs = []
+    for language, sets in word_sets.items():
+        words = list(dict.fromkeys(word for set_words in sets.values() for word in set_words))
+        for lang_out in targets:
+            if lang_out == language:
+                continue
+            existing = bundle["cards"].get(f"{language}_{lang_out}", {})
+            jobs.extend(("card", word, language, lang_out) for word in words if _word_key(word) not in existing)
+        if conjugations:
+            existing = bundle["conjugations"].get(language, {})
+            jobs.extend(("conjugation", word, language, None) for word in words if _word_key(word) not in existing)
+    return jobs
+
+def _run_job(job, bundle):
+    from ai_handlers import get_ai_handler
+
+    kind, word, language, lang_out = job
+    handler = get_ai_handler(language)
+    if kind == "card":
+        result = handler.generate_word_translation(word, language, lang_out)
+        if not result or "translation" not in result:
+            raise ValueError("odpowiedź bez pola 'translation'")
+        return {field: result[field] for field in CARD_FIELDS if field in result}
+    # Odmiany zależą od części mowy - bierzemy ją z dowolnej gotowej karty tego słowa
+    part_of_speech, translation = "", ""
+    for pair, cards in bundle["cards"].items():
+        card = cards.get(_word_key(word))
+        if pair.startswith(f"{language}_") and card:
+            part_of_speech = card.get("part_of_speech", "")
+            if pair == f"{language}_polski":
+                translation = card.get("translation", "")
+    result = handler.generate_word_conjugation(word, part_of_speech, translation)
+    if not result or not result.get("conjugations"):
+        raise ValueError("odpowiedź bez odmian")
+    return result
+
+def build_card_bundle(word_sets, targets, conjugations=False, max_workers=4, path=None, progress=print):
+    """
+    Generuje brakujące karty (i odmiany) i zapisuje plik kart
+
+    Args:
+        word_sets (dict): PREDEFINED_WORD_SETS
+        targets (list[str]): Języki docelowe
+        conjugations (bool): Czy generować też odmiany
+        max_workers (int): Liczba równoległych zapytań
+        path (str | None): Plik wynikowy (domyślnie CARD_BUNDLE_FILE)
+        progress (callable): Funkcja raportująca postęp
+
+    Returns:
+        dict: Podsumowanie (generated, failed, seconds, interrupted)
+    """
+    from utils.config import get_model
+    from utils.openai_client import bind_api_key
+
+    path = path or CARD_BUNDLE_FILE
+    bundle = (_read_bundle(path) if os.path.exists(path) else None) or new_bundle()
+    summary = {"generated": 0, "failed": 0, "seconds": 0.0, "interrupted": False}
+    # Karty przed odmianami - odmiany korzystają z części mowy z kart
+    for phase in ("card", "conjugation"):
+        jobs = [job for job in collect_jobs(bundle, word_sets, targets, conjugations) if job[0] == phase]
+        if not jobs:
+            continue
+        progress(f"{'Karty' if phase == 'card' else 'Odmiany'}: do wygenerowania {len(jobs)} (wątki: {max_workers})")
+        start = time.perf_counter()
+        executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+        try:
+            run_job = bind_api_key(_run_job)
+            futures = {executor.submit(run_job, job, bundle): job for job in jobs}
+            for future in as_completed(futures):
+                kind, word, language, lang_out = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    summary["failed"] += 1
+                    progress(f"  ❌ {language}: '{word}' - {e}")
+                    continue
+                # Bundle modyfikowany tylko w wątku głównym
+                if kind == "card":
+                    bundle["cards"].setdefault(f"{language}_{lang_out}", {})[_word_key(word)] = result
+                else:
+                    bundle["conjugations"].setdefault(language, {})[_word_key(word)] = result
+                summary["generated"] += 1
+                if summary["generated"] % SAVE_EVERY == 0:
+                    save_card_bundle(bundle, path)
+                    progress(f"  {summary['generated']} gotowych")
+        except KeyboardInterrupt:
+            summary["interrupted"] = True
+            progress("⏸️ Przerwano - gotowe karty zostaną zapisane, ponowne uruchomienie wznowi pracę.")
+        finally:
+            executor.shutdown(wait=not summary["interrupted"], cancel_futures=True)
+            summary["seconds"] += time.perf_counter() - start
+            bundle["generated"] = datetime.now().isoformat()
+            bundle["model"] = get_model()
+            save_card_bundle(bundle, path)
+        if summary["interrupted"]:
+            break
+    return summary
+
+def main(argv=None):
+    from utils.config import supported_languages
+
+    parser = argparse.ArgumentParser(description="Generowanie gotowych kart dla zestawów słówek")
+    parser.add_argument("--targets", nargs="*", default=None,
+                        help="Języki docelowe (domyślnie wszystkie obsługiwane)")
+    parser.add_argument("--conjugations", action="store_true", help="Generuj też odmiany słówek")
+    parser.add_argument("--workers", type=int, default=4, help="Limit równoległych zapytań")
+    parser.add_argument("--output", default=CARD_BUNDLE_FILE, help="Plik wynikowy")
+    args = parser.parse_args(argv)
+
+    targets = args.targets or supported_languages
+    unknown = [language for language in targets if language not in supported_languages]
+    if unknown:
+        parser.error(f"Nieobsługiwane języki: {', '.join(unknown)}")
+
+    from modules.vocabulary import PREDEFINED_WORD_SETS
+    summary = build_card_bundle(PREDEFINED_WORD_SETS, targets, args.conjugations, args.workers, args.output)
+    size_kb = os.path.getsize(args.output) / 1024 if os.path.exists(args.output) else 0
+    print(f"✅ wygenerowano {summary['generated']}, błędy {summary['failed']} w {summary['seconds']:.1f}s "
+          f"• {args.output} ({size_kb:.0f} KB)")
+    return 1 if summary["interrupted"] else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
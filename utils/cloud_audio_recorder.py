@@ -1,13 +1,65 @@
 """Kompatybilny z Streamlit Cloud moduł nagrywania audio"""
 
 import streamlit as st
-import tempfile
+import hashlib
 import os
 
+from utils import metrics
+
+# Cache transkrypcji: klucz = sha256(audio) + kod języka, więc każde nagranie trafia do Whisper raz
+TRANSCRIPTION_SESSION_KEY = "transcription_cache"
+TRANSCRIPTION_SESSION_LIMIT = 100
+# Opcjonalny cache na dysku (np. TRANSCRIPTION_DISK_CACHE=1) - teksty nagrań zostają na serwerze
+TRANSCRIPTION_DISK_CACHE = os.environ.get("TRANSCRIPTION_DISK_CACHE", "").lower() in ("1", "true", "yes")
+TRANSCRIPTION_CACHE_DIR = os.path.join("base", "transcription_cache")
+
+def get_transcription_key(audio_bytes, language_code):
+    """Klucz cache transkrypcji - hash treści nagrania i kod języka"""
+    return f"{hashlib.sha256(audio_bytes).hexdigest()}_{language_code}"
+
+def get_cached_transcription(key):
+    """Zwraca transkrypcję z cache sesji (lub dysku) albo None - jedno trafienie lub chybienie na wywołanie"""
+    text = _lookup_transcription(key)
+    metrics.inc("cache_hits" if text is not None else "cache_misses", "transcription")
+    return text
+
+def _lookup_transcription(key):
+    session_cache = st.session_state.get(TRANSCRIPTION_SESSION_KEY, {})
+    if key in session_cache:
+        return session_cache[key]
+    if TRANSCRIPTION_DISK_CACHE:
+        try:
+            with open(os.path.join(TRANSCRIPTION_CACHE_DIR, f"{key}.txt"), "r", encoding="utf-8") as f:
+                text = f.read()
+        except OSError:
+            return None
+        session_cache[key] = text
+        st.session_state[TRANSCRIPTION_SESSION_KEY] = session_cache
+        return text
+    return None
+
+def store_transcription(key, text):
+    """Zapisuje transkrypcję w cache sesji (i na dysku, jeśli włączone)"""
+    session_cache = st.session_state.setdefault(TRANSCRIPTION_SESSION_KEY, {})
+    session_cache[key] = text
+    # Ogranicz rozmiar - usuń najstarsze wpisy (dict zachowuje kolejność dodawania)
+    while len(session_cache) > TRANSCRIPTION_SESSION_LIMIT:
+        session_cache.pop(next(iter(session_cache)))
+    if TRANSCRIPTION_DISK_CACHE:
+        try:
+            os.makedirs(TRANSCRIPTION_CACHE_DIR, exist_ok=True)
+            with open(os.path.join(TRANSCRIPTION_CACHE_DIR, f"{key}.txt"), "w", encoding="utf-8") as f:
+                f.write(text)
+        except OSError:
+            pass
+
 def cloud_audio_recorder_interface(session_key_prefix=""):
     """
     Interfejs nagrywania kompatybilny z Streamlit Cloud
     Używa wbudowanego komponentu Streamlit audio_input
+    
+    Returns:
+        bytes | None: Nagranie WAV w pamięci lub None jeśli brak nagrania
     """
     # st.write("🎤 Nagraj swoją wypowiedź:")
     
@@ -15,53 +67,64 @@ def cloud_audio_recorder_interface(session_key_prefix=""):
     audio_bytes = st.audio_input("Nagraj", key=f"{session_key_prefix}audio_recorder")
     
     if audio_bytes:
-        # Zapisz do pliku tymczasowego
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp_file:
-            tmp_file.write(audio_bytes.getvalue())
-            tmp_filename = tmp_file.name
-        
         # st.audio(audio_bytes, format="audio/wav")
         # st.success("✅ Nagranie gotowe do przetworzenia!")
-        return tmp_filename
+        return audio_bytes.getvalue()
     
     return None
 
-def transcribe_audio_file(audio_file_path, language_code="en"):
+def transcribe_audio_file(audio_data, language_code="en"):
     """
-    Transkrybuje plik audio używając OpenAI Whisper
+    Transkrybuje nagranie backendem ASR wdrożenia (upload z pamięci, bez plików tymczasowych)
     
     Args:
-        audio_file_path (str): Ścieżka do pliku audio
+        audio_data (bytes): Nagranie WAV z cloud_audio_recorder_interface()
         language_code (str): Kod języka (en, pl, de, etc.)
     
     Returns:
         str: Rozpoznany tekst
     """
-    from utils.config import client
-    from utils.ai_stats import add_whisper_usage
-    import os
+    from utils.asr_backends import transcribe_recording
     
     try:
-        with open(audio_file_path, "rb") as file:
-            transcription = client.audio.transcriptions.create(
-                model="whisper-1", 
-                file=file,
-                language=language_code
-            )
+        # To samo nagranie po kolejnym rerunie - bez ponownego wysyłania i naliczania Whisper
+        cache_key = get_transcription_key(audio_data, language_code)
+        cached_text = get_cached_transcription(cache_key)
+        if cached_text is not None:
+            return cached_text
         
-        # Oblicz czas trwania (przybliżony)
-        file_size = os.path.getsize(audio_file_path)
-        # Przybliżony czas w sekundach (16kHz, 16-bit mono)
-        duration_seconds = file_size / (16000 * 2)  
-        add_whisper_usage(duration_seconds)
+        text = transcribe_recording(audio_data, language_code)
         
-        return transcription.text
+        if text:
+            store_transcription(cache_key, text)
+        return text
     except Exception as e:
         st.error(f"Błąd podczas transkrypcji: {e}")
         return ""
-    finally:
-        # Sprzątanie - usuń tymczasowy plik
-        try:
-            os.unlink(audio_file_path)
-        except:
-            pass
\ No newline at end of file
+
+def translate_audio_file_to_english(audio_data):
+    """
+    Rozpoznaje nagranie i od razu zwraca tekst po angielsku (jedno zapytanie zamiast dwóch)
+    
+    Args:
+        audio_data (bytes): Nagranie WAV z cloud_audio_recorder_interface()
+    
+    Returns:
+        str: Tekst po angielsku
+    """
+    from utils.asr_backends import translate_recording_to_english
+    
+    try:
+        cache_key = get_transcription_key(audio_data, "en-translation")
+        cached_text = get_cached_transcription(cache_key)
+        if cached_text is not None:
+            return cached_text
+        
+        text = translate_recording_to_english(audio_data)
+        
+        if text:
+            store_transcription(cache_key, text)
+        return text
+    except Exception as e:
+        st.error(f"Błąd podczas tłumaczenia nagrania: {e}")
+        return ""
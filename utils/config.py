@@ -1,46 +1,39 @@
 """Konfiguracja klienta OpenAI i zmienne środowiskowe"""
 
 import streamlit as st
-from dotenv import dotenv_values
-from openai import OpenAI
+
+from utils.openai_client import client, get_api_key
+from utils.rerun_cpu import fragment
 
 def load_environment():
-    """Ładuje zmienne środowiskowe z pliku .env lub zmiennych systemowych"""
-    # Sprawdź zmienne systemowe (dla Streamlit Cloud)
-    import os
-    api_key = os.environ.get("OPENAI_API_KEY")
-    
-    # Jeśli nie ma w systemie, sprawdź plik .env
-    if not api_key:
-        env = dotenv_values(".env")
-        api_key = env.get("OPENAI_API_KEY")
+    """
+    Upewnia się, że jest klucz API - w aplikacji prosi o niego użytkownika (wywoływane z app.py)
+
+    Klienci powstają leniwie w utils/openai_client.py (osobno dla każdego klucza);
+    import tego modułu nie wyświetla niczego i nie tworzy połączeń.
+    """
+    # Zmienne systemowe (Streamlit Cloud), plik .env lub klucz wpisany wcześniej w tej sesji
+    api_key = get_api_key()
     
     if not api_key:
-        # Sprawdź czy klucz jest już w session_state
-        if "openai_api_key" in st.session_state:
-            api_key = st.session_state.openai_api_key
-        else:
-            st.error("❌ Brak klucza API OpenAI w pliku .env")
-            api_key_input = st.text_input(
-                "Wpisz klucz API OpenAI:",
-                type="password",
-                placeholder="sk-proj-..."
-            )
-            if api_key_input:
-                if api_key_input.startswith("sk-") and len(api_key_input) >= 100:
-                    st.session_state.openai_api_key = api_key_input
-                    st.rerun()
-                else:
-                    st.error("❌ Nieprawidłowy klucz API (musi zaczynać się od 'sk-' i być wystarczająco długi)")
-            if not api_key_input:
-                st.stop()
+        st.error("❌ Brak klucza API OpenAI w pliku .env")
+        api_key_input = st.text_input(
+            "Wpisz klucz API OpenAI:",
+            type="password",
+            placeholder="sk-proj-..."
+        )
+        if api_key_input:
+            if api_key_input.startswith("sk-") and len(api_key_input) >= 100:
+                # Klient dla tego klucza powstanie przy pierwszym użyciu - inne sesje mają swoich
+                st.session_state.openai_api_key = api_key_input
+                st.rerun()
+            else:
+                st.error("❌ Nieprawidłowy klucz API (musi zaczynać się od 'sk-' i być wystarczająco długi)")
+        if not api_key_input:
+            st.stop()
     
     return {"OPENAI_API_KEY": api_key}
 
-# Inicjalizacja klienta OpenAI
-env = load_environment()
-client = OpenAI(api_key=env.get("OPENAI_API_KEY"))
-
 # Wybór modelu (globalnie dla całej aplikacji). Możesz ustawić zmienną środowiskową OPENAI_MODEL
 # np. OPENAI_MODEL=gpt-5-codex aby włączyć podglądowy model dla wszystkich wywołań.
 import os as _os
@@ -65,6 +58,7 @@ language_code_map = {
 
 # Dodatkowe importy dla funkcji audio
 
+import io
 import tempfile
 import time
 import os
@@ -72,53 +66,57 @@ from datetime import datetime
 
 # Import statystyk i kosztów z osobnego modułu
 from utils.ai_stats import (
-    load_usage_database, create_new_database, migrate_old_database, save_usage_database, get_today_key,
-    mark_new_session, add_to_daily_stats, init_token_tracking, add_token_usage, add_tts_usage, add_whisper_usage, calculate_costs
+    load_usage_database, create_new_database, migrate_old_database, get_today_key,
+    mark_new_session, add_to_daily_stats, init_token_tracking, add_token_usage, add_tts_usage, add_whisper_usage, calculate_costs,
+    get_usage_summary
 )
+from utils.asr_backends import get_asr_backend, transcribe_recording
+from utils.streaming_recorder import STREAMING_AVAILABLE, show_streaming_recording_interface
+from utils.audio_cache import find_cached_audio, save_cached_audio
+from utils.tts_dispatcher import register_tts_provider, get_registered_providers, dispatch_tts
+from utils.tts_sidebar import get_tts_options
+from utils.latency import track_latency
+from utils.lazy_imports import is_installed, optional_import
 
-# Opcjonalne importy audio - mogą nie być dostępne w środowisku chmurowym
-try:
-    import sounddevice as sd
-    import scipy.io.wavfile as wavfile
-    AUDIO_AVAILABLE = True
-except (ImportError, OSError):
-    # ImportError - brak modułu, OSError - brak PortAudio library
-    AUDIO_AVAILABLE = False
+def audio_available():
+    """
+    Czy działa nagrywanie z mikrofonu serwera - sounddevice i scipy importowane przy pierwszym wywołaniu
+    (w środowisku chmurowym brak modułu lub biblioteki PortAudio)
+    """
+    return optional_import("sounddevice") is not None and optional_import("scipy.io.wavfile") is not None
 
 
 
+@fragment("usage_sidebar")
 def show_token_sidebar():
-    """Wyświetla statystyki tokenów i kosztów z persystentnej bazy danych"""
-    # Załaduj dane z bazy
-    db = load_usage_database()
-    costs, total_cost = calculate_costs(use_database=True)
-    stats = db["total_stats"]
+    """
+    Wyświetla statystyki tokenów i kosztów z persystentnej bazy danych
+
+    Fragment - wywoływany w `with st.sidebar:`; przyciski zarządzania odświeżają
+    tylko ten panel. Użycie z kliknięć w innych fragmentach widać po pełnym przebiegu.
+    """
+    # Podsumowanie z pamięci podręcznej - baza jest czytana tylko po zmianie danych
+    summary = get_usage_summary()
+    costs, total_cost = summary["costs"], summary["total_cost"]
+    stats = summary["stats"]
     
     #st.sidebar.divider()
-    st.sidebar.subheader("📊 Statystyki użycia")
+    st.subheader("📊 Statystyki użycia")
     
     # Tokeny łącznie (wszystkie czasy)
-    total_tokens = sum(module["total"] for module in [stats["translator"], stats["belfer"], stats["dialog"], stats["vocabulary"]])
-    st.sidebar.metric("Tokeny łącznie", f"{total_tokens:,}")
+    st.metric("Tokeny łącznie", f"{summary['total_tokens']:,}")
     
     # Koszty łącznie
-    st.sidebar.metric("💰 Łączny koszt", f"${total_cost:.4f}")
+    st.metric("💰 Łączny koszt", f"${total_cost:.4f}")
     
     # Dzisiejsze statystyki
-    today = get_today_key()
-    today_stats = db["daily_stats"].get(today, {})
-    if today_stats:
-        today_tokens = sum(module.get("total", 0) for module in [
-            today_stats.get("translator", {}), 
-            today_stats.get("belfer", {}), 
-            today_stats.get("dialog", {}),
-            today_stats.get("vocabulary", {})
-        ])
-        if today_tokens > 0:
-            st.sidebar.metric("📅 Dzisiaj tokenów", f"{today_tokens:,}")
+    today = summary["today"]
+    today_stats = summary["today_stats"]
+    if summary["today_tokens"] > 0:
+        st.metric("📅 Dzisiaj tokenów", f"{summary['today_tokens']:,}")
     
     # Szczegółowe statystyki
-    with st.sidebar.expander("🔍 Szczegóły tokenów"):
+    with st.expander("🔍 Szczegóły tokenów"):
         st.write("**📈 Łącznie wszystkich czasów:**")
         st.write(f"• Translator: {stats['translator']['total']:,}")
         st.write(f"• Belfer: {stats['belfer']['total']:,}")
@@ -126,9 +124,14 @@ def show_token_sidebar():
         st.write(f"• Vocabulary: {stats['vocabulary']['total']:,}")
         st.write(f"• TTS OpenAI: {stats.get('tts_chars_openai', 0):,} zn.")
         st.write(f"• TTS gTTS: {stats.get('tts_chars_gtts', 0):,} zn. 🆓")
+        if stats.get("tts_chars_local", 0):
+            st.write(f"• TTS lokalny: {stats['tts_chars_local']:,} zn. 🆓")
         st.write(f"• Whisper: {stats['whisper_minutes']:.2f} min")
+        if stats.get("whisper_seconds_saved", 0) or stats.get("whisper_bytes_saved", 0):
+            st.write(f"• Whisper zaoszczędzone: {stats.get('whisper_seconds_saved', 0.0):.0f} s, "
+                     f"{stats.get('whisper_bytes_saved', 0) / 1024:,.0f} KB")
     
-    with st.sidebar.expander("� Szczegóły kosztów"):
+    with st.expander("� Szczegóły kosztów"):
         st.write("**� Łączne koszty:**")
         st.write(f"• Translator: ${costs['translator']:.4f}")
         st.write(f"• Belfer: ${costs['belfer']:.4f}")  
@@ -140,7 +143,7 @@ def show_token_sidebar():
     
     # Dzienne statystyki szczegółowo
     if today_stats:
-        with st.sidebar.expander("📅 Dzisiejsze szczegóły"):
+        with st.expander("📅 Dzisiejsze szczegóły"):
             st.write("**🎯 Tokeny dzisiaj:**")
             if today_stats.get("translator", {}).get("total", 0) > 0:
                 st.write(f"• Translator: {today_stats['translator']['total']:,}")
@@ -158,44 +161,46 @@ def show_token_sidebar():
                 st.write(f"• OpenAI: {openai_tts_today:,} zn.")
             if gtts_today > 0:
                 st.write(f"• gTTS: {gtts_today:,} zn. 🆓")
+            local_today = today_stats.get("tts_chars_local", 0)
+            if local_today > 0:
+                st.write(f"• Lokalny: {local_today:,} zn. 🆓")
             
             whisper_today = today_stats.get("whisper_minutes", 0)
             if whisper_today > 0:
                 st.write(f"**🎤 Whisper:** {whisper_today:.2f} min")
     
     # Historia ostatnich dni
-    daily_stats = db["daily_stats"]
-    if len(daily_stats) > 1:
-        with st.sidebar.expander("📊 Historia ostatnich dni"):
-            # Sortuj dni od najnowszego
-            sorted_days = sorted(daily_stats.keys(), reverse=True)[:7]  # ostatnie 7 dni
-            
-            for day in sorted_days:
-                day_data = daily_stats[day]
-                day_tokens = sum(module.get("total", 0) for module in [
-                    day_data.get("translator", {}), 
-                    day_data.get("belfer", {}), 
-                    day_data.get("dialog", {}),
-                    day_data.get("vocabulary", {})
-                ])
-                
-                if day_tokens > 0:
-                    day_formatted = datetime.strptime(day, "%Y-%m-%d").strftime("%d.%m")
-                    if day == today:
-                        st.write(f"**{day_formatted} (dzisiaj):** {day_tokens:,} tokenów")
-                    else:
-                        st.write(f"**{day_formatted}:** {day_tokens:,} tokenów")
-    
+    if summary["days_with_data"] > 1:
+        with st.expander("📊 Historia ostatnich dni"):
+            # Ostatnie 7 dni od najnowszego (wyliczone w podsumowaniu)
+            for day, day_tokens in summary["history"]:
+                day_formatted = datetime.strptime(day, "%Y-%m-%d").strftime("%d.%m")
+                if day == today:
+                    st.write(f"**{day_formatted} (dzisiaj):** {day_tokens:,} tokenów")
+                else:
+                    st.write(f"**{day_formatted}:** {day_tokens:,} tokenów")
+
+    # Opóźnienia wywołań (percentyle z histogramów)
+    if summary["latency"]:
+        with st.expander("⏱️ Latency"):
+            for key, latency in summary["latency"].items():
+                module, model = key.split("|", 1)
+                st.write(f"**{module.capitalize()} · {model}** (n={latency['count']:,})")
+                st.caption(
+                    f"p50 {latency['p50'] / 1000:.2f} s · p95 {latency['p95'] / 1000:.2f} s · "
+                    f"p99 {latency['p99'] / 1000:.2f} s · max {latency['max'] / 1000:.2f} s"
+                )
+
     # Historia i zarządzanie
-    with st.sidebar.expander("📋 Zarządzanie bazą"):
+    with st.expander("📋 Zarządzanie bazą"):
         # Informacje o bazie
-        created = datetime.fromisoformat(db["created_date"]).strftime("%d.%m.%Y")
-        updated = datetime.fromisoformat(db["last_updated"]).strftime("%d.%m %H:%M")
+        created = datetime.fromisoformat(summary["created_date"]).strftime("%d.%m.%Y")
+        updated = datetime.fromisoformat(summary["last_updated"]).strftime("%d.%m %H:%M")
         st.caption(f"Utworzona: {created}")
         st.caption(f"Aktualizowana: {updated}")
         
         # Liczba dni z danymi
-        days_with_data = len(db["daily_stats"])
+        days_with_data = summary["days_with_data"]
         if days_with_data > 0:
             st.caption(f"Dni z danymi: {days_with_data}")
         
@@ -204,27 +209,27 @@ def show_token_sidebar():
         with col1:
             if st.button("🔄 Reset sesji", help="Resetuj tylko dane bieżącej sesji"):
                 st.session_state.pop("total_tokens_used", None)
-                st.rerun()
+                st.rerun(scope="fragment")
         
         with col2:
             if st.button("🗑️ Wyczyść bazę", help="⚠️ USUWA wszystkie dane!"):
-                from utils.ai_stats import DB_FILE
-                if os.path.exists(DB_FILE):
-                    os.remove(DB_FILE)
+                from utils.ai_stats import clear_usage_database
+                clear_usage_database()
                 st.session_state.pop("total_tokens_used", None)
-                st.rerun()
+                st.rerun(scope="fragment")
 
 
-def text_to_speech_openai(text, language):
+def synthesize_openai(text, language, response_format="mp3"):
     """
-    Generuje mowę z tekstu używając OpenAI TTS z odpowiednim głosem dla języka
+    Syntezuje mowę przez OpenAI TTS bez zliczania użycia (wspólne dla UI i zadań wsadowych)
     
     Args:
         text (str): Tekst do przetworzenia na mowę
-        language (str): Język (np. "English", "Polish")
+        language (str): Język w polskiej nazwie (np. "angielski", "polski")
+        response_format (str): Format audio ("mp3", "wav", ...)
     
     Returns:
-        bytes: Audio w formacie MP3
+        bytes: Audio w wybranym formacie (domyślnie MP3)
     """
     # Wybór głosu na podstawie języka (używamy polskich nazw z supported_languages)
     voice_mapping = {
@@ -238,31 +243,48 @@ def text_to_speech_openai(text, language):
     
     selected_voice = voice_mapping.get(language, "alloy")
     
-    response = client.audio.speech.create(
-        model="tts-1",
-        input=text,
-        voice=selected_voice,
-    )
-    with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as tmpfile:
+    with track_latency("tts", "tts-1"):
+        response = client.audio.speech.create(
+            model="tts-1",
+            input=text,
+            voice=selected_voice,
+            response_format=response_format,
+        )
+    with tempfile.NamedTemporaryFile(suffix=f".{response_format}", delete=False) as tmpfile:
         response.stream_to_file(tmpfile.name)
         tmpfile.flush()
         with open(tmpfile.name, "rb") as audio_file:
             audio_bytes = audio_file.read()
     
+    return audio_bytes
+
+def text_to_speech_openai(text, language):
+    """
+    Generuje mowę z tekstu używając OpenAI TTS z odpowiednim głosem dla języka
+    
+    Args:
+        text (str): Tekst do przetworzenia na mowę
+        language (str): Język (np. "English", "Polish")
+    
+    Returns:
+        bytes: Audio w formacie MP3
+    """
+    audio_bytes = synthesize_openai(text, language)
+    
     # Trackuj użycie TTS OpenAI
     add_tts_usage(len(text), "openai")
     
     return audio_bytes
 
-try:
-    from gtts import gTTS
-    GTTS_AVAILABLE = True
-except ImportError:
-    GTTS_AVAILABLE = False
+# gTTS importowany przy pierwszej syntezie
+GTTS_AVAILABLE = is_installed("gtts")
 
-def text_to_speech_gtts(text, language):
+from utils.local_tts import synthesize_local, is_local_tts_available
+LOCAL_TTS_AVAILABLE = is_local_tts_available()
+
+def synthesize_gtts(text, language):
     """
-    Generuje mowę z tekstu używając Google TTS (gTTS) - darmowe
+    Syntezuje mowę przez Google TTS (gTTS) bez zliczania użycia
     
     Args:
         text (str): Tekst do przetworzenia na mowę
@@ -286,13 +308,32 @@ def text_to_speech_gtts(text, language):
     
     lang_code = gtts_language_map.get(language, "en")
     
+    tts = optional_import("gtts").gTTS(text=text, lang=lang_code) # type: ignore
+    with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as tmpfile, track_latency("tts", "gtts"):
+        # gTTS łączy się z Google dopiero przy zapisie
+        tts.save(tmpfile.name)
+        tmpfile.flush()
+        with open(tmpfile.name, "rb") as audio_file:
+            audio_bytes = audio_file.read()
+    
+    return audio_bytes
+
+def text_to_speech_gtts(text, language):
+    """
+    Generuje mowę z tekstu używając Google TTS (gTTS) - darmowe
+    
+    Args:
+        text (str): Tekst do przetworzenia na mowę
+        language (str): Język w polskiej nazwie (np. "angielski", "polski")
+    
+    Returns:
+        bytes: Audio w formacie MP3
+    """
+    if not GTTS_AVAILABLE:
+        raise ImportError("gTTS nie jest zainstalowane. Zainstaluj: pip install gtts")
+    
     try:
-        tts = gTTS(text=text, lang=lang_code) # type: ignore
-        with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as tmpfile:
-            tts.save(tmpfile.name)
-            tmpfile.flush()
-            with open(tmpfile.name, "rb") as audio_file:
-                audio_bytes = audio_file.read()
+        audio_bytes = synthesize_gtts(text, language)
         
         # Trackuj użycie gTTS (darmowe)
         add_tts_usage(len(text), "gtts")
@@ -301,6 +342,53 @@ def text_to_speech_gtts(text, language):
     except Exception as e:
         raise Exception(f"Błąd gTTS: {e}")
 
+# Dostawcy TTS dla dyspozytora (hedging i fallback) - nazwy z sidebaru → klucze dostawców
+TTS_PROVIDER_KEYS = {
+    "OpenAI TTS": "openai",
+    "gTTS (Google)": "gtts",
+    "Lokalny TTS (offline)": "local",
+}
+TTS_PROVIDER_LABELS = {key: label for label, key in TTS_PROVIDER_KEYS.items()}
+# OpenAI TTS pozostaje zarejestrowane - dyspozytor dostaje je tylko, gdy oferuje je sidebar
+TTS_FALLBACK_ORDER = ["local", "gtts", "openai"]
+
+register_tts_provider("openai", synthesize_openai)
+if GTTS_AVAILABLE:
+    register_tts_provider("gtts", synthesize_gtts)
+if LOCAL_TTS_AVAILABLE:
+    register_tts_provider("local", synthesize_local)
+
+def get_audio_mime(audio_bytes):
+    """Typ MIME audio dla st.audio - lokalny TTS zwraca WAV, dostawcy sieciowi MP3"""
+    if audio_bytes[:4] == b"RIFF":
+        return "audio/wav"
+    return "audio/mp3"
+
+def get_tts_providers():
+    """
+    Kolejność dostawców TTS: wybrany w sidebarze, potem zapasowi (jeśli fallback włączony)
+    
+    Tylko dostawcy oferowani w sidebarze (get_tts_options) - fallback i hedging nie
+    mogą sięgnąć po dostawcę, którego użytkownik nie może wybrać (np. płatne OpenAI TTS).
+    
+    Returns:
+        list[str]: Klucze dostawców ("openai", "gtts", "local"); pusta, gdy żaden nie jest dostępny
+    """
+    registered = get_registered_providers()
+    offered = [TTS_PROVIDER_KEYS[label] for label in get_tts_options()]
+    offered = [name for name in offered if name in registered]
+    if not offered:
+        return []
+    
+    provider_key = TTS_PROVIDER_KEYS.get(st.session_state.get("tts_provider"))
+    if provider_key not in offered:
+        provider_key = offered[0]
+    
+    providers = [provider_key]
+    if st.session_state.get("tts_fallback_enabled", True):
+        providers += [name for name in TTS_FALLBACK_ORDER if name != provider_key and name in offered]
+    return providers
+
 def text_to_speech(text, language):
     """
     Uniwersalna funkcja TTS - używa wybranego przez użytkownika dostawcy
@@ -310,42 +398,69 @@ def text_to_speech(text, language):
         language (str): Język w polskiej nazwie (np. "angielski", "polski")
     
     Returns:
-        bytes: Audio w formacie MP3
+        bytes | None: Audio w formacie MP3 (WAV dla lokalnego TTS - patrz get_audio_mime);
+        None, gdy nie ma żadnego dostępnego dostawcy (komunikat wyświetlony przez st.error)
     """
-    # Inicjalizuj wybór TTS jeśli nie istnieje
-    if "tts_provider" not in st.session_state:
-        st.session_state.tts_provider = "OpenAI TTS"
+    providers = get_tts_providers()
+    if not providers:
+        # OpenAI TTS nie jest oferowane - bez gTTS i lokalnego TTS nie ma czym syntezować
+        st.error("❌ Brak dostępnego dostawcy TTS. Zainstaluj gTTS (pip install gtts) lub lokalny TTS.")
+        return None
     
-    provider = st.session_state.get("tts_provider", "OpenAI TTS")
+    # Najpierw sprawdź cache audio (np. wypełniony wcześniej przez utils/audio_pregen.py)
+    cached_audio = find_cached_audio(text, language, providers)
+    if cached_audio is not None:
+        return cached_audio
     
-    if provider == "gTTS (Google)" and GTTS_AVAILABLE:
-        return text_to_speech_gtts(text, language)
-    else:
-        return text_to_speech_openai(text, language)
+    # Rozliczany zwycięzca i przegrany w hedgingu, który zdążył zsyntezować audio (nie anulowany)
+    result = dispatch_tts(
+        text, language, providers, hedge=len(providers) > 1,
+        on_complete=lambda name: add_tts_usage(len(text), name),
+    )
+    
+    if result.fell_back or result.hedged:
+        notice = f"🛟 TTS: odpowiedział {TTS_PROVIDER_LABELS.get(result.provider, result.provider)}"
+        if result.errors:
+            notice += " (błąd: " + ", ".join(TTS_PROVIDER_LABELS.get(name, name) for name in result.errors) + ")"
+        elif result.hedged:
+            notice += " (zapytanie zabezpieczające)"
+        st.session_state["tts_last_fallback"] = notice
+        if result.fell_back:
+            st.toast(notice)
+    
+    save_cached_audio(text, language, result.provider, result.audio_bytes)
+    return result.audio_bytes
 
 def transcribe_audio(audio_file, language_code="en"):
-    """Transkrybuje plik audio używając OpenAI Whisper"""
-    transcription = client.audio.transcriptions.create(
-        model="whisper-1",
-        file=audio_file,
-        language=language_code
-    )
+    """Transkrybuje audio backendem ASR wdrożenia (krotka (nazwa, bajty, typ)) lub OpenAI Whisper (plik)"""
+    if isinstance(audio_file, tuple):
+        return get_asr_backend().transcribe(audio_file, language_code)
+    with track_latency("asr", "whisper-1"):
+        transcription = client.audio.transcriptions.create(
+            model="whisper-1",
+            file=audio_file,
+            language=language_code
+        )
     return transcription.text
 
-def show_recording_interface(language_in, session_key_prefix=""):
+def show_recording_interface(language_in, session_key_prefix="", streaming=True):
     """
     Wyświetla interfejs nagrywania z przyciskami start/stop (sounddevice)
     
     Args:
         language_in (str): Język wejściowy (np. "English", "Polish")
         session_key_prefix (str): Prefiks dla kluczy session_state (aby uniknąć kolizji między modułami)
+        streaming (bool): Nagrywanie strumieniowe z transkrypcją w trakcie mówienia
     
     Returns:
         str: Rozpoznany tekst lub pusty string jeśli brak nagrania
     """
-    if not AUDIO_AVAILABLE:
+    if not audio_available():
         st.warning("🎤 Nagrywanie niedostępne w tym środowisku")
         return ""
+    
+    if streaming and STREAMING_AVAILABLE:
+        return show_streaming_recording_interface(language_in, session_key_prefix)
 
     language_in_code = language_code_map.get(language_in, "en")
 
@@ -368,9 +483,10 @@ def show_recording_interface(language_in, session_key_prefix=""):
     # UI
     if not st.session_state[is_recording_key]:
         if st.button("🎤 Rozpocznij nagrywanie", key=f"{session_key_prefix}start_btn"):
-            if not AUDIO_AVAILABLE:
+            if not audio_available():
                 st.error("❌ Funkcja nagrywania niedostępna w tym środowisku")
                 return ""
+            sd = optional_import("sounddevice")
             st.session_state[is_recording_key] = True
             st.session_state[recording_start_time_key] = time.time()
             fs = 16000
@@ -383,6 +499,8 @@ def show_recording_interface(language_in, session_key_prefix=""):
         if st.button("⏹️ Zatrzymaj i przetwórz", key=f"{session_key_prefix}stop_btn"):
             st.session_state[is_recording_key] = False
             try:
+                sd = optional_import("sounddevice")
+                wavfile = optional_import("scipy.io.wavfile")
                 sd.stop()
                 duration = time.time() - st.session_state[recording_start_time_key]
                 duration = max(1.0, min(duration, 30.0))
@@ -390,12 +508,10 @@ def show_recording_interface(language_in, session_key_prefix=""):
                 samples = int(duration * fs)
                 recording = st.session_state[recording_data_key][:samples]
                 st.success("⏹️ Zakończono nagrywanie. Przetwarzam...")
-                with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmpfile:
-                    wavfile.write(tmpfile.name, fs, recording)
-                    tmpfile.flush()
-                    with open(tmpfile.name, "rb") as file:
-                        recognized_text = transcribe_audio(file, language_in_code)
-                add_whisper_usage(duration)
+                # WAV w pamięci - bez plików tymczasowych na dysku
+                wav_buffer = io.BytesIO()
+                wavfile.write(wav_buffer, fs, recording)
+                recognized_text = transcribe_recording(wav_buffer.getvalue(), language_in_code)
                 st.session_state[recognized_text_key] = recognized_text
                 st.session_state[recording_data_key] = None
                 st.rerun()
@@ -0,0 +1,147 @@
+"""
+Budżet czasu importu przy starcie aplikacji (pomiar przez python -X importtime)
+
+Uruchamia świeży interpreter, importuje moduły ładowane przez app.py przed
+wyświetleniem pierwszej strony i sumuje ich czas. Streamlit jest importowany
+wcześniej i mierzony osobno - jego koszt nie zależy od kodu aplikacji.
+Zwraca kod 1, gdy najlepszy z pomiarów przekracza budżet albo gdy przy starcie
+zaimportował się moduł, który powinien być ładowany leniwie (LAZY_MODULES).
+
+Zapisany pomiar wzorcowy (BASELINE_FILE) trzymamy w repozytorium - jego budżet
+sprawdza tests/test_import_budget.py, więc regresja czasu startu psuje testy.
+
+Użycie:
+    python -m utils.import_budget
+    python -m utils.import_budget --budget-ms 600 --runs 5 --record base/import_budget.json
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+# Moduły importowane przez app.py przed wyświetleniem strony
+STARTUP_MODULES = [
+    "utils.background_styles",
+    "utils.config",
+    "utils.ai_stats",
+    "utils.tts_sidebar",
+    "utils.lazy_imports",
+    "utils.rerun_cpu",
+]
+# Nie mogą się pojawić przy starcie - ładowane przy pierwszym użyciu
+LAZY_MODULES = [
+    "openai", "dotenv", "gtts", "sounddevice", "scipy", "soundfile", "faster_whisper", "piper",
+    "modules.translator", "modules.belfer", "modules.dialog", "modules.vocabulary",
+]
+BASELINE_FILE = os.path.join("base", "import_budget.json")
+DEFAULT_BUDGET_MS = float(os.environ.get("IMPORT_BUDGET_MS", "1000"))
+REPORT_TOP = 15
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+def measure_once(modules=None):
+    """
+    Jeden pomiar w nowym procesie
+
+    Returns:
+        dict: streamlit_ms, startup_ms (suma czasów modułów aplikacji),
+        modules {nazwa: ms skumulowane} i imported (wszystkie moduły zaimportowane po streamlit)
+    """
+    modules = modules or STARTUP_MODULES
+    code = "import streamlit\n" + "".join(f"import {name}\n" for name in modules)
+    env = dict(os.environ)
+    # Bez klucza API moduły nie mogą prosić o niego w UI - pomiar ma być bez interakcji
+    env.setdefault("OPENAI_API_KEY", "sk-import-budget")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, env=env,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Import nie powiódł się:\n{result.stderr[-2000:]}")
+
+    streamlit_ms = 0.0
+    after_streamlit = False
+    top_level = {}
+    imported = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+        cumulative_ms = int(match.group(2)) / 1000.0
+        depth = len(match.group(3)) - 1
+        name = match.group(4)
+        if not after_streamlit:
+            # Zagnieżdżone importy są wypisywane przed rodzicem - linia "streamlit" zamyka jego drzewo
+            if depth == 0 and name == "streamlit":
+                streamlit_ms = cumulative_ms
+                after_streamlit = True
+            continue
+        imported.append(name)
+        if depth == 0:
+            top_level[name] = cumulative_ms
+    return {
+        "streamlit_ms": streamlit_ms,
+        "startup_ms": sum(top_level.values()),
+        "modules": top_level,
+        "imported": imported,
+    }
+
+def load_baseline(path=None):
+    """
+    Zapisany pomiar wzorcowy (--record) lub None, gdy go brak
+
+    Returns:
+        dict | None: streamlit_ms, startup_ms, modules, budget_ms, eager, python
+    """
+    path = path or os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), BASELINE_FILE)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def find_eager_imports(imported):
+    """Moduły z LAZY_MODULES (lub ich podmoduły) zaimportowane przy starcie"""
+    return sorted({
+        name for name in imported
+        for lazy in LAZY_MODULES
+        if name == lazy or name.startswith(lazy + ".")
+    })
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Budżet czasu importu przy starcie aplikacji")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="Dopuszczalny czas importu modułów aplikacji (bez streamlit)")
+    parser.add_argument("--runs", type=int, default=3, help="Liczba pomiarów (liczy się najlepszy)")
+    parser.add_argument("--record", help="Zapisz wynik pomiaru do pliku JSON")
+    args = parser.parse_args(argv)
+
+    measurements = [measure_once() for _ in range(max(1, args.runs))]
+    best = min(measurements, key=lambda measurement: measurement["startup_ms"])
+
+    print(f"streamlit: {best['streamlit_ms']:.0f} ms (poza budżetem)")
+    print(f"moduły aplikacji: {best['startup_ms']:.0f} ms / budżet {args.budget_ms:.0f} ms")
+    for name, ms in sorted(best["modules"].items(), key=lambda item: -item[1])[:REPORT_TOP]:
+        print(f"  {ms:8.1f} ms  {name}")
+
+    eager = find_eager_imports(best["imported"])
+    if eager:
+        print("Moduły ładowane przy starcie zamiast leniwie: " + ", ".join(eager))
+
+    if args.record:
+        record = dict(best, budget_ms=args.budget_ms, eager=eager, python=sys.version.split()[0])
+        record.pop("imported")
+        with open(args.record, "w", encoding="utf-8") as f:
+            json.dump(record, f, ensure_ascii=False, indent=2)
+
+    over_budget = best["startup_ms"] > args.budget_ms
+    if over_budget:
+        print(f"❌ Przekroczony budżet importu o {best['startup_ms'] - args.budget_ms:.0f} ms")
+    return 1 if over_budget or eager else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,77 @@
+"""
+Histogramy opóźnień wywołań AI, TTS i ASR
+
+Histogram w stylu HDR: kubełki logarytmiczne, LATENCY_SUB_BUCKETS na każde
+podwojenie czasu (błąd względny percentyla ~9%), liczniki w kubełkach i
+maksimum. Kubełki z różnych procesów i dni po prostu się sumuje, więc
+histogram jest zapisywany razem ze statystykami użycia (usage_store).
+"""
+
+import math
+import time
+from contextlib import contextmanager
+
+LATENCY_SUB_BUCKETS = 8      # kubełki na podwojenie - granice co 2^(1/8) ≈ 9%
+LATENCY_PERCENTILES = (50, 95, 99)
+
+def latency_bucket(latency_ms):
+    """Numer kubełka dla opóźnienia w ms (kubełek 0 - do 1 ms)"""
+    if latency_ms <= 1.0:
+        return 0
+    return math.ceil(math.log2(latency_ms) * LATENCY_SUB_BUCKETS)
+
+def bucket_upper_ms(bucket):
+    """Górna granica kubełka w ms"""
+    return 2 ** (bucket / LATENCY_SUB_BUCKETS)
+
+def summarize_histogram(buckets, max_ms):
+    """
+    Percentyle z histogramu (górna granica kubełka, nie więcej niż maksimum)
+
+    Args:
+        buckets (dict[int, int]): Kubełek → liczba wywołań
+        max_ms (float): Najdłuższe zmierzone wywołanie
+
+    Returns:
+        dict: count, p50, p95, p99, max (ms)
+    """
+    count = sum(buckets.values())
+    summary = {"count": count, "max": max_ms}
+    ordered = sorted(buckets.items())
+    for percentile in LATENCY_PERCENTILES:
+        rank = max(1, math.ceil(percentile / 100.0 * count))
+        seen = 0
+        value = 0.0
+        for bucket, bucket_count in ordered:
+            seen += bucket_count
+            if seen >= rank:
+                value = bucket_upper_ms(bucket)
+                break
+        summary[f"p{percentile}"] = min(value, max_ms) if count else 0.0
+    return summary
+
+class LatencyTimer:
+    """Wynik track_latency - czas trwania w ms dostępny po wyjściu z bloku"""
+
+    def __init__(self):
+        self.ms = None
+
+@contextmanager
+def track_latency(module, model):
+    """
+    Mierzy czas bloku i zapisuje go w histogramie (module, model) - także gdy blok rzuci wyjątek
+
+    Przykład:
+        with track_latency("belfer", get_model()) as timer:
+            response = client.chat.completions.create(...)
+        add_token_usage("belfer", ..., latency_ms=timer.ms)
+    """
+    from utils.ai_stats import record_latency
+
+    timer = LatencyTimer()
+    start = time.perf_counter()
+    try:
+        yield timer
+    finally:
+        timer.ms = (time.perf_counter() - start) * 1000.0
+        record_latency(module, model, timer.ms)
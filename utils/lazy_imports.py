@@ -0,0 +1,60 @@
+"""
+Leniwe importy ciężkich zależności opcjonalnych i modułów stron
+
+Pakiety takie jak gtts, sounddevice, scipy, soundfile, faster-whisper czy
+piper są importowane dopiero przy pierwszym użyciu, a nie przy starcie
+aplikacji. Dostępność sprawdza się tanio przez is_installed() (bez importu),
+a sam moduł pobiera przez optional_import() - wynik, także porażka, jest
+zapamiętywany na cały proces. Moduły stron (translator, belfer, ...) ładuje
+load_attribute(), gdy użytkownik pierwszy raz otworzy daną stronę.
+
+Budżet czasu importu przy starcie sprawdza: python -m utils.import_budget
+"""
+
+import importlib
+import importlib.util
+import threading
+
+# Wyjątki importu pakietów opcjonalnych: OSError - brak biblioteki systemowej
+# (PortAudio dla sounddevice, libsndfile dla soundfile)
+IMPORT_ERRORS = (ImportError, OSError)
+
+_modules = {}
+_lock = threading.Lock()
+
+def is_installed(module_name):
+    """Czy pakiet jest zainstalowany - bez importowania go (sprawdza tylko pakiet najwyższego poziomu)"""
+    top_level = module_name.split(".")[0]
+    try:
+        return importlib.util.find_spec(top_level) is not None
+    except (ImportError, ValueError):
+        return False
+
+def optional_import(module_name):
+    """
+    Importuje moduł opcjonalny przy pierwszym użyciu
+
+    Args:
+        module_name (str): Pełna nazwa modułu, np. "scipy.io.wavfile"
+
+    Returns:
+        module | None: Moduł lub None, gdy nie da się go zaimportować
+    """
+    if module_name in _modules:
+        return _modules[module_name]
+    with _lock:
+        if module_name not in _modules:
+            try:
+                _modules[module_name] = importlib.import_module(module_name)
+            except IMPORT_ERRORS:
+                _modules[module_name] = None
+        return _modules[module_name]
+
+def load_attribute(path):
+    """
+    Importuje moduł i zwraca jego atrybut, np. load_attribute("modules.translator:show_translator")
+
+    Błędy importu nie są tu łapane - moduły aplikacji muszą się ładować.
+    """
+    module_name, attribute = path.split(":")
+    return getattr(importlib.import_module(module_name), attribute)
@@ -0,0 +1,121 @@
+"""
+Lokalny (offline) TTS - Piper lub espeak-ng uruchamiane na serwerze
+
+Piper daje naturalniejsze głosy, ale wymaga modeli .onnx w katalogu
+PIPER_MODEL_DIR (domyślnie base/piper). espeak-ng działa od razu po
+instalacji pakietu systemowego i obsługuje wszystkie języki aplikacji.
+Oba silniki zwracają WAV w pamięci - bez sieci i bez kosztów.
+"""
+
+import io
+import os
+import shutil
+import subprocess
+import threading
+import wave
+
+from utils.latency import track_latency
+from utils.lazy_imports import is_installed, optional_import
+
+# Wymuszenie silnika: "piper", "espeak" lub puste (automatycznie: Piper jeśli jest model)
+LOCAL_TTS_ENGINE = os.environ.get("LOCAL_TTS_ENGINE", "").lower()
+PIPER_MODEL_DIR = os.environ.get("PIPER_MODEL_DIR", os.path.join("base", "piper"))
+ESPEAK_BINARY = shutil.which("espeak-ng") or shutil.which("espeak")
+ESPEAK_TIMEOUT = 10  # s
+
+# Głosy espeak-ng dla polskich nazw języków
+ESPEAK_VOICES = {
+    "angielski": "en",
+    "polski": "pl",
+    "niemiecki": "de",
+    "francuski": "fr",
+    "hiszpański": "es",
+    "włoski": "it"
+}
+
+# Modele Piper (pliki <nazwa>.onnx + <nazwa>.onnx.json w PIPER_MODEL_DIR)
+PIPER_VOICES = {
+    "angielski": "en_US-lessac-medium",
+    "polski": "pl_PL-gosia-medium",
+    "niemiecki": "de_DE-thorsten-medium",
+    "francuski": "fr_FR-siwis-medium",
+    "hiszpański": "es_ES-davefx-medium",
+    "włoski": "it_IT-riccardo-x_low"
+}
+
+# piper (onnxruntime) importowany dopiero przy ładowaniu pierwszego głosu
+PIPER_AVAILABLE = is_installed("piper")
+
+_piper_voices = {}
+_piper_lock = threading.Lock()
+
+def _piper_model_path(language):
+    model_name = PIPER_VOICES.get(language)
+    if not model_name:
+        return None
+    path = os.path.join(PIPER_MODEL_DIR, f"{model_name}.onnx")
+    return path if os.path.exists(path) else None
+
+def _use_piper(language):
+    if LOCAL_TTS_ENGINE == "espeak" or not PIPER_AVAILABLE:
+        return False
+    return _piper_model_path(language) is not None
+
+def is_local_tts_available():
+    """Czy na tej maszynie jest jakikolwiek lokalny silnik TTS"""
+    if LOCAL_TTS_ENGINE == "piper":
+        return PIPER_AVAILABLE and any(_piper_model_path(lang) for lang in PIPER_VOICES)
+    if LOCAL_TTS_ENGINE == "espeak":
+        return ESPEAK_BINARY is not None
+    return ESPEAK_BINARY is not None or (PIPER_AVAILABLE and any(_piper_model_path(lang) for lang in PIPER_VOICES))
+
+def _load_piper_voice(language):
+    """Ładuje model Piper raz na proces (ładowanie trwa dłużej niż sama synteza słowa)"""
+    with _piper_lock:
+        if language not in _piper_voices:
+            piper = optional_import("piper")
+            if piper is None:
+                raise RuntimeError("Nie udało się zaimportować piper-tts")
+            _piper_voices[language] = piper.PiperVoice.load(_piper_model_path(language))
+        return _piper_voices[language]
+
+def _synthesize_piper(text, language):
+    voice = _load_piper_voice(language)
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        # piper-tts >= 1.3 ma synthesize_wav, starsze wersje synthesize(text, wav_file)
+        if hasattr(voice, "synthesize_wav"):
+            voice.synthesize_wav(text, wav_file)
+        else:
+            voice.synthesize(text, wav_file)
+    return buffer.getvalue()
+
+def _synthesize_espeak(text, language):
+    if ESPEAK_BINARY is None:
+        raise RuntimeError("espeak-ng nie jest zainstalowany (apt install espeak-ng)")
+    # Tekst przez stdin - bez problemów z cudzysłowami i tekstem zaczynającym się od "-"
+    result = subprocess.run(
+        [ESPEAK_BINARY, "-v", ESPEAK_VOICES.get(language, "en"), "--stdout"],
+        input=text.encode("utf-8"),
+        capture_output=True,
+        timeout=ESPEAK_TIMEOUT,
+        check=True,
+    )
+    return result.stdout
+
+def synthesize_local(text, language):
+    """
+    Syntezuje mowę lokalnym silnikiem (Piper lub espeak-ng)
+
+    Args:
+        text (str): Tekst do przetworzenia na mowę
+        language (str): Język w polskiej nazwie (np. "angielski", "polski")
+
+    Returns:
+        bytes: Audio w formacie WAV
+    """
+    if _use_piper(language):
+        with track_latency("tts", "piper"):
+            return _synthesize_piper(text, language)
+    with track_latency("tts", "espeak-ng"):
+        return _synthesize_espeak(text, language)
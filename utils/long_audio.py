@@ -0,0 +1,136 @@
+"""
+Transkrypcja długich nagrań we fragmentach transkrybowanych równolegle
+
+Długie nagranie (powyżej LONG_AUDIO_SECONDS) jest cięte w najcichszych
+miejscach na okna po ok. WINDOW_SECONDS z niewielką zakładką, okna są
+transkrybowane równolegle (najwyżej LONG_AUDIO_WORKERS naraz), a teksty
+sklejane z usunięciem słów powtórzonych w zakładce. Czas oczekiwania
+zbliża się do czasu najdłuższego fragmentu, a żaden upload nie zbliża się
+do limitu rozmiaru pliku Whisper.
+"""
+
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.openai_client import bind_api_key
+from utils.audio_preprocess import (
+    NUMPY_AVAILABLE, TARGET_SAMPLE_RATE, VAD_FRAME_MS,
+    get_wav_duration, load_speech_mono, encode_for_upload,
+)
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+LONG_AUDIO_SECONDS = float(os.environ.get("LONG_AUDIO_SECONDS", "120"))
+LONG_AUDIO_WORKERS = int(os.environ.get("LONG_AUDIO_WORKERS", "4"))
+WINDOW_SECONDS = 60.0        # docelowa długość okna
+CUT_SEARCH_SECONDS = 10.0    # cięcie w najcichszej ramce z ostatnich 10 s okna
+OVERLAP_SECONDS = 1.0        # zakładka po obu stronach cięcia
+STITCH_MAX_WORDS = 30        # najdłuższa szukana powtórka na styku fragmentów
+STITCH_MAX_OFFSET = 2        # słowa ucięte w pół na początku fragmentu
+
+def needs_long_audio_mode(audio_bytes):
+    """Czy nagranie jest na tyle długie, że opłaca się je dzielić"""
+    return get_wav_duration(audio_bytes) > LONG_AUDIO_SECONDS
+
+def find_cut_points(mono, rate=TARGET_SAMPLE_RATE):
+    """
+    Wyznacza miejsca cięcia w najcichszych ramkach przy końcu kolejnych okien
+
+    Returns:
+        list[int]: Indeksy próbek od 0 do len(mono) włącznie
+    """
+    frame = max(1, rate * VAD_FRAME_MS // 1000)
+    frame_count = len(mono) // frame
+    energies = np.sqrt(np.mean(mono[:frame_count * frame].reshape(frame_count, frame) ** 2, axis=1))
+
+    window = int(WINDOW_SECONDS * rate)
+    search = int(CUT_SEARCH_SECONDS * rate)
+    cuts = [0]
+    while len(mono) - cuts[-1] > window + search:
+        first = (cuts[-1] + window - search) // frame
+        last = (cuts[-1] + window) // frame
+        quietest = first + int(np.argmin(energies[first:last]))
+        # Środek najcichszej ramki - nie tniemy w połowie słowa
+        cuts.append(quietest * frame + frame // 2)
+    cuts.append(len(mono))
+    return cuts
+
+def split_windows(mono, rate=TARGET_SAMPLE_RATE):
+    """Dzieli nagranie na okna (start, koniec) z zakładką wokół każdego cięcia"""
+    overlap = int(OVERLAP_SECONDS * rate)
+    cuts = find_cut_points(mono, rate)
+    return [
+        (max(0, start - overlap), min(len(mono), end + overlap))
+        for start, end in zip(cuts, cuts[1:])
+    ]
+
+def _normalize(word):
+    return re.sub(r"[^\w']", "", word.lower())
+
+def stitch_texts(texts):
+    """
+    Skleja teksty kolejnych fragmentów, usuwając słowa powtórzone w zakładce
+
+    Szuka najdłuższego końca poprzedniego tekstu, który występuje na początku
+    następnego (z przesunięciem do STITCH_MAX_OFFSET słów uciętych w pół).
+    """
+    words = []
+    for text in texts:
+        next_words = text.split()
+        if not next_words:
+            continue
+        tail = [_normalize(word) for word in words[-STITCH_MAX_WORDS:]]
+        head = [_normalize(word) for word in next_words[:STITCH_MAX_WORDS + STITCH_MAX_OFFSET]]
+        skip = 0
+        for length in range(min(len(tail), len(head)), 0, -1):
+            matches = [
+                offset for offset in range(STITCH_MAX_OFFSET + 1)
+                if head[offset:offset + length] == tail[-length:]
+            ]
+            if matches:
+                skip = matches[0] + length
+                break
+        words.extend(next_words[skip:])
+    return " ".join(words)
+
+def transcribe_long_audio(audio_bytes, language_code, backend, task="transcribe"):
+    """
+    Transkrybuje długie nagranie we fragmentach - bez zapisu statystyk (wątki robocze)
+
+    Args:
+        audio_bytes (bytes): Nagranie WAV
+        language_code (str): Kod języka (en, pl, de, etc.)
+        backend (ASRBackend): Backend transkrypcji
+        task (str): "transcribe" albo "translate" (na angielski)
+
+    Returns:
+        tuple[str, dict] | None: tekst i statystyki w formacie preprocess_for_whisper
+        (processed_seconds to suma okien z zakładkami) lub None, gdy nagranie
+        nie nadaje się do cięcia (brak numpy, nie-PCM)
+    """
+    mono = load_speech_mono(audio_bytes)
+    if mono is None:
+        return None
+
+    windows = split_windows(mono)
+    uploads = []
+    for start, end in windows:
+        data, filename, mime = encode_for_upload(mono[start:end])
+        # backend.run przyjmuje krotkę jak pole pliku w openai: (nazwa, dane, typ)
+        uploads.append((filename, data, mime))
+    workers = max(1, min(LONG_AUDIO_WORKERS, len(uploads)))
+    # Klucz API ustalony w wątku wywołującym - okna transkrybują wątki robocze
+    run = bind_api_key(lambda upload: backend.run(upload, language_code, task))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="asr-long") as executor:
+        # map zachowuje kolejność okien; wyjątek dowolnego fragmentu przerywa całość
+        texts = list(executor.map(run, uploads))
+
+    info = {
+        "original_bytes": len(audio_bytes),
+        "processed_bytes": sum(len(data) for _, data, _ in uploads),
+        "original_seconds": get_wav_duration(audio_bytes),
+        "processed_seconds": sum(end - start for start, end in windows) / float(TARGET_SAMPLE_RATE),
+    }
+    return stitch_texts(texts), info
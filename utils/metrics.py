@@ -0,0 +1,188 @@
+"""
+Rejestr metryk procesu w formacie OpenMetrics
+
+Liczniki zapytań, tokenów, trafień cache, ponowień i znaków TTS oraz
+histogramy opóźnień - zasilane z tych samych miejsc co statystyki użycia
+(add_token_usage, add_tts_usage, record_latency) - oraz czas CPU przebiegów
+skryptu (utils/rerun_cpu.py). Eksport włącza się
+zmiennymi środowiskowymi:
+- METRICS_PORT     - serwer HTTP na 127.0.0.1:<port>/metrics
+- METRICS_TEXTFILE - plik tekstowy nadpisywany co METRICS_TEXTFILE_SECONDS
+  (np. dla textfile collectora node_exportera)
+Bez nich rejestr tylko liczy w pamięci - koszt to słownik i blokada.
+"""
+
+import os
+import tempfile
+import threading
+import time
+
+METRICS_PORT = int(os.environ.get("METRICS_PORT", "0"))
+METRICS_HOST = os.environ.get("METRICS_HOST", "127.0.0.1")
+METRICS_TEXTFILE = os.environ.get("METRICS_TEXTFILE", "")
+METRICS_TEXTFILE_SECONDS = float(os.environ.get("METRICS_TEXTFILE_SECONDS", "15"))
+METRICS_PREFIX = "language_helper"
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+# Granice kubełków opóźnień w sekundach (wywołania API trwają od ułamków sekundy do minut)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Histogramy z innymi granicami kubełków (domyślnie LATENCY_BUCKETS)
+BUCKETS = {
+    # Przebieg skryptu Streamlit to milisekundy CPU, nie sekundy oczekiwania na API
+    "rerun_cpu_seconds": (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+}
+
+# nazwa → (typ, opis, etykiety)
+METRICS = {
+    "requests": ("counter", "Wywołania API AI, TTS i ASR", ("module", "model")),
+    "tokens": ("counter", "Tokeny modeli językowych", ("module", "model", "kind")),
+    "cache_hits": ("counter", "Trafienia cache", ("cache",)),
+    "cache_misses": ("counter", "Chybienia cache", ("cache",)),
+    "retries": ("counter", "Ponowne próby i zapytania zabezpieczające", ("operation", "reason")),
+    "tts_chars": ("counter", "Znaki wysłane do syntezy mowy", ("provider",)),
+    "request_latency_seconds": ("histogram", "Czas wywołań API AI, TTS i ASR", ("module", "model")),
+    "rerun_cpu_seconds": ("histogram", "Czas CPU przebiegu skryptu Streamlit (pełnego lub fragmentu)", ("scope",)),
+}
+
+_lock = threading.Lock()
+_counters = {}      # (nazwa, etykiety) → wartość
+_histograms = {}    # (nazwa, etykiety) → [liczniki kubełków..., +Inf], suma
+_started_at = time.time()
+_exporter_started = False
+
+def _check(name, labels):
+    kind, _, label_names = METRICS[name]
+    if len(labels) != len(label_names):
+        raise ValueError(f"Metryka {name} wymaga etykiet {label_names}")
+    return kind
+
+def inc(name, *labels, amount=1):
+    """Zwiększa licznik, np. inc("tokens", "belfer", "gpt-4o-mini", "prompt", amount=120)"""
+    if _check(name, labels) != "counter":
+        raise ValueError(f"{name} nie jest licznikiem")
+    key = (name, tuple(str(label) for label in labels))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+    _start_exporter()
+
+def observe(name, *labels, value):
+    """Dodaje obserwację (w sekundach) do histogramu"""
+    if _check(name, labels) != "histogram":
+        raise ValueError(f"{name} nie jest histogramem")
+    key = (name, tuple(str(label) for label in labels))
+    bounds = BUCKETS.get(name, LATENCY_BUCKETS)
+    with _lock:
+        histogram = _histograms.setdefault(key, [[0] * (len(bounds) + 1), 0.0])
+        for index, bound in enumerate(bounds):
+            if value <= bound:
+                histogram[0][index] += 1
+                break
+        else:
+            histogram[0][-1] += 1
+        histogram[1] += value
+    _start_exporter()
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(label_names, labels, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in list(zip(label_names, labels)) + list(extra)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+def render():
+    """
+    Aktualny stan rejestru w formacie OpenMetrics (tekst zakończony "# EOF")
+
+    Returns:
+        str: Ekspozycja wszystkich metryk
+    """
+    with _lock:
+        counters = dict(_counters)
+        histograms = {key: (list(buckets), total) for key, (buckets, total) in _histograms.items()}
+
+    lines = []
+    for name, (kind, help_text, label_names) in METRICS.items():
+        family = f"{METRICS_PREFIX}_{name}"
+        lines.append(f"# TYPE {family} {kind}")
+        lines.append(f"# HELP {family} {help_text}")
+        if kind == "counter":
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f"{family}_total{_format_labels(label_names, labels)} {_format_number(value)}")
+            continue
+        for (metric, labels), (buckets, total) in sorted(histograms.items()):
+            if metric != name:
+                continue
+            cumulative = 0
+            for bound, count in zip(BUCKETS.get(name, LATENCY_BUCKETS) + ("+Inf",), buckets):
+                cumulative += count
+                le = bound if bound == "+Inf" else repr(float(bound))
+                lines.append(f"{family}_bucket{_format_labels(label_names, labels, [('le', le)])} {cumulative}")
+            lines.append(f"{family}_count{_format_labels(label_names, labels)} {cumulative}")
+            lines.append(f"{family}_sum{_format_labels(label_names, labels)} {repr(float(total))}")
+    lines.append(f"# TYPE {METRICS_PREFIX}_process_start_time_seconds gauge")
+    lines.append(f"{METRICS_PREFIX}_process_start_time_seconds {_started_at}")
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+def write_textfile(path=None):
+    """Zapisuje ekspozycję do pliku atomowo (tymczasowy + os.replace) - kolektor nie czyta połowy pliku"""
+    path = path or METRICS_TEXTFILE
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(suffix=".part", dir=directory)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(render())
+    os.replace(tmp_path, path)
+
+def _serve_http():
+    # http.server importowany tylko, gdy eksport HTTP jest włączony - nie kosztuje przy starcie
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # Scrape co kilka sekund nie powinien zaśmiecać logów Streamlit
+            pass
+
+    try:
+        server = ThreadingHTTPServer((METRICS_HOST, METRICS_PORT), MetricsHandler)
+    except OSError:
+        # Port zajęty (np. drugi proces aplikacji) - zostaje eksport do pliku, jeśli ustawiony
+        return
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True, name="metrics-http").start()
+
+def _textfile_loop():
+    while True:
+        try:
+            write_textfile()
+        except OSError:
+            pass
+        time.sleep(METRICS_TEXTFILE_SECONDS)
+
+def _start_exporter():
+    """Uruchamia skonfigurowany eksport (raz na proces, przy pierwszej metryce)"""
+    global _exporter_started
+    if _exporter_started:
+        return
+    with _lock:
+        if _exporter_started:
+            return
+        _exporter_started = True
+    if METRICS_PORT:
+        _serve_http()
+    if METRICS_TEXTFILE:
+        threading.Thread(target=_textfile_loop, daemon=True, name="metrics-textfile").start()
@@ -0,0 +1,106 @@
+"""
+Klienci OpenAI tworzeni leniwie - jeden na klucz API, przy pierwszym użyciu
+
+Import modułu nie dotyka sieci ani UI Streamlit, więc handlery AI, zadania
+wsadowe i benchmarki mogą go importować bez działającej aplikacji. Klucz API
+pochodzi ze zmiennej OPENAI_API_KEY, pliku .env, a w aplikacji także z klucza
+wpisanego przez użytkownika (load_environment w utils/config.py zapisuje go w
+session_state). Klienci są trzymani osobno dla każdego klucza, więc klucz
+wpisany w jednej sesji nie zmienia klienta innych sesji. Obiekt `client`
+przekierowuje wywołania do get_client(), więc dotychczasowe
+`from utils.config import client` działa bez zmian.
+
+Wątki robocze nie widzą session_state - funkcję uruchamianą w wątku opakowuje
+się w wątku skryptu przez bind_api_key(), który przekazuje jej klucz sesji.
+"""
+
+import functools
+import os
+import threading
+
+ENV_FILE = ".env"
+
+_clients = {}               # klucz API → klient OpenAI
+_client_lock = threading.Lock()
+_bound = threading.local()  # klucz przekazany wątkowi roboczemu przez bind_api_key
+
+def _session_api_key():
+    """Klucz z session_state - tylko w wątku skryptu Streamlit (poza nim brak sesji)"""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return None
+    if get_script_run_ctx(suppress_warning=True) is None:
+        return None
+    import streamlit as st
+    return st.session_state.get("openai_api_key")
+
+def get_api_key():
+    """
+    Klucz API OpenAI bez żadnych elementów UI
+
+    Returns:
+        str | None: Klucz przekazany wątkowi (bind_api_key), ze zmiennej środowiskowej,
+        pliku .env lub session_state
+    """
+    api_key = getattr(_bound, "api_key", None)
+    if api_key:
+        return api_key
+    api_key = os.environ.get("OPENAI_API_KEY")
+    if not api_key and os.path.exists(ENV_FILE):
+        from dotenv import dotenv_values
+        api_key = dotenv_values(ENV_FILE).get("OPENAI_API_KEY")
+    return api_key or _session_api_key()
+
+def get_client(api_key=None):
+    """
+    Klient OpenAI dla klucza (pula połączeń HTTP współdzielona przez sesje z tym samym kluczem)
+
+    Args:
+        api_key (str | None): Klucz API - domyślnie get_api_key()
+
+    Raises:
+        RuntimeError: Gdy nie ma klucza API
+    """
+    api_key = api_key or get_api_key()
+    if not api_key:
+        raise RuntimeError("Brak klucza API OpenAI (OPENAI_API_KEY lub plik .env)")
+    client = _clients.get(api_key)
+    if client is None:
+        with _client_lock:
+            client = _clients.get(api_key)
+            if client is None:
+                from openai import OpenAI
+                client = _clients[api_key] = OpenAI(api_key=api_key)
+    return client
+
+def bind_api_key(func, api_key=None):
+    """
+    Opakowuje funkcję dla wątku roboczego - klucz API jest ustalany teraz (w wątku skryptu)
+
+    Usage:
+        executor.submit(bind_api_key(transcribe_upload), audio_bytes, language_code)
+    """
+    api_key = api_key or get_api_key()
+
+    @functools.wraps(func)
+    def bound(*args, **kwargs):
+        previous = getattr(_bound, "api_key", None)
+        _bound.api_key = api_key
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _bound.api_key = previous
+    return bound
+
+class LazyClient:
+    """Zastępca klienta OpenAI - atrybuty (chat, audio, ...) pobiera z get_client() przy użyciu"""
+
+    def __getattr__(self, name):
+        return getattr(get_client(), name)
+
+    def __bool__(self):
+        # `if not client:` sprawdza, czy da się utworzyć klienta - bez tworzenia go
+        return bool(get_api_key())
+
+client = LazyClient()
@@ -0,0 +1,61 @@
+"""
+Fragmenty Streamlit z pomiarem kosztu CPU każdego przebiegu
+
+Kliknięcie przycisku w fragmencie (st.fragment) wykonuje ponownie tylko ten
+fragment, a nie cały app.py (sidebar, style, wszystkie zakładki). Żeby
+porównać koszt interakcji przed i po podziale na fragmenty, pełny przebieg
+(measure_run("app") w app.py) i każdy fragment mierzą czas CPU swojego wątku -
+time.thread_time() nie liczy innych sesji obsługiwanych w tym czasie. Wynik
+trafia do histogramu rerun_cpu_seconds{scope} (utils/metrics.py), a przy
+RERUN_CPU_LOG=1 także do logu serwera. Czas pełnego przebiegu obejmuje
+fragmenty wykonane w jego trakcie.
+"""
+
+import functools
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+import streamlit as st
+
+from utils import metrics
+
+RERUN_CPU_LOG = os.environ.get("RERUN_CPU_LOG", "") not in ("", "0")
+
+@contextmanager
+def measure_run(scope):
+    """
+    Mierzy czas CPU przebiegu - także przerwanego przez st.rerun() lub st.stop()
+
+    Args:
+        scope (str): "app" dla pełnego przebiegu lub nazwa fragmentu
+    """
+    cpu_start, wall_start = time.thread_time(), time.perf_counter()
+    try:
+        yield
+    finally:
+        cpu = time.thread_time() - cpu_start
+        metrics.observe("rerun_cpu_seconds", scope, value=cpu)
+        if RERUN_CPU_LOG:
+            # Czas zegarowy obejmuje też oczekiwanie na API - CPU to koszt serwera
+            wall = time.perf_counter() - wall_start
+            print(f"[rerun] {scope}: CPU {cpu * 1000:.1f} ms, czas {wall * 1000:.1f} ms", file=sys.stderr)
+
+def fragment(scope):
+    """
+    st.fragment z pomiarem measure_run(scope)
+
+    Usage:
+        @fragment("review_card")
+        def _show_review_card(lang_pair, language_in, language_out):
+            ...
+            st.rerun(scope="fragment")   # po zmianie stanu - tylko ten fragment
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def measured(*args, **kwargs):
+            with measure_run(scope):
+                return func(*args, **kwargs)
+        return st.fragment(measured)
+    return decorator
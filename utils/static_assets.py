@@ -0,0 +1,96 @@
+"""
+Obrazy serwowane jako pliki statyczne Streamlit zamiast base64 w CSS
+
+Streamlit (server.enableStaticServing) udostępnia katalog static/ pod adresem
+app/static/. Warianty obrazów trafiają do static/assets/ z hashem treści
+źródła w nazwie, więc adres zmienia się tylko przy zmianie obrazka, a
+przeglądarka trzyma plik w cache (parametr ?v= włącza w serwerze Tornado
+nagłówek Cache-Control na 10 lat). Warianty są generowane raz - przy
+kolejnych startach wystarczy sprawdzić, że pliki istnieją.
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+
+try:
+    from PIL import Image, features
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+STATIC_DIR = "static"
+ASSETS_DIR = os.path.join(STATIC_DIR, "assets")
+STATIC_URL = "app/static/assets"
+WEBP_QUALITY = 80
+
+def source_hash(path):
+    """Krótki hash treści pliku źródłowego (12 znaków sha256)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()[:12]
+
+def webp_available():
+    """Czy Pillow potrafi zapisywać WebP"""
+    return PIL_AVAILABLE and features.check("webp")
+
+def asset_url(filename, version):
+    """Adres pliku z katalogu static/assets z parametrem wersji (długi cache w przeglądarce)"""
+    return f"{STATIC_URL}/{filename}?v={version}"
+
+def _write_atomic(path, write):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(suffix=".part", dir=os.path.dirname(path))
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def build_image_variants(source_path, name, widths, lossless=False):
+    """
+    Tworzy warianty obrazu w kilku szerokościach (WebP, a bez Pillow/WebP - kopię oryginału)
+
+    Args:
+        source_path (str): Obraz źródłowy
+        name (str): Prefiks nazw plików (np. "background")
+        widths (tuple[int]): Docelowe szerokości w px - większe od oryginału są pomijane
+        lossless (bool): WebP bezstratny (np. logo z przezroczystością)
+
+    Returns:
+        tuple[str, list[tuple[int, str]]]: wersja (hash źródła) i lista (szerokość, adres URL)
+        od najmniejszej; szerokość 0 oznacza oryginał bez skalowania
+    """
+    version = source_hash(source_path)
+    if not webp_available():
+        extension = os.path.splitext(source_path)[1].lower()
+        filename = f"{name}-{version}{extension}"
+        target = os.path.join(ASSETS_DIR, filename)
+        if not os.path.exists(target):
+            _write_atomic(target, lambda tmp_path: shutil.copyfile(source_path, tmp_path))
+        return version, [(0, asset_url(filename, version))]
+
+    variants = []
+    with Image.open(source_path) as image:
+        image.load()
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+        original_width = image.width
+        targets = sorted({min(width, original_width) for width in widths})
+        for width in targets:
+            filename = f"{name}-{version}-{width}.webp"
+            target = os.path.join(ASSETS_DIR, filename)
+            if not os.path.exists(target):
+                height = max(1, round(image.height * width / original_width))
+                resized = image if width == original_width else image.resize((width, height), Image.LANCZOS)
+                _write_atomic(target, lambda tmp_path: resized.save(
+                    tmp_path, "WEBP", quality=WEBP_QUALITY, lossless=lossless, method=6
+                ))
+            variants.append((width, asset_url(filename, version)))
+    return version, variants
@@ -0,0 +1,254 @@
+"""
+Strumieniowe nagrywanie z mikrofonu (sounddevice) z transkrypcją w trakcie mówienia
+
+Callback strumienia wejściowego tylko kopiuje bloki audio do ograniczonej
+kolejki. Wątek segmentujący składa je w bufor o stałym rozmiarze i tnie
+mowę na fragmenty w miejscach pauz - każdy fragment od razu idzie do
+transkrypcji, więc tekst pojawia się na żywo, a po zatrzymaniu nagrania
+zostaje do rozpoznania najwyżej ostatni fragment.
+"""
+
+import io
+import queue
+import threading
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import streamlit as st
+
+from utils.audio_preprocess import NUMPY_AVAILABLE
+from utils.lazy_imports import is_installed, optional_import
+from utils.openai_client import bind_api_key
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+# sounddevice importowany przy starcie nagrania (brak PortAudio wyjdzie wtedy jako błąd importu)
+STREAMING_AVAILABLE = NUMPY_AVAILABLE and is_installed("sounddevice")
+
+SAMPLE_RATE = 16000
+BLOCK_MS = 100                # długość bloku z callbacku
+QUEUE_MAX_BLOCKS = 50         # 5 s zapasu między callbackiem a segmentacją
+MAX_CHUNK_SECONDS = 15.0      # bufor fragmentu - twardy limit pamięci na nagranie
+MIN_CHUNK_SECONDS = 1.0       # krótszych fragmentów nie tniemy na pauzie
+PAUSE_MS = 600                # pauza, po której fragment idzie do transkrypcji
+SILENCE_RMS = 400             # próg ciszy dla próbek int16 (~ -38 dBFS)
+TRANSCRIBE_WORKERS = 2
+
+
+def _pcm_to_wav(samples, samplerate):
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(samplerate)
+        wav.writeframes(samples.astype("<i2").tobytes())
+    return buffer.getvalue()
+
+
+class StreamingRecorder:
+    """
+    Nagrywanie strumieniowe z cięciem na pauzach i równoległą transkrypcją fragmentów
+    """
+
+    def __init__(self, language_code, samplerate=SAMPLE_RATE):
+        self.language_code = language_code
+        self.samplerate = samplerate
+        self.block_size = samplerate * BLOCK_MS // 1000
+        self.started_at = None
+        self.dropped_blocks = 0
+        self.errors = []
+
+        self._blocks = queue.Queue(maxsize=QUEUE_MAX_BLOCKS)
+        self._chunk = np.zeros(int(MAX_CHUNK_SECONDS * samplerate), dtype=np.int16)
+        self._chunk_length = 0
+        self._chunk_voiced = False
+        self._silent_ms = 0.0
+
+        self._texts = {}
+        self._usage = []
+        self._futures = []
+        self._next_index = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=TRANSCRIBE_WORKERS, thread_name_prefix="asr")
+        # Fragmenty zleca wątek cięcia - klucz API sesji ustalamy tu, w wątku skryptu
+        self._transcribe = bind_api_key(self._transcribe_chunk)
+        self._running = False
+        self._stream = None
+        self._worker = None
+
+    def _callback(self, indata, frames, time_info, status):
+        # Wątek audio - tylko kopia bloku, bez żadnej pracy
+        try:
+            self._blocks.put_nowait(indata[:, 0].copy())
+        except queue.Full:
+            self.dropped_blocks += 1
+
+    def start(self):
+        """
+        Otwiera mikrofon i uruchamia wątek cięcia; przy błędzie (brak PortAudio,
+        brak urządzenia wejściowego) nie zostawia działających wątków
+        """
+        try:
+            sd = optional_import("sounddevice")
+            if sd is None:
+                raise RuntimeError("sounddevice lub biblioteka PortAudio niedostępne")
+            # Strumień otwierany przed wątkiem - bloki zaczną płynąć dopiero po stream.start()
+            self._stream = sd.InputStream(
+                samplerate=self.samplerate,
+                channels=1,
+                dtype="int16",
+                blocksize=self.block_size,
+                callback=self._callback,
+            )
+            self._running = True
+            self.started_at = time.time()
+            self._worker = threading.Thread(target=self._segment_loop, daemon=True)
+            self._worker.start()
+            self._stream.start()
+        except Exception:
+            self._abort_start()
+            raise
+
+    def _abort_start(self):
+        self._running = False
+        if self._worker is not None:
+            self._worker.join()
+            self._worker = None
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+        self._executor.shutdown(wait=False)
+
+    def _segment_loop(self):
+        while self._running or not self._blocks.empty():
+            try:
+                block = self._blocks.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            self._append_block(block)
+
+    def _append_block(self, block):
+        if self._chunk_length + len(block) > len(self._chunk):
+            self._cut_chunk()
+        self._chunk[self._chunk_length:self._chunk_length + len(block)] = block
+        self._chunk_length += len(block)
+
+        rms = float(np.sqrt(np.mean(block.astype(np.float32) ** 2)))
+        if rms >= SILENCE_RMS:
+            self._chunk_voiced = True
+            self._silent_ms = 0.0
+        else:
+            self._silent_ms += len(block) * 1000.0 / self.samplerate
+
+        long_enough = self._chunk_length >= MIN_CHUNK_SECONDS * self.samplerate
+        if self._chunk_voiced and long_enough and self._silent_ms >= PAUSE_MS:
+            self._cut_chunk()
+
+    def _cut_chunk(self):
+        # Sama cisza nie jest wysyłana (i nie jest płatna)
+        if self._chunk_length and self._chunk_voiced:
+            wav_bytes = _pcm_to_wav(self._chunk[:self._chunk_length], self.samplerate)
+            index = self._next_index
+            self._next_index += 1
+            self._futures.append(self._executor.submit(self._transcribe, index, wav_bytes))
+        self._chunk_length = 0
+        self._chunk_voiced = False
+        self._silent_ms = 0.0
+
+    def _transcribe_chunk(self, index, wav_bytes):
+        from utils.asr_backends import transcribe_upload
+        try:
+            text, backend, info = transcribe_upload(wav_bytes, self.language_code)
+        except Exception as e:
+            with self._lock:
+                self._texts[index] = ""
+                self.errors.append(str(e))
+            return
+        with self._lock:
+            self._texts[index] = text.strip()
+            self._usage.append((backend, info))
+
+    def partial_text(self):
+        """Tekst rozpoznany dotąd (fragmenty w kolejności nagrania)"""
+        with self._lock:
+            return " ".join(self._texts[i] for i in sorted(self._texts) if self._texts[i])
+
+    def pending_chunks(self):
+        return sum(1 for future in self._futures if not future.done())
+
+    def stop(self):
+        """Zatrzymuje nagrywanie, wysyła ostatni fragment i zwraca pełny tekst"""
+        self._running = False
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+        if self._worker is not None:
+            self._worker.join()
+        self._cut_chunk()
+        wait(self._futures)
+        self._executor.shutdown(wait=False)
+        return self.partial_text()
+
+    def drain_usage(self):
+        """Zwraca i czyści zebrane (backend, info) do zapisania w statystykach z wątku UI"""
+        with self._lock:
+            usage, self._usage = self._usage, []
+        return usage
+
+
+@st.fragment(run_every=0.5)
+def _show_live_transcript(recorder):
+    elapsed = time.time() - recorder.started_at
+    st.error(f"🔴 NAGRYWANIE TRWA... Czas: {elapsed:.1f}s")
+    partial = recorder.partial_text()
+    if partial:
+        st.write(f"📝 {partial}")
+    if recorder.pending_chunks():
+        st.caption("🔄 Rozpoznawanie fragmentu...")
+
+def show_streaming_recording_interface(language_in, session_key_prefix=""):
+    """
+    Interfejs nagrywania strumieniowego - tekst pojawia się w trakcie mówienia
+
+    Args:
+        language_in (str): Język wejściowy (np. "angielski")
+        session_key_prefix (str): Prefiks dla kluczy session_state
+
+    Returns:
+        str: Rozpoznany tekst lub pusty string jeśli brak nagrania
+    """
+    from utils.config import language_code_map
+    from utils.asr_backends import record_transcription_usage
+
+    recorder_key = f"{session_key_prefix}streaming_recorder"
+    recognized_text_key = f"{session_key_prefix}recognized_text"
+    if recognized_text_key not in st.session_state:
+        st.session_state[recognized_text_key] = ""
+
+    recorder = st.session_state.get(recorder_key)
+    if recorder is None:
+        if st.button("🎤 Rozpocznij nagrywanie", key=f"{session_key_prefix}start_btn"):
+            recorder = StreamingRecorder(language_code_map.get(language_in, "en"))
+            try:
+                recorder.start()
+            except Exception as e:
+                st.error(f"Błąd podczas uruchamiania mikrofonu: {e}")
+                return st.session_state[recognized_text_key]
+            st.session_state[recorder_key] = recorder
+            st.rerun()
+    else:
+        _show_live_transcript(recorder)
+        if st.button("⏹️ Zatrzymaj", key=f"{session_key_prefix}stop_btn"):
+            with st.spinner("🔄 Kończę rozpoznawanie..."):
+                text = recorder.stop()
+            for backend, info in recorder.drain_usage():
+                record_transcription_usage(backend, info)
+            if recorder.errors:
+                st.error(f"Błąd podczas rozpoznawania mowy: {recorder.errors[-1]}")
+            st.session_state[recognized_text_key] = text
+            del st.session_state[recorder_key]
+            st.rerun()
+
+    return st.session_state.get(recognized_text_key, "")
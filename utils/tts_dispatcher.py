@@ -0,0 +1,194 @@
+"""
+Dyspozytor TTS - pomiar opóźnień dostawców, zapytania zabezpieczające (hedging) i fallback
+
+Każdy dostawca ma okno ostatnich opóźnień (p50/p95). Jeśli główny dostawca
+nie odpowie w czasie swojego p95, równolegle startuje zapytanie do kolejnego
+dostawcy i wygrywa szybsza odpowiedź. Dostawca, który kilka razy z rzędu
+zwróci błąd, jest wyłączany na chwilę i ruch idzie do następnego.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from utils import metrics
+from utils.openai_client import bind_api_key
+
+LATENCY_WINDOW = 50          # ile ostatnich pomiarów trzymamy na dostawcę
+MIN_SAMPLES_FOR_HEDGE = 5    # poniżej tej liczby próbek używamy DEFAULT_HEDGE_DELAY
+DEFAULT_HEDGE_DELAY = 2.5    # s - próg hedgingu zanim zbierzemy historię
+FAILURES_TO_TRIP = 2         # kolejne błędy, po których dostawca jest wyłączany
+PROVIDER_COOLDOWN = 60.0     # s - jak długo dostawca pozostaje wyłączony
+
+_providers = {}
+_stats = {}
+_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="tts")
+
+
+class ProviderStats:
+    """Kroczące statystyki opóźnień i błędów jednego dostawcy TTS"""
+
+    def __init__(self):
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.consecutive_failures = 0
+        self.total_failures = 0
+        self.down_until = 0.0
+        self.last_error = None
+
+    def percentile(self, q):
+        """Percentyl (metoda najbliższej rangi) z okna opóźnień lub None"""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, max(0, math.ceil(q / 100.0 * len(ordered)) - 1))
+        return ordered[index]
+
+    def record_success(self, latency):
+        self.latencies.append(latency)
+        self.consecutive_failures = 0
+        self.down_until = 0.0
+
+    def record_failure(self, error):
+        self.consecutive_failures += 1
+        self.total_failures += 1
+        self.last_error = str(error)
+        if self.consecutive_failures >= FAILURES_TO_TRIP:
+            self.down_until = time.time() + PROVIDER_COOLDOWN
+
+    def is_down(self):
+        return time.time() < self.down_until
+
+
+class TTSResult:
+    """Wynik dyspozycji: audio, zwycięski dostawca i dostawcy, do których wysłano zapytania"""
+
+    def __init__(self, audio_bytes, provider, launched, hedged, fell_back, errors):
+        self.audio_bytes = audio_bytes
+        self.provider = provider
+        self.launched = launched
+        self.hedged = hedged
+        self.fell_back = fell_back
+        self.errors = errors
+
+
+def register_tts_provider(name, synthesize):
+    """Rejestruje funkcję syntezy synthesize(text, language) -> bytes pod nazwą dostawcy"""
+    with _lock:
+        _providers[name] = synthesize
+        _stats.setdefault(name, ProviderStats())
+
+def get_registered_providers():
+    """Zwraca nazwy zarejestrowanych dostawców TTS"""
+    return list(_providers)
+
+def get_tts_health():
+    """Migawka stanu dostawców do wyświetlenia w sidebarze"""
+    with _lock:
+        return {
+            name: {
+                "p50": stats.percentile(50),
+                "p95": stats.percentile(95),
+                "samples": len(stats.latencies),
+                "failures": stats.total_failures,
+                "down": stats.is_down(),
+                "last_error": stats.last_error,
+            }
+            for name, stats in _stats.items()
+        }
+
+def get_hedge_delay(name):
+    """Czas oczekiwania na dostawcę zanim wyślemy zapytanie zabezpieczające (jego p95)"""
+    with _lock:
+        stats = _stats[name]
+        if len(stats.latencies) < MIN_SAMPLES_FOR_HEDGE:
+            return DEFAULT_HEDGE_DELAY
+        return stats.percentile(95)
+
+def _timed_synthesize(name, text, language):
+    start = time.perf_counter()
+    try:
+        audio_bytes = _providers[name](text, language)
+    except Exception as e:
+        with _lock:
+            _stats[name].record_failure(e)
+        raise
+    with _lock:
+        _stats[name].record_success(time.perf_counter() - start)
+    return audio_bytes
+
+def dispatch_tts(text, language, providers, hedge=True, on_complete=None):
+    """
+    Syntezuje mowę u pierwszego sprawnego dostawcy z listy, z hedgingiem i fallbackiem
+
+    Args:
+        text (str): Tekst do przetworzenia na mowę
+        language (str): Język w polskiej nazwie (np. "angielski")
+        providers (list[str]): Dostawcy w kolejności preferencji
+        hedge (bool): Czy wysyłać zapytanie zabezpieczające po przekroczeniu p95
+        on_complete (callable | None): on_complete(nazwa) dla każdego zapytania zakończonego
+            syntezą - zwycięzcy od razu, przegranego w hedgingu dopiero gdy skończy (z wątku
+            roboczego); anulowane i zakończone błędem nie są zgłaszane
+
+    Returns:
+        TTSResult: Wynik z audio i informacją, który dostawca odpowiedział
+    """
+    candidates = [name for name in providers if name in _providers]
+    if not candidates:
+        raise RuntimeError("Brak dostępnego dostawcy TTS")
+    with _lock:
+        healthy = [name for name in candidates if not _stats[name].is_down()]
+    # Gdy wszyscy są wyłączeni, i tak próbujemy w kolejności preferencji
+    queue = healthy or list(candidates)
+    preferred = candidates[0]
+
+    pending = {}
+    launched = []
+    errors = {}
+    hedged = False
+
+    def report(name, future):
+        if not future.cancelled() and future.exception() is None:
+            on_complete(name)
+
+    def launch(name):
+        # Klucz API sesji ustalany w wątku wywołującym - wątek dyspozytora nie widzi session_state
+        future = _executor.submit(bind_api_key(_timed_synthesize), name, text, language)
+        pending[future] = name
+        launched.append(name)
+
+    launch(queue.pop(0))
+    while pending:
+        timeout = None
+        if hedge and queue and len(pending) == 1:
+            timeout = get_hedge_delay(next(iter(pending.values())))
+        done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+        if not done:
+            # Główny dostawca przekroczył swoje p95 - startujemy zapytanie zabezpieczające
+            hedged = True
+            metrics.inc("retries", "tts", "hedge")
+            launch(queue.pop(0))
+            continue
+        for future in done:
+            name = pending.pop(future)
+            try:
+                audio_bytes = future.result()
+            except Exception as e:
+                errors[name] = e
+                continue
+            if on_complete is not None:
+                on_complete(name)
+            # Przegrany nie jest już potrzebny - anuluj jeśli jeszcze nie wystartował
+            for loser, loser_name in pending.items():
+                if not loser.cancel() and on_complete is not None:
+                    # Już trwa - zostanie rozliczony, jeśli zwróci audio
+                    loser.add_done_callback(lambda future, loser_name=loser_name: report(loser_name, future))
+            return TTSResult(audio_bytes, name, launched, hedged, name != preferred, errors)
+        if not pending and queue:
+            metrics.inc("retries", "tts", "fallback")
+            launch(queue.pop(0))
+
+    details = "; ".join(f"{name}: {error}" for name, error in errors.items())
+    raise RuntimeError(f"Wszyscy dostawcy TTS zawiedli ({details})")
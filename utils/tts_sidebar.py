@@ -1,10 +1,22 @@
 import streamlit as st
+from utils.tts_dispatcher import get_tts_health
+from utils.local_tts import is_local_tts_available
 
-try:
-    from gtts import gTTS
-    GTTS_AVAILABLE = True
-except ImportError:
-    GTTS_AVAILABLE = False
+from utils.lazy_imports import is_installed
+
+GTTS_AVAILABLE = is_installed("gtts")
+
+LOCAL_TTS_AVAILABLE = is_local_tts_available()
+
+def get_tts_options():
+    """Dostawcy TTS oferowani w sidebarze - tylko ich używa też fallback (utils/config.py)"""
+    # OpenAI TTS zablokowane w wersji testowej (patrz show_tts_sidebar)
+    tts_options = []
+    if GTTS_AVAILABLE:
+        tts_options.append("gTTS (Google)")
+    if LOCAL_TTS_AVAILABLE:
+        tts_options.append("Lokalny TTS (offline)")
+    return tts_options
 
 def show_tts_sidebar():
     st.sidebar.subheader("🔊 Ustawienia TTS")
@@ -30,17 +42,56 @@ def show_tts_sidebar():
     # if not GTTS_AVAILABLE and len(tts_options) == 1:
     #     st.sidebar.caption("💡 Zainstaluj gTTS dla darmowej opcji: `pip install gtts`")
     # --- BLOKADA OPENAI TTS (wersja testowa) ---
-    if GTTS_AVAILABLE:
-        tts_options = ["gTTS (Google)"]
+    tts_options = get_tts_options()
+    if tts_options:
         tts_provider = st.sidebar.selectbox(
             "Wybierz dostawcę TTS:",
             tts_options,
             index=0,
             key="tts_provider",
-            help="Wersja testowa: dostępny tylko gTTS (Google) - darmowy, podstawowa jakość"
+            help="Wersja testowa: gTTS (Google) - darmowy, podstawowa jakość\n"
+                 "Lokalny TTS: Piper/espeak-ng na serwerze - darmowy, bez sieci, najszybszy"
         )
-        st.sidebar.info("OpenAI TTS jest zablokowane w tej wersji testowej. Dostępny tylko gTTS (Google).")
+        if tts_provider == "Lokalny TTS (offline)":
+            st.sidebar.caption("🆓 Darmowe • 🖥️ Na serwerze • ⚡ Bez opóźnień sieci")
+        st.sidebar.info("OpenAI TTS jest zablokowane w tej wersji testowej. Dostępny gTTS (Google) i lokalny TTS.")
     else:
         st.sidebar.warning("gTTS (Google) nie jest dostępny. Zainstaluj pakiet gtts.")
         st.session_state["tts_provider"] = "gTTS (Google)"
     # --- KONIEC BLOKADY ---
+    st.sidebar.checkbox(
+        "🛟 Zapasowy dostawca TTS",
+        value=True,
+        key="tts_fallback_enabled",
+        help="Gdy wybrany dostawca jest wolny (powyżej swojego p95) lub zwraca błędy, "
+             "zapytanie trafia też do drugiego z dostępnych dostawców i wygrywa szybsza odpowiedź"
+    )
+    st.sidebar.checkbox(
+        "🎞️ Audio karty jednym zapytaniem",
+        value=False,
+        key="tts_sprite_mode",
+        help="Słówko, tłumaczenie i przykłady karty są syntezowane razem (jedno zapytanie na język), "
+             "a przyciski 🔊 odtwarzają odpowiedni fragment nagrania"
+    )
+    show_tts_health()
+
+def show_tts_health():
+    """Pokazuje opóźnienia (p50/p95) i stan dostawców TTS oraz ostatni fallback"""
+    from utils.config import TTS_PROVIDER_LABELS
+    health = get_tts_health()
+    if any(info["down"] for info in health.values()):
+        down = [TTS_PROVIDER_LABELS.get(name, name) for name, info in health.items() if info["down"]]
+        st.sidebar.warning(f"⚠️ Niedostępny dostawca TTS: {', '.join(down)} - używam zapasowego")
+    if st.session_state.get("tts_last_fallback"):
+        st.sidebar.caption(st.session_state["tts_last_fallback"])
+    if not any(info["samples"] or info["failures"] for info in health.values()):
+        return
+    with st.sidebar.expander("⏱️ Dostawcy TTS"):
+        for name, info in health.items():
+            label = TTS_PROVIDER_LABELS.get(name, name)
+            if info["samples"]:
+                st.write(f"• {label}: p50 {info['p50']:.2f}s • p95 {info['p95']:.2f}s ({info['samples']} pomiarów)")
+            else:
+                st.write(f"• {label}: brak pomiarów")
+            if info["failures"]:
+                st.caption(f"❌ Błędy: {info['failures']} • ostatni: {info['last_error']}")
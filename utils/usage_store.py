@@ -0,0 +1,577 @@
+"""
+Magazyn użycia API w SQLite - jeden wiersz na zapytanie i przyrostowe agregaty
+
+Tabele:
+- usage_log     - wiersz na każde zapytanie (czas, moduł, model, tokeny, opóźnienie, znaki TTS, sekundy Whisper)
+- usage_totals  - sumy wszystkich czasów (metryka → wartość)
+- usage_daily   - agregaty dzienne (dzień, metryka → wartość)
+- usage_monthly - agregaty miesięczne (miesiąc, metryka → wartość)
+- usage_days    - pierwsza/ostatnia aktywność dnia
+- usage_latency - histogramy opóźnień (klucz "moduł|model", kubełek → liczba wywołań)
+- usage_latency_max - najdłuższe wywołanie per klucz
+- usage_meta    - data utworzenia, ostatni zapis, licznik zmian (shard: także jego identyfikator)
+- usage_merged_shards - identyfikatory shardów już scalonych do bazy głównej
+
+Agregaty są aktualizowane w tej samej transakcji co wstawienie wierszy,
+więc sidebar czyta kilka wierszy po kluczu głównym niezależnie od tego,
+ile miesięcy historii zebrała baza. Metryki to ścieżki "moduł.pole"
+(np. "translator.prompt") lub nazwy liczników (np. "whisper_minutes").
+
+Wiele procesów: każdy proces zapisuje wyłącznie do własnego pliku-shardu
+w USAGE_SHARD_DIR (host-pid), więc piszący nigdy nie czekają na siebie
+nawzajem, a przyrosty nie nadpisują się. Odczyt sumuje bazę główną i
+wszystkie shardy. Przy zamknięciu proces scala swój shard do bazy głównej;
+shardy procesów, które zginęły, scala kolejny uruchomiony proces. Scalenie
+zapisuje identyfikator shardu w bazie głównej w tej samej transakcji, więc
+shard, który przetrwał scalenie (awaria przed usunięciem pliku, odczyt w
+trakcie), jest pomijany - przy odczycie i przy ponownym scalaniu.
+"""
+
+import glob
+import os
+import socket
+import sqlite3
+import threading
+import uuid
+from datetime import datetime
+
+USAGE_STORE_FILE = os.path.join("base", "usage.sqlite3")
+USAGE_SHARD_DIR = os.path.join("base", "usage_shards")
+RECENT_DAYS = 7
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS usage_log (
+    id INTEGER PRIMARY KEY,
+    ts TEXT NOT NULL,
+    day TEXT NOT NULL,
+    module TEXT,
+    model TEXT,
+    prompt_tokens INTEGER NOT NULL DEFAULT 0,
+    completion_tokens INTEGER NOT NULL DEFAULT 0,
+    latency_ms REAL,
+    tts_chars INTEGER NOT NULL DEFAULT 0,
+    tts_provider TEXT,
+    whisper_seconds REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS usage_log_day ON usage_log (day);
+CREATE INDEX IF NOT EXISTS usage_log_module_day ON usage_log (module, day);
+CREATE TABLE IF NOT EXISTS usage_totals (
+    metric TEXT PRIMARY KEY,
+    value REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS usage_daily (
+    day TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, metric)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS usage_monthly (
+    month TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (month, metric)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS usage_days (
+    day TEXT PRIMARY KEY,
+    first_activity TEXT,
+    last_activity TEXT
+);
+CREATE TABLE IF NOT EXISTS usage_latency (
+    key TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (key, bucket)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS usage_latency_max (
+    key TEXT PRIMARY KEY,
+    value REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS usage_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS usage_merged_shards (
+    shard_id TEXT PRIMARY KEY,
+    merged_at TEXT
+);
+"""
+
+LOG_COLUMNS = (
+    "ts", "day", "module", "model", "prompt_tokens", "completion_tokens",
+    "latency_ms", "tts_chars", "tts_provider", "whisper_seconds",
+)
+LOG_DEFAULTS = {"prompt_tokens": 0, "completion_tokens": 0, "tts_chars": 0, "whisper_seconds": 0.0}
+
+_init_lock = threading.Lock()
+_initialized_paths = set()
+
+def _connect(path=None, shard=False):
+    path = path or USAGE_STORE_FILE
+    if path not in _initialized_paths:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    connection = sqlite3.connect(path, timeout=10)
+    if path not in _initialized_paths:
+        with _init_lock:
+            if path not in _initialized_paths:
+                # Shard ma jednego piszącego; bez WAL plik można bezpiecznie przenieść przy scalaniu
+                connection.execute("PRAGMA journal_mode=DELETE" if shard else "PRAGMA journal_mode=WAL")
+                connection.executescript(_SCHEMA)
+                connection.execute(
+                    "INSERT OR IGNORE INTO usage_meta (key, value) VALUES ('created_date', ?)",
+                    (datetime.now().isoformat(),)
+                )
+                if shard:
+                    connection.execute(
+                        "INSERT OR IGNORE INTO usage_meta (key, value) VALUES ('shard_id', ?)",
+                        (uuid.uuid4().hex,)
+                    )
+                connection.commit()
+                _initialized_paths.add(path)
+    return connection
+
+def get_shard_path():
+    """Shard bieżącego procesu (liczony przy każdym wywołaniu - po fork zmienia się pid)"""
+    return os.path.join(USAGE_SHARD_DIR, f"{socket.gethostname()}-{os.getpid()}.sqlite3")
+
+def _store_paths():
+    """Baza główna i wszystkie aktywne shardy (scalane w tej chwili są pomijane)"""
+    paths = [USAGE_STORE_FILE] if os.path.exists(USAGE_STORE_FILE) else []
+    return paths + sorted(glob.glob(os.path.join(USAGE_SHARD_DIR, "*.sqlite3")))
+
+def _get_meta(connection, key, default=None):
+    row = connection.execute("SELECT value FROM usage_meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else default
+
+def _shard_id(connection, path, schema="main"):
+    """Identyfikator shardu (shardy sprzed identyfikatorów: nazwa pliku i data utworzenia)"""
+    rows = dict(connection.execute(f"SELECT key, value FROM {schema}.usage_meta").fetchall())
+    if rows.get("shard_id"):
+        return rows["shard_id"]
+    return f"{os.path.basename(path).split('.sqlite3')[0]}|{rows.get('created_date')}"
+
+def _merged_shards(connection):
+    try:
+        return {shard_id for (shard_id,) in connection.execute("SELECT shard_id FROM usage_merged_shards")}
+    except sqlite3.OperationalError:
+        # Baza główna sprzed tej tabeli (utworzy ją pierwszy zapis)
+        return set()
+
+def _bump_revision(connection):
+    connection.execute(
+        "INSERT INTO usage_meta (key, value) VALUES ('revision', '1') "
+        "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1"
+    )
+    connection.execute(
+        "INSERT INTO usage_meta (key, value) VALUES ('last_updated', ?) "
+        "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+        (datetime.now().isoformat(),)
+    )
+
+def _upsert_rollups(connection, total, daily, activity):
+    connection.executemany(
+        "INSERT INTO usage_totals (metric, value) VALUES (?, ?) "
+        "ON CONFLICT(metric) DO UPDATE SET value = value + excluded.value",
+        list(total.items())
+    )
+    for day, deltas in daily.items():
+        connection.executemany(
+            "INSERT INTO usage_daily (day, metric, value) VALUES (?, ?, ?) "
+            "ON CONFLICT(day, metric) DO UPDATE SET value = value + excluded.value",
+            [(day, metric, value) for metric, value in deltas.items()]
+        )
+        connection.executemany(
+            "INSERT INTO usage_monthly (month, metric, value) VALUES (?, ?, ?) "
+            "ON CONFLICT(month, metric) DO UPDATE SET value = value + excluded.value",
+            [(day[:7], metric, value) for metric, value in deltas.items()]
+        )
+    for day in set(daily) | set(activity):
+        first, last = activity.get(day, (None, None))
+        connection.execute(
+            "INSERT INTO usage_days (day, first_activity, last_activity) VALUES (?, ?, ?) "
+            "ON CONFLICT(day) DO UPDATE SET "
+            "first_activity = COALESCE(first_activity, excluded.first_activity), "
+            "last_activity = COALESCE(excluded.last_activity, last_activity)",
+            (day, first, last)
+        )
+
+def _upsert_latency(connection, latency, latency_max):
+    connection.executemany(
+        "INSERT INTO usage_latency (key, bucket, count) VALUES (?, ?, ?) "
+        "ON CONFLICT(key, bucket) DO UPDATE SET count = count + excluded.count",
+        [(key, bucket, count) for key, buckets in latency.items() for bucket, count in buckets.items()]
+    )
+    connection.executemany(
+        "INSERT INTO usage_latency_max (key, value) VALUES (?, ?) "
+        "ON CONFLICT(key) DO UPDATE SET value = MAX(value, excluded.value)",
+        list(latency_max.items())
+    )
+
+def write_batch(rows, total, daily, activity, latency=None, latency_max=None):
+    """
+    Zapisuje wiersze zapytań i przyrosty agregatów w jednej transakcji
+
+    Args:
+        rows (list[dict]): Wiersze usage_log (klucze z LOG_COLUMNS)
+        total (dict): Przyrosty sum wszystkich czasów (metryka → wartość)
+        daily (dict): Przyrosty dzienne {dzień: {metryka: wartość}} (miesięczne liczone z nich)
+        activity (dict): {dzień: (pierwsza aktywność, ostatnia aktywność)}
+        latency (dict): Przyrosty histogramów {klucz: {kubełek: liczba}}
+        latency_max (dict): Maksima z partii {klucz: ms}
+
+    Zapis idzie do shardu bieżącego procesu - bez blokowania innych procesów.
+    """
+    connection = _connect(get_shard_path(), shard=True)
+    try:
+        with connection:
+            connection.executemany(
+                f"INSERT INTO usage_log ({', '.join(LOG_COLUMNS)}) "
+                f"VALUES ({', '.join('?' for _ in LOG_COLUMNS)})",
+                [tuple(row.get(column, LOG_DEFAULTS.get(column)) for column in LOG_COLUMNS) for row in rows]
+            )
+            _upsert_rollups(connection, total, daily, activity)
+            _upsert_latency(connection, latency or {}, latency_max or {})
+            _bump_revision(connection)
+    finally:
+        connection.close()
+
+def _read_each(query_function, paths=None):
+    """
+    Wywołuje query_function(connection) dla bazy głównej i każdego shardu
+
+    Baza główna jest czytana pierwsza: shard scalony przed jej odczytem jest w niej
+    już zapisany jako scalony i zostaje pominięty; scalony później - liczy się z shardu.
+    """
+    results = []
+    merged = set()
+    for path in paths if paths is not None else _store_paths():
+        try:
+            # Tylko do odczytu - shard scalony w międzyczasie nie zostanie utworzony na nowo jako pusty plik
+            connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=10)
+        except sqlite3.Error:
+            continue
+        try:
+            if path == USAGE_STORE_FILE:
+                merged = _merged_shards(connection)
+            elif merged and _shard_id(connection, path) in merged:
+                continue
+            results.append(query_function(connection))
+        except sqlite3.OperationalError:
+            # Shard właśnie powstaje (brak tabel) lub został scalony i usunięty
+            pass
+        finally:
+            connection.close()
+    return results
+
+def get_revision():
+    """Stan zmian bazy głównej i shardów - zmienia się przy każdym zapisie dowolnego procesu"""
+    paths = _store_paths()
+
+    def revision(connection):
+        return _get_meta(connection, "revision", "0")
+    return tuple(paths), tuple(_read_each(revision, paths))
+
+def _metrics_to_dict(rows, base):
+    for metric, value in rows:
+        *parents, key = metric.split(".")
+        target = base
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[key] = target.get(key, 0) + (int(value) if float(value).is_integer() else value)
+    return base
+
+def load_database(total_template, create_daily_stats, recent_days=None):
+    """
+    Odczytuje bazę (główną i shardy) w kształcie dawnego usage_database.json
+
+    Args:
+        total_template (dict): Pusty total_stats (domyślne liczniki)
+        create_daily_stats (callable): Fabryka pustych statystyk dnia
+        recent_days (int | None): Tylko tyle ostatnich dni w daily_stats (None - wszystkie)
+
+    Returns:
+        dict: created_date, last_updated, total_stats, daily_stats, days_with_data
+    """
+    limit = f" LIMIT {int(recent_days)}" if recent_days is not None else ""
+
+    def read_index(connection):
+        is_shard = _get_meta(connection, "shard_id") is not None
+        return {
+            "totals": connection.execute("SELECT metric, value FROM usage_totals").fetchall(),
+            "days": connection.execute(f"SELECT day FROM usage_days ORDER BY day DESC{limit}").fetchall(),
+            # Baza główna: tylko liczba dni (bez listy); shard ma dni jednego procesu - lista jest krótka
+            "day_count": connection.execute("SELECT COUNT(*) FROM usage_days").fetchone()[0],
+            "shard_days": connection.execute("SELECT day FROM usage_days").fetchall() if limit and is_shard else None,
+            "created_date": _get_meta(connection, "created_date"),
+            "last_updated": _get_meta(connection, "last_updated"),
+        }
+
+    parts = _read_each(read_index)
+    total_stats = total_template
+    for part in parts:
+        _metrics_to_dict(part["totals"], total_stats)
+    selected_days = sorted({day for part in parts for (day,) in part["days"]}, reverse=True)
+    if recent_days is not None:
+        selected_days = selected_days[:recent_days]
+        days_with_data = _count_days(parts)
+    else:
+        days_with_data = len(selected_days)
+
+    def read_days(connection):
+        placeholders = ", ".join("?" for _ in selected_days)
+        return (
+            connection.execute(
+                f"SELECT day, first_activity, last_activity FROM usage_days WHERE day IN ({placeholders})",
+                selected_days
+            ).fetchall(),
+            connection.execute(
+                f"SELECT day, metric, value FROM usage_daily WHERE day IN ({placeholders})",
+                selected_days
+            ).fetchall(),
+        )
+
+    daily_stats = {day: create_daily_stats() for day in selected_days}
+    if selected_days:
+        for days, metrics in _read_each(read_days):
+            for day, first, last in days:
+                stats = daily_stats[day]
+                if first and (stats["first_activity"] is None or first < stats["first_activity"]):
+                    stats["first_activity"] = first
+                if last and (stats["last_activity"] is None or last > stats["last_activity"]):
+                    stats["last_activity"] = last
+            for day, metric, value in metrics:
+                _metrics_to_dict([(metric, value)], daily_stats[day])
+
+    created = [part["created_date"] for part in parts if part["created_date"]]
+    updated = [part["last_updated"] for part in parts if part["last_updated"]]
+    return {
+        "created_date": min(created) if created else datetime.now().isoformat(),
+        "last_updated": max(updated) if updated else (min(created) if created else datetime.now().isoformat()),
+        "total_stats": total_stats,
+        "daily_stats": daily_stats,
+        "days_with_data": days_with_data,
+    }
+
+def _count_days(parts):
+    """Liczba różnych dni: dni bazy głównej plus dni shardów, których baza główna jeszcze nie ma"""
+    main_count = sum(part["day_count"] for part in parts if part["shard_days"] is None)
+    shard_days = sorted({day for part in parts if part["shard_days"] is not None for (day,) in part["shard_days"]})
+    if not shard_days:
+        return main_count
+
+    def read_known(connection):
+        placeholders = ", ".join("?" for _ in shard_days)
+        return connection.execute(
+            f"SELECT COUNT(*) FROM usage_days WHERE day IN ({placeholders})", shard_days
+        ).fetchone()[0]
+    known = sum(_read_each(read_known, [USAGE_STORE_FILE] if os.path.exists(USAGE_STORE_FILE) else []))
+    return main_count + len(shard_days) - known
+
+def load_month(month):
+    """Agregat miesięczny {metryka: wartość} dla klucza "RRRR-MM" (baza główna i shardy)"""
+    def read_month(connection):
+        return connection.execute("SELECT metric, value FROM usage_monthly WHERE month = ?", (month,)).fetchall()
+    result = {}
+    for rows in _read_each(read_month):
+        _metrics_to_dict(rows, result)
+    return result
+
+def load_latency():
+    """
+    Histogramy opóźnień zsumowane z bazy głównej i shardów
+
+    Returns:
+        dict: {klucz: {"buckets": {kubełek: liczba}, "max": ms}}
+    """
+    def read_latency(connection):
+        return (
+            connection.execute("SELECT key, bucket, count FROM usage_latency").fetchall(),
+            connection.execute("SELECT key, value FROM usage_latency_max").fetchall(),
+        )
+    result = {}
+    for buckets, maxima in _read_each(read_latency):
+        for key, bucket, count in buckets:
+            entry = result.setdefault(key, {"buckets": {}, "max": 0.0})
+            entry["buckets"][bucket] = entry["buckets"].get(bucket, 0) + count
+        for key, value in maxima:
+            entry = result.setdefault(key, {"buckets": {}, "max": 0.0})
+            entry["max"] = max(entry["max"], value)
+    return result
+
+def _flatten(stats, prefix=""):
+    for key, value in stats.items():
+        if isinstance(value, dict):
+            yield from _flatten(value, f"{prefix}{key}.")
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield f"{prefix}{key}", value
+
+def import_legacy_database(load_legacy):
+    """
+    Jednorazowy import sum i statystyk dziennych z usage_database.json (bez wierszy zapytań).
+    Sprawdzenie i import w jednej transakcji IMMEDIATE - przy kilku startujących procesach importuje jeden.
+
+    Args:
+        load_legacy (callable): Zwraca dane dawnej bazy (dict)
+    """
+    connection = _connect()
+    connection.isolation_level = None
+    try:
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            if _get_meta(connection, "legacy_imported") is None:
+                data = load_legacy()
+                total = {metric: value for metric, value in _flatten(data.get("total_stats", {}))
+                         if metric != "total_cost_usd"}
+                daily, activity = {}, {}
+                for day, stats in data.get("daily_stats", {}).items():
+                    daily[day] = {metric: value for metric, value in _flatten(stats) if metric != "cost_usd"}
+                    activity[day] = (stats.get("first_activity"), stats.get("last_activity"))
+                if data.get("created_date"):
+                    connection.execute(
+                        "UPDATE usage_meta SET value = ? WHERE key = 'created_date'", (data["created_date"],)
+                    )
+                _upsert_rollups(connection, total, daily, activity)
+                connection.execute("INSERT INTO usage_meta (key, value) VALUES ('legacy_imported', ?)",
+                                   (datetime.now().isoformat(),))
+                _bump_revision(connection)
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+    finally:
+        connection.close()
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def _merge_into_main(shard_path):
+    """
+    Scala shard do bazy głównej w jednej transakcji i usuwa plik shardu
+
+    Identyfikator shardu trafia do usage_merged_shards w tej samej transakcji - ponowne
+    scalanie tego samego pliku (awaria przed os.remove) tylko go usuwa.
+    """
+    connection = _connect()
+    try:
+        connection.execute("ATTACH DATABASE ? AS shard", (shard_path,))
+        has_tables = connection.execute(
+            "SELECT 1 FROM shard.sqlite_master WHERE type = 'table' AND name = 'usage_log'"
+        ).fetchone()
+        if not has_tables:
+            # Pusty plik (proces zginął przed utworzeniem tabel) - nie ma czego scalać
+            connection.execute("DETACH DATABASE shard")
+            os.remove(shard_path)
+            return
+        shard_id = _shard_id(connection, shard_path, schema="shard")
+        with connection:
+            already_merged = connection.execute(
+                "SELECT 1 FROM usage_merged_shards WHERE shard_id = ?", (shard_id,)
+            ).fetchone()
+            if not already_merged:
+                _copy_shard(connection)
+                connection.execute(
+                    "INSERT INTO usage_merged_shards (shard_id, merged_at) VALUES (?, ?)",
+                    (shard_id, datetime.now().isoformat())
+                )
+                _bump_revision(connection)
+        connection.execute("DETACH DATABASE shard")
+    finally:
+        connection.close()
+    os.remove(shard_path)
+
+def _copy_shard(connection):
+    """Dopisuje wiersze i agregaty dołączonego shardu (ATTACH ... AS shard) do bazy głównej"""
+    columns = ", ".join(LOG_COLUMNS)
+    connection.execute(f"INSERT INTO usage_log ({columns}) SELECT {columns} FROM shard.usage_log")
+    connection.execute(
+        "INSERT INTO usage_totals (metric, value) SELECT metric, value FROM shard.usage_totals WHERE true "
+        "ON CONFLICT(metric) DO UPDATE SET value = value + excluded.value"
+    )
+    connection.execute(
+        "INSERT INTO usage_daily (day, metric, value) SELECT day, metric, value FROM shard.usage_daily WHERE true "
+        "ON CONFLICT(day, metric) DO UPDATE SET value = value + excluded.value"
+    )
+    connection.execute(
+        "INSERT INTO usage_monthly (month, metric, value) SELECT month, metric, value FROM shard.usage_monthly "
+        "WHERE true ON CONFLICT(month, metric) DO UPDATE SET value = value + excluded.value"
+    )
+    connection.execute(
+        "INSERT INTO usage_days (day, first_activity, last_activity) "
+        "SELECT day, first_activity, last_activity FROM shard.usage_days WHERE true "
+        "ON CONFLICT(day) DO UPDATE SET "
+        "first_activity = COALESCE(MIN(first_activity, excluded.first_activity), first_activity, excluded.first_activity), "
+        "last_activity = COALESCE(MAX(last_activity, excluded.last_activity), last_activity, excluded.last_activity)"
+    )
+    connection.execute(
+        "INSERT INTO usage_latency (key, bucket, count) SELECT key, bucket, count FROM shard.usage_latency "
+        "WHERE true ON CONFLICT(key, bucket) DO UPDATE SET count = count + excluded.count"
+    )
+    connection.execute(
+        "INSERT INTO usage_latency_max (key, value) SELECT key, value FROM shard.usage_latency_max "
+        "WHERE true ON CONFLICT(key) DO UPDATE SET value = MAX(value, excluded.value)"
+    )
+
+def compact_shard(shard_path):
+    """
+    Przejmuje shard (atomowa zmiana nazwy - wygrywa jeden proces) i scala go do bazy głównej
+
+    Returns:
+        bool: Czy shard został scalony
+    """
+    claimed = f"{shard_path}.merging-{os.getpid()}"
+    try:
+        os.rename(shard_path, claimed)
+    except OSError:
+        return False
+    _initialized_paths.discard(shard_path)
+    _merge_into_main(claimed)
+    return True
+
+def compact_stale_shards():
+    """Scala shardy procesów z tego hosta, które już nie działają (np. po awarii)"""
+    hostname = socket.gethostname()
+    candidates = glob.glob(os.path.join(USAGE_SHARD_DIR, f"{hostname}-*.sqlite3"))
+    # Przerwane scalanie: plik .merging-<pid> martwego procesu przejmujemy ponownie
+    candidates += glob.glob(os.path.join(USAGE_SHARD_DIR, f"{hostname}-*.sqlite3.merging-*"))
+    for path in candidates:
+        try:
+            _compact_stale_shard(path, hostname)
+        except (sqlite3.Error, OSError):
+            # Uszkodzony lub zablokowany shard - kolejna próba przy następnym starcie
+            continue
+
+def _compact_stale_shard(path, hostname):
+    name = os.path.basename(path)
+    if ".merging-" in name:
+        owner_pid = name.rsplit("-", 1)[1]
+    else:
+        owner_pid = name[len(hostname) + 1:].split(".")[0]
+    if not owner_pid.isdigit() or _pid_alive(int(owner_pid)):
+        return
+    if ".merging-" in name:
+        retried = f"{path.split('.merging-')[0]}.merging-{os.getpid()}"
+        os.rename(path, retried)
+        _merge_into_main(retried)
+    else:
+        compact_shard(path)
+
+def clear():
+    """Usuwa wszystkie dane użycia z bazy głównej i shardów (liczniki zmian rosną dalej)"""
+    for path in [USAGE_STORE_FILE] + sorted(glob.glob(os.path.join(USAGE_SHARD_DIR, "*.sqlite3"))):
+        connection = _connect(path, shard=path != USAGE_STORE_FILE)
+        try:
+            with connection:
+                for table in ("usage_log", "usage_totals", "usage_daily", "usage_monthly", "usage_days",
+                              "usage_latency", "usage_latency_max"):
+                    connection.execute(f"DELETE FROM {table}")
+                connection.execute(
+                    "UPDATE usage_meta SET value = ? WHERE key = 'created_date'", (datetime.now().isoformat(),)
+                )
+                _bump_revision(connection)
+        finally:
+            connection.close()
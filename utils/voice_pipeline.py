@@ -0,0 +1,355 @@
+"""
+Potokowy tłumacz głosowy: transkrypcja → strumieniowe tłumaczenie → TTS zdaniami
+
+Nagranie jest dzielone na wypowiedzi w miejscach pauz. Trzy etapy działają
+jednocześnie w osobnych wątkach połączonych kolejkami:
+- transkrypcja fragmentów (równolegle, wyniki przekazywane w kolejności nagrania),
+- tłumaczenie każdego fragmentu strumieniowo (stream=True) i cięcie na zdania,
+- synteza mowy każdego gotowego zdania.
+Wątek UI odbiera zdarzenia i odtwarza zdania po kolei, więc pierwsze
+przetłumaczone zdanie słychać, zanim powstanie tłumaczenie całej wypowiedzi.
+
+Wątki robocze nie dotykają st.session_state - zużycie (Whisper, tokeny, TTS)
+jest przekazywane zdarzeniami i zapisywane w statystykach w wątku UI. Przegrani
+w hedgingu TTS mogą skończyć dopiero po zamknięciu potoku - ich zużycie trafia
+wtedy prosto do statystyk (bez liczników sesji).
+"""
+
+import queue
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+from utils.audio_preprocess import (
+    NUMPY_AVAILABLE, TARGET_SAMPLE_RATE, VAD_FRAME_MS, load_speech_mono, encode_for_upload,
+)
+from utils.audio_cache import find_cached_audio, save_cached_audio
+from utils.tts_dispatcher import dispatch_tts
+from utils.latency import track_latency
+from utils.openai_client import bind_api_key
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+SEGMENT_PAUSE_MS = 500        # pauza, na której tniemy nagranie na wypowiedzi
+SEGMENT_MIN_SECONDS = 2.0     # krótszych wypowiedzi nie wysyłamy osobno
+SEGMENT_SILENCE_DB = -35.0    # ramki cichsze niż szczyt - 35 dB to pauza
+TRANSCRIBE_WORKERS = 2
+TTS_WORKERS = 2
+SENTENCE_END = re.compile(r"(?<=[.!?…])\s+")
+
+
+def split_at_pauses(audio_bytes):
+    """
+    Dzieli nagranie WAV na wypowiedzi w miejscach pauz
+
+    Returns:
+        list[bytes]: Fragmenty WAV (całe nagranie jako jeden fragment, gdy brak numpy)
+    """
+    mono = load_speech_mono(audio_bytes)
+    if mono is None:
+        return [audio_bytes]
+
+    frame = TARGET_SAMPLE_RATE * VAD_FRAME_MS // 1000
+    frame_count = len(mono) // frame
+    if frame_count == 0:
+        return [audio_bytes]
+    energies = np.sqrt(np.mean(mono[:frame_count * frame].reshape(frame_count, frame) ** 2, axis=1))
+    silent = 20 * np.log10(np.maximum(energies, 1e-10) / max(float(energies.max()), 1e-10)) < SEGMENT_SILENCE_DB
+
+    pause_frames = SEGMENT_PAUSE_MS // VAD_FRAME_MS
+    min_frames = int(SEGMENT_MIN_SECONDS * 1000) // VAD_FRAME_MS
+    cuts, start, silent_run = [], 0, 0
+    for index in range(frame_count):
+        silent_run = silent_run + 1 if silent[index] else 0
+        if silent_run >= pause_frames and index + 1 - start >= min_frames:
+            # Cięcie w środku pauzy
+            cut = index + 1 - silent_run // 2
+            cuts.append((start * frame, cut * frame))
+            start, silent_run = cut, 0
+    cuts.append((start * frame, len(mono)))
+    if len(cuts) > 1 and cuts[-1][1] - cuts[-1][0] < SEGMENT_MIN_SECONDS * TARGET_SAMPLE_RATE:
+        # Krótką końcówkę doklejamy do poprzedniej wypowiedzi
+        last_start, _ = cuts.pop(-2)
+        cuts[-1] = (last_start, len(mono))
+    return [encode_for_upload(mono[begin:end], "wav")[0] for begin, end in cuts]
+
+def split_sentences(buffer):
+    """
+    Odcina pełne zdania z początku bufora tekstu
+
+    Returns:
+        tuple[list[str], str]: Gotowe zdania i niedokończona reszta
+    """
+    parts = SENTENCE_END.split(buffer)
+    return [part.strip() for part in parts[:-1] if part.strip()], parts[-1]
+
+
+class VoiceTranslationPipeline:
+    """
+    Trzy współbieżne etapy tłumaczenia głosowego połączone kolejkami
+
+    Zdarzenia dla wątku UI (kolejka events): ("source", tekst), ("sentence", (nr, zdanie)),
+    ("audio", (nr, bajty | None)), ("asr_usage", (backend, info)), ("tokens", (prompt, completion, model)),
+    ("tts_usage", (znaki, dostawca)), ("error", opis), ("done", None)
+    """
+
+    def __init__(self, language_in, language_out, tts_providers, model, direct_to_english=False):
+        from utils.config import language_code_map
+        self.language_in = language_in
+        self.language_out = language_out
+        self.language_code = language_code_map.get(language_in, "en")
+        self.tts_providers = tts_providers
+        self.model = model
+        # Na angielski tłumaczy od razu Whisper - etap czatu tylko tnie tekst na zdania
+        self.direct_to_english = direct_to_english
+        self.events = queue.Queue()
+        self._sources = queue.Queue()
+        self._sentences = queue.Queue()
+        self._threads = []
+        self._closed = False
+        self._close_lock = threading.Lock()
+
+    def start(self, audio_bytes):
+        for target, args in (
+            (self._transcribe_stage, (audio_bytes,)),
+            (self._translate_stage, ()),
+            (self._tts_stage, ()),
+        ):
+            # Klucz API sesji przekazany wątkom etapów - wywołania z nich nie widzą session_state
+            thread = threading.Thread(target=bind_api_key(target), args=args, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def close(self):
+        """
+        Kończy odbiór zdarzeń przez wątek UI
+
+        Returns:
+            list[tuple]: Zdarzenia, których wątek UI jeszcze nie odebrał
+        """
+        with self._close_lock:
+            self._closed = True
+        remaining = []
+        while True:
+            try:
+                remaining.append(self.events.get_nowait())
+            except queue.Empty:
+                return remaining
+
+    def _report_tts_usage(self, text_length, provider):
+        with self._close_lock:
+            if not self._closed:
+                self.events.put(("tts_usage", (text_length, provider)))
+                return
+        from utils.ai_stats import add_tts_usage
+        add_tts_usage(text_length, provider)
+
+    def _transcribe_stage(self, audio_bytes):
+        from utils.asr_backends import transcribe_upload
+        task = "translate" if self.direct_to_english else "transcribe"
+        try:
+            segments = split_at_pauses(audio_bytes)
+            with ThreadPoolExecutor(max_workers=TRANSCRIBE_WORKERS, thread_name_prefix="voice-asr") as executor:
+                transcribe = bind_api_key(transcribe_upload)
+                futures = [executor.submit(transcribe, segment, self.language_code, task) for segment in segments]
+                # Kolejność nagrania: kolejny fragment idzie dalej, gdy tylko on i poprzednie są gotowe
+                for future in futures:
+                    try:
+                        text, backend, info = future.result()
+                    except Exception as e:
+                        self.events.put(("error", f"Rozpoznawanie mowy: {e}"))
+                        continue
+                    self.events.put(("asr_usage", (backend, info)))
+                    if text.strip():
+                        self.events.put(("source", text.strip()))
+                        self._sources.put(text.strip())
+        finally:
+            self._sources.put(None)
+
+    def _translate_stage(self):
+        from utils.config import client
+        index = 0
+        previous = ""
+        try:
+            while True:
+                text = self._sources.get()
+                if text is None:
+                    break
+                buffer = ""
+                for delta in self._translate_stream(client, text, previous):
+                    buffer += delta
+                    sentences, buffer = split_sentences(buffer)
+                    for sentence in sentences:
+                        self._emit_sentence(index, sentence)
+                        index += 1
+                if buffer.strip():
+                    self._emit_sentence(index, buffer.strip())
+                    index += 1
+                previous = text
+        except Exception as e:
+            self.events.put(("error", f"Tłumaczenie: {e}"))
+        finally:
+            self._sentences.put(None)
+
+    def _translate_stream(self, client, text, previous):
+        if self.direct_to_english:
+            yield text + " "
+            return
+        system = (
+            f"Jesteś pomocnym tłumaczem. Tłumacz tekst z {self.language_in} na {self.language_out}. "
+            "Zwróć wyłącznie tłumaczenie."
+        )
+        if previous:
+            system += f"\nPoprzedni fragment wypowiedzi (tylko kontekst, nie tłumacz go): {previous}"
+        # Pomiar do końca strumienia - porównywalny z wywołaniami bez stream
+        with track_latency("translator", self.model):
+            stream = client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": system},
+                    {"role": "user", "content": text},
+                ],
+                max_tokens=500,
+                temperature=0.1,
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+            for chunk in stream:
+                if chunk.usage:
+                    self.events.put(("tokens", (chunk.usage.prompt_tokens, chunk.usage.completion_tokens, chunk.model)))
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+    def _emit_sentence(self, index, sentence):
+        self.events.put(("sentence", (index, sentence)))
+        self._sentences.put((index, sentence))
+
+    def _synthesize(self, index, sentence):
+        if not self.tts_providers:
+            # Bez dostawcy TTS tłumaczenie jest tylko wyświetlane (komunikat pokazuje wątek UI)
+            self.events.put(("audio", (index, None)))
+            return
+        cached_audio = find_cached_audio(sentence, self.language_out, self.tts_providers)
+        if cached_audio is not None:
+            self.events.put(("audio", (index, cached_audio)))
+            return
+        try:
+            result = dispatch_tts(
+                sentence, self.language_out, self.tts_providers, hedge=len(self.tts_providers) > 1,
+                on_complete=lambda name: self._report_tts_usage(len(sentence), name),
+            )
+        except Exception as e:
+            self.events.put(("error", f"Synteza mowy: {e}"))
+            self.events.put(("audio", (index, None)))
+            return
+        save_cached_audio(sentence, self.language_out, result.provider, result.audio_bytes)
+        self.events.put(("audio", (index, result.audio_bytes)))
+
+    def _tts_stage(self):
+        synthesize = bind_api_key(self._synthesize)
+        with ThreadPoolExecutor(max_workers=TTS_WORKERS, thread_name_prefix="voice-tts") as executor:
+            while True:
+                item = self._sentences.get()
+                if item is None:
+                    break
+                executor.submit(synthesize, *item)
+        self.events.put(("done", None))
+
+
+def _audio_duration(audio_bytes):
+    from utils.audio_preprocess import get_wav_duration
+    from utils.audio_sprite import estimate_mp3_duration
+    if audio_bytes[:4] == b"RIFF":
+        return get_wav_duration(audio_bytes)
+    return estimate_mp3_duration(audio_bytes)
+
+def run_voice_translation(audio_bytes, language_in, language_out, direct_to_english=False):
+    """
+    Uruchamia potok i na bieżąco wyświetla oraz odtwarza kolejne przetłumaczone zdania
+
+    Args:
+        audio_bytes (bytes): Nagranie WAV
+        language_in (str): Język nagrania (np. "polski")
+        language_out (str): Język tłumaczenia (np. "angielski")
+        direct_to_english (bool): Tłumaczenie nagrania od razu przez Whisper (cel: angielski)
+
+    Returns:
+        tuple[str, str]: Rozpoznany tekst i pełne tłumaczenie
+    """
+    from utils.config import get_tts_providers, get_model, get_audio_mime
+    from utils.ai_stats import add_token_usage, add_tts_usage
+    from utils.asr_backends import record_transcription_usage
+
+    tts_providers = get_tts_providers()
+    if not tts_providers:
+        st.error("❌ Brak dostępnego dostawcy TTS - tłumaczenie zostanie tylko wyświetlone.")
+    pipeline = VoiceTranslationPipeline(
+        language_in, language_out, tts_providers, get_model(), direct_to_english
+    )
+    pipeline.start(audio_bytes)
+
+    source_box = st.empty()
+    translation_box = st.empty()
+    player = st.empty()
+    status = st.empty()
+    status.caption("🔄 Rozpoznawanie mowy...")
+
+    sources, sentences, audios = [], {}, {}
+    next_to_play, playing_until, done = 0, 0.0, False
+    started = time.perf_counter()
+    first_audio_at = None
+    while True:
+        try:
+            kind, payload = pipeline.events.get(timeout=0.1)
+        except queue.Empty:
+            kind, payload = None, None
+
+        if kind == "source":
+            sources.append(payload)
+            source_box.markdown(f"🎤 {' '.join(sources)}")
+            status.caption("🔄 Tłumaczenie...")
+        elif kind == "sentence":
+            sentences[payload[0]] = payload[1]
+            translation_box.markdown(f"**{' '.join(sentences[i] for i in sorted(sentences))}**")
+        elif kind == "audio":
+            audios[payload[0]] = payload[1]
+        elif kind == "asr_usage":
+            record_transcription_usage(*payload)
+        elif kind == "tokens":
+            prompt_tokens, completion_tokens, model = payload
+            add_token_usage("translator", prompt_tokens, completion_tokens, model=model)
+        elif kind == "tts_usage":
+            add_tts_usage(*payload)
+        elif kind == "error":
+            st.error(payload)
+        elif kind == "done":
+            done = True
+
+        # Odtwarzanie zdań po kolei - następne, gdy poprzednie powinno się skończyć
+        while next_to_play in audios and audios[next_to_play] is None:
+            next_to_play += 1
+        if next_to_play in audios and time.monotonic() >= playing_until:
+            audio = audios[next_to_play]
+            player.audio(audio, format=get_audio_mime(audio), autoplay=True)
+            playing_until = time.monotonic() + _audio_duration(audio)
+            if first_audio_at is None:
+                first_audio_at = time.perf_counter() - started
+            next_to_play += 1
+
+        if done and next_to_play >= len(sentences):
+            break
+
+    # Po "done" mogą jeszcze dojść rozliczenia przegranych w hedgingu TTS
+    for kind, payload in pipeline.close():
+        if kind == "tts_usage":
+            add_tts_usage(*payload)
+
+    summary = f"⚡ Pełne tłumaczenie w {time.perf_counter() - started:.1f}s"
+    if first_audio_at is not None:
+        summary += f", pierwsze zdanie po {first_audio_at:.1f}s"
+    status.caption(summary)
+    return " ".join(sources), " ".join(sentences[i] for i in sorted(sentences))